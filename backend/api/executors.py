@@ -0,0 +1,215 @@
+"""
+Request Executors and Stage Timing
+Dedicated, bounded thread pools so one kind of blocking work cannot starve
+another: sentiment inference, crisis screening, SQLite access and outbound
+notifications (SMTP/Twilio) each run on their own executor. Per-stage
+timings are collected for the Server-Timing header and /system_status.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STAGE_SAMPLE_SIZE = 1000
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when an executor already has its maximum number of pending jobs."""
+
+
+class StageExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        """
+        Args:
+            name: Executor name, used for thread names and stats
+            max_workers: Threads in the pool
+            max_pending: Jobs allowed queued or running at once; further
+                submissions are rejected instead of queueing without bound
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.start()
+
+        # Statistics
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on this executor and await its result.
+
+        Raises:
+            ExecutorSaturated: If ``max_pending`` jobs are already queued or running
+            RuntimeError: If the executor has been shut down
+        """
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                raise RuntimeError(f"{self.name} executor is shut down")
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorSaturated(f"{self.name} executor is saturated ({self.pending} pending)")
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def start(self):
+        """Create the thread pool (again, after ``shutdown``)."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs; with ``wait``, block until queued and running jobs are done."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "max_pending_seen": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+class StageStats:
+    """Rolling per-stage latency samples shared by all requests."""
+
+    def __init__(self, sample_size: int = STAGE_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, duration_ms: float):
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.sample_size)
+                self._counts[stage] = 0
+            self._samples[stage].append(duration_ms)
+            self._counts[stage] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+            counts = dict(self._counts)
+
+        stats = {}
+        for stage, samples in snapshot.items():
+            stats[stage] = {
+                "count": counts[stage],
+                "avg_ms": round(sum(samples) / len(samples), 3),
+                "p50_ms": round(samples[len(samples) // 2], 3),
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+                "max_ms": round(samples[-1], 3)
+            }
+        return stats
+
+
+class RequestTimer:
+    """Times the stages of one request and reports them as a Server-Timing header."""
+
+    def __init__(self, stats: StageStats):
+        self.stats = stats
+        self.start = time.perf_counter()
+        self.stages: List = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.stages.append((name, duration_ms))
+            self.stats.record(name, duration_ms)
+
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter() - self.start) * 1000)
+
+    def server_timing(self) -> str:
+        timings = [f"{name};dur={duration_ms:.2f}" for name, duration_ms in self.stages]
+        timings.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.2f}")
+        return ", ".join(timings)
+
+
+# Global executors; sizes come from the environment
+inference_executor = StageExecutor(
+    "inference",
+    max_workers=int(os.getenv("INFERENCE_EXECUTOR_WORKERS", "32")),
+    max_pending=int(os.getenv("INFERENCE_EXECUTOR_MAX_PENDING", "512"))
+)
+crisis_executor = StageExecutor(
+    "crisis",
+    max_workers=int(os.getenv("CRISIS_EXECUTOR_WORKERS", "4")),
+    max_pending=int(os.getenv("CRISIS_EXECUTOR_MAX_PENDING", "512"))
+)
+database_executor = StageExecutor(
+    "database",
+    max_workers=int(os.getenv("DATABASE_EXECUTOR_WORKERS", "4")),
+    max_pending=int(os.getenv("DATABASE_EXECUTOR_MAX_PENDING", "512"))
+)
+notification_executor = StageExecutor(
+    "notifications",
+    max_workers=int(os.getenv("NOTIFICATION_EXECUTOR_WORKERS", "4")),
+    max_pending=int(os.getenv("NOTIFICATION_EXECUTOR_MAX_PENDING", "64"))
+)
+EXECUTORS = (inference_executor, crisis_executor, database_executor, notification_executor)
+stage_stats = StageStats()
+
+
+def start_request_timer() -> RequestTimer:
+    """Create a timer for one request that reports into the global stage stats."""
+    return RequestTimer(stage_stats)
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Get executor queue statistics and per-stage request timings."""
+    return {
+        "executors": {
+            executor.name: executor.get_stats()
+            for executor in EXECUTORS
+        },
+        "stages": stage_stats.get_stats()
+    }
+
+
+def start_executors():
+    """Start the executor threads (they start on import; this restarts them after a shutdown)."""
+    for executor in EXECUTORS:
+        executor.start()
+
+
+def shutdown_executors():
+    """Finish queued work and stop the executor threads."""
+    for executor in EXECUTORS:
+        executor.shutdown(wait=True)
@@ -1,29 +1,65 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Request, Response
 from pydantic import BaseModel
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import random
 import shutil
 import os
 import tempfile
 import time
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.model import analyze_mood
+from models.model import (
+    analyze_mood, analyze_moods, get_inference_stats, get_model_status, is_model_ready, start_background_warmup,
+    list_model_variants, reload_model, rollback_model
+)
 from utils.cbt_tips import cbt_tips
 from utils.activity_recommendations import get_activity_recommendations, get_crisis_activities
 from utils.daily_questions import get_daily_questions, calculate_daily_wellness_score
-from services.crisis_detection import check_crisis
+from services.crisis_detection import check_crisis, crisis_detector
 from services.emergency_notifications import send_emergency_alert, notification_system
-from services.monitoring import monitor, log_request
+from services.monitoring import (
+    monitor, log_request, log_requests_batch, close_request_log, get_request_log_stats
+)
+from api.executors import (
+    ExecutorSaturated, inference_executor, crisis_executor, database_executor, notification_executor,
+    start_request_timer, get_executor_stats, start_executors, shutdown_executors
+)
+from api.streaming import BodyStreamingResponse, iter_ndjson_lines
+from api.response_cache import analytics_cache
 # Temporarily disable problematic imports
 # from voice_emotion import analyze_voice_emotion
 # from face_emotion import analyze_face_emotion
 # from multimodal_fusion import fuse_multimodal_emotions
 
-app = FastAPI(title="Mental Health AI API - Multi-modal Edition")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start-up and shutdown of the request executors, model and request log."""
+    start_executors()
+    # Load the sentiment model in the background so /health answers immediately
+    if os.getenv("MODEL_WARMUP_ON_STARTUP", "true").lower() == "true":
+        start_background_warmup()
+    # Restore per-user crisis risk from recent interactions after a restart
+    if os.getenv("RISK_STATE_REBUILD", "false").lower() == "true":
+        await database_executor.run(
+            crisis_detector.rebuild_risk_state, monitor.db, float(os.getenv("RISK_STATE_REBUILD_WINDOW_S", "3600"))
+        )
+
+    yield
+
+    # Let in-flight jobs finish, then write out queued request logs
+    shutdown_executors()
+    close_request_log()
+    monitor.db.close_all()
+
+app = FastAPI(title="Mental Health AI API - Multi-modal Edition", lifespan=lifespan)
 
 # Enable CORS for local development and embedded-mobile localhost access
 app.add_middleware(
@@ -49,25 +85,70 @@ class MultimodalInput(BaseModel):
     emergency_contacts: Optional[Dict] = None
     user_name: Optional[str] = "User"
 
+# Health probes accept slightly older data than dashboards to keep them off the database
+SYSTEM_STATUS_CACHE_TTL_S = float(os.getenv("SYSTEM_STATUS_CACHE_TTL_S", "5"))
+
+# New crisis events must show up in analytics without waiting for the TTL
+monitor.add_crisis_listener(analytics_cache.invalidate)
+
+def _cached_analytics(response: Response, view: str, days: int, user_id: Optional[str], compute,
+                      ttl_seconds: Optional[float] = None):
+    """Serve an analytics view from the response cache, computing it at most once per TTL."""
+    result, age = analytics_cache.get_or_compute(
+        view, days, user_id, compute, ttl_seconds=ttl_seconds,
+        cacheable=lambda value: "error" not in value
+    )
+    response.headers["X-Cache"] = "HIT" if age else "MISS"
+    response.headers["Age"] = str(int(age))
+    return result
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 once the sentiment model is loaded, 503 until then."""
+    model_status = get_model_status()
+    if not is_model_ready():
+        return JSONResponse(status_code=503, content={"status": "loading", "model": model_status})
+    return {"status": "ready", "model": model_status}
+
+def _render_result(result: Dict, crisis_json: Optional[bytes] = None) -> bytes:
+    """
+    Encode a per-request result as JSONResponse would, appending the crisis
+    response fields from their precomputed JSON (``check_crisis``'s
+    ``response_json``) instead of re-encoding them for every request.
+    """
+    body = json.dumps(
+        jsonable_encoder(result), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    if crisis_json is None:
+        return body
+    return body[:-1] + b"," + crisis_json[1:]
+
+def _json_response(body: bytes, timer=None) -> Response:
+    headers = {"Server-Timing": timer.server_timing()} if timer is not None else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.post("/analyze_text")
-def analyze_text(data: TextInput):
+async def analyze_text(data: TextInput):
     """Enhanced text-only analysis endpoint with crisis detection."""
-    start_time = time.time()
-    
-    # Start session if not provided
-    session_id = data.session_id or monitor.start_session(data.user_id)
-    user_id = data.user_id or f"anonymous_{int(time.time())}"
-    
+    timer = start_request_timer()
+
     try:
+        # Start session if not provided
+        with timer.stage("session"):
+            session_id = data.session_id or await database_executor.run(monitor.start_session, data.user_id)
+        user_id = data.user_id or f"anonymous_{int(time.time())}"
+
         # Analyze mood
-        mood_score, mood_label = analyze_mood(data.text)
-        
-        # Check for crisis
-        crisis_result = check_crisis(data.text, mood_score, data.location, user_id)
+        with timer.stage("mood"):
+            mood_score, mood_label = await inference_executor.run(analyze_mood, data.text)
+
+        # Check for crisis (keyword matching is CPU work that grows with the text)
+        with timer.stage("crisis"):
+            crisis_result = await crisis_executor.run(check_crisis, data.text, mood_score, data.location, user_id)
         
         # Get CBT tip
         tip = random.choice(cbt_tips)
@@ -90,37 +171,141 @@ def analyze_text(data: TextInput):
             "recommended_activities": activities
         }
         
-        # Handle crisis response
+        # Handle crisis response (its fields are added when rendering)
+        crisis_json = None
         if crisis_result["analysis"]["is_crisis"]:
             crisis_response = crisis_result["response"]
-            response.update({
-                "status": crisis_response["status"],
-                "priority": crisis_response["priority"],
-                "message": crisis_response["message"],
-                "helplines": crisis_response["helplines"],
-                "immediate_steps": crisis_response["immediate_steps"]
-            })
+            crisis_json = crisis_result["response_json"]
             
             # Send emergency notifications if contacts provided
             if data.emergency_contacts and crisis_response["priority"] in ["immediate", "urgent"]:
                 try:
-                    notification_result = send_emergency_alert(
-                        emergency_contacts=data.emergency_contacts,
-                        user_name=getattr(data, 'user_name', 'User'),
-                        crisis_level=crisis_result["analysis"]["crisis_level"],
-                        additional_context=f"User input: '{data.text}'"
-                    )
+                    with timer.stage("notify"):
+                        notification_result = await notification_executor.run(
+                            send_emergency_alert,
+                            emergency_contacts=data.emergency_contacts,
+                            user_name=getattr(data, 'user_name', 'User'),
+                            crisis_level=crisis_result["analysis"]["crisis_level"],
+                            additional_context=f"User input: '{data.text}'"
+                        )
                     response["emergency_notifications"] = notification_result
                 except Exception as e:
                     response["emergency_notifications"] = {"error": str(e)}
         
         # Log the interaction
-        processing_time = int((time.time() - start_time) * 1000)
-        log_request(
-            session_id=session_id,
-            user_id=user_id,
-            input_data={"text": data.text, "type": "text", "location": data.location},
-            analysis_result={
+        processing_time = timer.elapsed_ms()
+        with timer.stage("log"):
+            await database_executor.run(
+                log_request,
+                session_id=session_id,
+                user_id=user_id,
+                input_data={"text": data.text, "type": "text", "location": data.location},
+                analysis_result={
+                    "mood_score": mood_score,
+                    "mood_label": mood_label,
+                    "is_crisis": crisis_result["analysis"]["is_crisis"],
+                    "crisis_level": crisis_result["analysis"]["crisis_level"],
+                    "crisis_keywords": crisis_result["analysis"]["found_keywords"],
+                    "response_type": "crisis" if crisis_result["analysis"]["is_crisis"] else "standard",
+                    "emergency_contacts_notified": "emergency_notifications" in response,
+                    "follow_up_required": crisis_result["response"]["follow_up_required"]
+                },
+                processing_time_ms=processing_time
+            )
+
+        return _json_response(_render_result(response, crisis_json), timer)
+
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}", headers={"Retry-After": "1"})
+    except Exception as e:
+        # Log error
+        await database_executor.run(
+            monitor.log_system_metric, "error_rate", 1, "count", {"error": str(e), "endpoint": "analyze_text"}
+        )
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+ANALYZE_BATCH_MAX_ITEMS = int(os.getenv("ANALYZE_BATCH_MAX_ITEMS", "256"))
+STREAM_BATCH_SIZE = int(os.getenv("ANALYZE_STREAM_BATCH_SIZE", "64"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("ANALYZE_STREAM_MAX_LINE_KB", "64")) * 1024
+
+def _check_crisis_items(items: List[TextInput], moods: List[Tuple[float, str]], anonymous_id: str) -> List[Dict]:
+    """``check_crisis`` for every item, without feeding the rolling risk state (see ``_analyze_items``)."""
+    return [
+        check_crisis(item.text, mood_score, item.location, item.user_id or anonymous_id, track_risk=False)
+        for item, (mood_score, _) in zip(items, moods)
+    ]
+
+async def _analyze_items(items: List[TextInput], timer, notify: bool = True) -> Tuple[List[Dict], List[Optional[bytes]]]:
+    """
+    Score a list of texts together: one batched sentiment call, crisis
+    detection per item, optional emergency notifications and one database
+    transaction for all interactions. Results are returned in input order,
+    together with each result's crisis response JSON for ``_render_result``
+    (None when the item is not a crisis).
+
+    Items are bulk or imported history, so they do not feed the per-user
+    rolling risk state: they were not sent now, and replaying them at the
+    current time would escalate the user's live state.
+    """
+    anonymous_id = f"anonymous_{int(time.time())}"
+
+    # Analyze mood for all items at once
+    with timer.stage("mood"):
+        moods = await inference_executor.run(analyze_moods, [item.text for item in items])
+
+    # Check for crisis and build per-item responses
+    with timer.stage("crisis"):
+        crisis_results = await crisis_executor.run(_check_crisis_items, items, moods, anonymous_id)
+    results = []
+    crisis_fields = []
+    for (mood_score, mood_label), crisis_result in zip(moods, crisis_results):
+        response = {
+            "mood_score": round(mood_score, 2),
+            "mood_label": mood_label,
+            "cbt_tip": random.choice(cbt_tips),
+            "crisis_detected": crisis_result["analysis"]["is_crisis"],
+            "crisis_level": crisis_result["analysis"]["crisis_level"],
+            "recommended_activities": get_activity_recommendations(
+                mood_score=mood_score,
+                crisis_level=crisis_result["analysis"]["crisis_level"],
+                num_activities=3
+            )
+        }
+        results.append(response)
+        crisis_fields.append(crisis_result["response_json"] if crisis_result["analysis"]["is_crisis"] else None)
+
+    # Send emergency notifications concurrently for items that need them
+    alerts = [
+        index for index, (item, crisis_result) in enumerate(zip(items, crisis_results))
+        if notify and crisis_result["analysis"]["is_crisis"] and item.emergency_contacts
+        and crisis_result["response"]["priority"] in ["immediate", "urgent"]
+    ]
+    if alerts:
+        with timer.stage("notify"):
+            notifications = await asyncio.gather(*[
+                notification_executor.run(
+                    send_emergency_alert,
+                    emergency_contacts=items[index].emergency_contacts,
+                    user_name=getattr(items[index], "user_name", "User"),
+                    crisis_level=crisis_results[index]["analysis"]["crisis_level"],
+                    additional_context=f"User input: '{items[index].text}'"
+                )
+                for index in alerts
+            ], return_exceptions=True)
+        for index, notification_result in zip(alerts, notifications):
+            if isinstance(notification_result, Exception):
+                notification_result = {"error": str(notification_result)}
+            results[index]["emergency_notifications"] = notification_result
+
+    # Log all interactions in one transaction
+    processing_time = timer.elapsed_ms() // len(items)
+    requests = []
+    for item, (mood_score, mood_label), crisis_result, response in zip(items, moods, crisis_results, results):
+        requests.append({
+            "session_id": item.session_id,
+            "user_id": item.user_id or anonymous_id,
+            "input_data": {"text": item.text, "type": "text", "location": item.location},
+            "analysis_result": {
                 "mood_score": mood_score,
                 "mood_label": mood_label,
                 "is_crisis": crisis_result["analysis"]["is_crisis"],
@@ -130,15 +315,120 @@ def analyze_text(data: TextInput):
                 "emergency_contacts_notified": "emergency_notifications" in response,
                 "follow_up_required": crisis_result["response"]["follow_up_required"]
             },
-            processing_time_ms=processing_time
-        )
-        
-        return response
-        
+            "processing_time_ms": processing_time
+        })
+    with timer.stage("log"):
+        logged = await database_executor.run(log_requests_batch, requests)
+    for response, ids in zip(results, logged):
+        response["session_id"] = ids["session_id"]
+    return results, crisis_fields
+
+@app.post("/analyze_text_batch")
+async def analyze_text_batch(items: List[TextInput]):
+    """
+    Bulk text analysis for backfills and offline sync.
+
+    Sentiment for all items is scored in one batched model call, crisis
+    detection runs for every item, all interactions are written in one
+    transaction, and per-item results are returned in request order.
+    """
+    if not items:
+        return {"results": [], "count": 0}
+    if len(items) > ANALYZE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {ANALYZE_BATCH_MAX_ITEMS} items per batch")
+
+    timer = start_request_timer()
+    try:
+        results, crisis_fields = await _analyze_items(items, timer)
+        body = b'{"results":[' + b",".join(map(_render_result, results, crisis_fields))
+        return _json_response(body + b'],"count":' + str(len(results)).encode() + b"}", timer)
+
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {str(e)}", headers={"Retry-After": "1"})
     except Exception as e:
         # Log error
-        monitor.log_system_metric("error_rate", 1, "count", {"error": str(e), "endpoint": "analyze_text"})
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        await database_executor.run(
+            monitor.log_system_metric, "error_rate", 1, "count", {"error": str(e), "endpoint": "analyze_text_batch"}
+        )
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+
+@app.post("/analyze_text_stream")
+async def analyze_text_stream(request: Request):
+    """
+    Streaming bulk analysis for large history imports.
+
+    The body is newline-delimited JSON, one ``TextInput`` object (or bare
+    string) per line. Lines are processed in micro-batches of
+    ANALYZE_STREAM_BATCH_SIZE as the body arrives, and one NDJSON result
+    per line is streamed back, in line order; invalid lines get an
+    ``error`` result in their place. The next batch is only read once the
+    previous results have been sent, so memory stays bounded and a slow
+    client slows the import instead of buffering it. Imported history
+    does not trigger emergency notifications.
+    """
+    async def process(batch):
+        # batch holds (line_number, item, error) in line order; only valid items are analyzed
+        valid = [item for _, item, error in batch if error is None]
+        results, crisis_fields = [], []
+        while valid:
+            try:
+                results, crisis_fields = await _analyze_items(valid, start_request_timer(), notify=False)
+                break
+            except ExecutorSaturated:
+                # Long imports wait for capacity instead of failing midway.
+                # A saturated executor rejects the job before it runs, and
+                # _analyze_items keeps no state, so the retry counts nothing twice
+                await asyncio.sleep(0.1)
+
+        # Invalid lines are answered in place, so output follows input order
+        output = []
+        analyzed = iter(zip(results, crisis_fields))
+        for line_number, _, error in batch:
+            if error is not None:
+                output.append(json.dumps({"line": line_number, "error": error}).encode("utf-8") + b"\n")
+            else:
+                result, crisis_json = next(analyzed)
+                output.append(_render_result({"line": line_number, **result}, crisis_json) + b"\n")
+        return b"".join(output), len(valid)
+
+    async def results():
+        batch = []
+        processed = 0
+        errors = 0
+        try:
+            async for line_number, line in iter_ndjson_lines(request, STREAM_MAX_LINE_BYTES):
+                if line is not None and not line.strip():
+                    continue
+                try:
+                    if line is None:
+                        raise ValueError(f"line exceeds {STREAM_MAX_LINE_BYTES} bytes")
+                    payload = json.loads(line)
+                    item = TextInput(text=payload) if isinstance(payload, str) else TextInput(**payload)
+                    batch.append((line_number, item, None))
+                except Exception as e:
+                    errors += 1
+                    batch.append((line_number, None, f"Invalid line: {str(e)}"))
+
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    body, analyzed = await process(batch)
+                    processed += analyzed
+                    batch = []
+                    yield body
+
+            if batch:
+                body, analyzed = await process(batch)
+                processed += analyzed
+                yield body
+            yield json.dumps({"done": True, "processed": processed, "errors": errors}) + "\n"
+
+        except Exception as e:
+            await database_executor.run(
+                monitor.log_system_metric, "error_rate", 1, "count", {"error": str(e), "endpoint": "analyze_text_stream"}
+            )
+            yield json.dumps({"done": False, "processed": processed, "errors": errors,
+                              "error": f"Stream analysis failed: {str(e)}"}) + "\n"
+
+    return BodyStreamingResponse(results(), media_type="application/x-ndjson")
 
 @app.post("/analyze_multimodal")
 async def analyze_multimodal(
@@ -168,7 +458,7 @@ async def analyze_multimodal(
             pass
     
     # Start session if not provided
-    session_id = session_id or monitor.start_session(user_id)
+    session_id = session_id or await database_executor.run(monitor.start_session, user_id)
     user_id = user_id or f"anonymous_{int(time.time())}"
     
     # Initialize results
@@ -178,7 +468,7 @@ async def analyze_multimodal(
     # 1. Text Analysis
     if text and text.strip():
         try:
-            text_score, text_label = analyze_mood(text)
+            text_score, text_label = await inference_executor.run(analyze_mood, text)
             # Convert text label to confidence (simple heuristic)
             text_confidence = min(0.9, abs(text_score) + 0.5)
         except Exception as e:
@@ -220,7 +510,7 @@ async def analyze_multimodal(
     tip = random.choice(cbt_tips)
     
     # 6. Crisis detection
-    crisis_result = check_crisis(text, final_mood_score, location, user_id)
+    crisis_result = await crisis_executor.run(check_crisis, text, final_mood_score, location, user_id)
     
     # 7. Prepare comprehensive response
     response = {
@@ -247,21 +537,17 @@ async def analyze_multimodal(
         "crisis_level": crisis_result["analysis"]["crisis_level"]
     }
     
-    # Handle crisis response
+    # Handle crisis response (its fields are added when rendering)
+    crisis_json = None
     if crisis_result["analysis"]["is_crisis"]:
         crisis_response = crisis_result["response"]
-        response.update({
-            "status": crisis_response["status"],
-            "priority": crisis_response["priority"],
-            "message": crisis_response["message"],
-            "helplines": crisis_response["helplines"],
-            "immediate_steps": crisis_response["immediate_steps"]
-        })
+        crisis_json = crisis_result["response_json"]
         
         # Send emergency notifications if contacts provided
         if emergency_contacts_dict and crisis_response["priority"] in ["immediate", "urgent"]:
             try:
-                notification_result = send_emergency_alert(
+                notification_result = await notification_executor.run(
+                    send_emergency_alert,
                     emergency_contacts=emergency_contacts_dict,
                     user_name=user_name,
                     crisis_level=crisis_result["analysis"]["crisis_level"],
@@ -273,7 +559,8 @@ async def analyze_multimodal(
     
     # Log the interaction
     processing_time = int((time.time() - start_time) * 1000)
-    log_request(
+    await database_executor.run(
+        log_request,
         session_id=session_id,
         user_id=user_id,
         input_data={"text": text, "type": "multimodal", "location": location},
@@ -290,7 +577,7 @@ async def analyze_multimodal(
         processing_time_ms=processing_time
     )
     
-    return response
+    return _json_response(_render_result(response, crisis_json))
 
 @app.post("/start_session")
 def start_session(user_id: Optional[str] = None):
@@ -309,21 +596,24 @@ def end_session(session_id: str):
     return {"status": "session_ended", "session_id": session_id}
 
 @app.get("/analytics")
-def get_analytics(days: int = 7, user_id: str = None):
+def get_analytics(response: Response, days: int = 7, user_id: str = None):
     """Get analytics for the specified number of days. If user_id provided, returns user-specific analytics."""
     try:
         if user_id:
-            return monitor.get_user_analytics(user_id=user_id, days=days)
+            return _cached_analytics(response, "user_analytics", days, user_id,
+                                     lambda: monitor.get_user_analytics(user_id=user_id, days=days))
         else:
-            return monitor.get_analytics_summary(days=days)
+            return _cached_analytics(response, "analytics_summary", days, None,
+                                     lambda: monitor.get_analytics_summary(days=days))
     except Exception as e:
         return {"error": str(e)}, 500
 
 @app.get("/user_analytics/{user_id}")
-def get_user_specific_analytics(user_id: str, days: int = 7):
+def get_user_specific_analytics(user_id: str, response: Response, days: int = 7):
     """Get analytics specific to a user."""
     try:
-        return monitor.get_user_analytics(user_id=user_id, days=days)
+        return _cached_analytics(response, "user_analytics", days, user_id,
+                                 lambda: monitor.get_user_analytics(user_id=user_id, days=days))
     except Exception as e:
         return {"error": str(e)}, 500
 
@@ -339,16 +629,24 @@ def mark_crisis_resolved(crisis_id: str, resolution_status: str = "resolved"):
     return {"status": "crisis_marked_resolved", "crisis_id": crisis_id}
 
 @app.get("/system_status")
-def get_system_status():
+def get_system_status(response: Response):
     """Get system status and health metrics."""
     try:
-        # Test database connection
-        analytics = monitor.get_analytics_summary(days=1)
+        # Test database connection (at most once per SYSTEM_STATUS_CACHE_TTL_S)
+        analytics = _cached_analytics(response, "analytics_summary", 1, None,
+                                      lambda: monitor.get_analytics_summary(days=1),
+                                      ttl_seconds=SYSTEM_STATUS_CACHE_TTL_S)
         
         return {
             "status": "healthy",
             "database": "connected",
+            "database_connections": monitor.db.get_stats(),
             "crisis_detection": "enabled",
+            "risk_state": crisis_detector.risk_tracker.get_stats() if crisis_detector.risk_tracker else {"enabled": False},
+            "inference": get_inference_stats(),
+            "request_pipeline": get_executor_stats(),
+            "request_log": get_request_log_stats(),
+            "analytics_cache": analytics_cache.get_stats(),
             "emergency_notifications": {
                 "sms": notification_system.twilio_client is not None,
                 "email": notification_system.email_address is not None
@@ -365,6 +663,40 @@ def get_system_status():
             "error": str(e)
         }, 500
 
+def _require_admin(admin_key: Optional[str]):
+    """Reject admin calls unless ADMIN_API_KEY is configured and matches."""
+    expected = os.getenv("ADMIN_API_KEY")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_API_KEY not set)")
+    if admin_key != expected:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+@app.get("/admin/model")
+def get_model_admin_status(x_admin_key: Optional[str] = Header(None)):
+    """List available model variants and the active/rollback state."""
+    _require_admin(x_admin_key)
+    return {"variants": list_model_variants(), **get_model_status()}
+
+@app.post("/admin/model/reload")
+def reload_model_variant(variant: Optional[str] = None, x_admin_key: Optional[str] = Header(None)):
+    """Load a model variant in the background and swap it in once warmed up."""
+    _require_admin(x_admin_key)
+    try:
+        return reload_model(variant)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.post("/admin/model/rollback")
+def rollback_model_variant(x_admin_key: Optional[str] = Header(None)):
+    """Swap back to the previously active model variant."""
+    _require_admin(x_admin_key)
+    try:
+        return rollback_model()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 @app.get("/daily_activity")
 def get_daily_activity():
     """Get a random daily wellness activity suggestion."""
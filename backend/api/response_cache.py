@@ -0,0 +1,162 @@
+"""
+Analytics Response Cache
+Short-lived cache for the aggregate views behind /analytics, /user_analytics
+and /system_status, keyed by (view, days, user_id). Concurrent identical
+requests share one computation, and logging a crisis event invalidates the
+views it affects so dashboards never hide a new crisis for a full TTL.
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, Optional[str]]
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1024):
+        """
+        Args:
+            ttl_seconds: Default maximum age of a cached response; callers can
+                ask for fresher data per lookup
+            max_entries: Least recently used responses beyond this are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+
+        # key -> (value, computed_at)
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, float]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        # Bumped by invalidate() so computations already running are not cached
+        self._generation = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.total_hit_age = 0.0
+        self.max_hit_age = 0.0
+
+    def get_or_compute(self,
+                       view: str,
+                       days: int,
+                       user_id: Optional[str],
+                       compute: Callable[[], Any],
+                       ttl_seconds: Optional[float] = None,
+                       cacheable: Callable[[Any], bool] = lambda value: True) -> Tuple[Any, float]:
+        """
+        Return a cached response, or compute it once for all concurrent callers.
+
+        Args:
+            view: Name of the aggregate view
+            days: Analytics period
+            user_id: User for per-user views, None for global ones
+            compute: Produces the response on a miss
+            ttl_seconds: Maximum acceptable age for this lookup
+            cacheable: Whether a computed response may be stored (e.g. not errors)
+
+        Returns:
+            The response and its age in seconds (0 when computed for this call)
+        """
+        key = (view, days, user_id)
+        max_age = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, computed_at = entry
+                age = time.monotonic() - computed_at
+                if age <= max_age:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.total_hit_age += age
+                    self.max_hit_age = max(self.max_hit_age, age)
+                    return value, age
+
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                self.misses += 1
+                future = self._in_flight[key] = Future()
+                generation = self._generation
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # Another caller is computing this response
+            return future.result(), 0.0
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if generation == self._generation and cacheable(value):
+                self._entries[key] = (value, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        future.set_result(value)
+        return value, 0.0
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """
+        Drop responses that may include data for ``user_id``: every global
+        view plus that user's views (all views when ``user_id`` is None).
+        """
+        with self._lock:
+            stale = [key for key in self._entries if user_id is None or key[2] is None or key[2] == user_id]
+            for key in stale:
+                del self._entries[key]
+            self._generation += 1
+            self.invalidations += 1
+
+    def clear(self):
+        """Remove all entries."""
+        self.invalidate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, coalescing and staleness statistics."""
+        with self._lock:
+            now = time.monotonic()
+            lookups = self.hits + self.misses + self.coalesced
+            ages = [now - computed_at for _, computed_at in self._entries.values()]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "in_flight": len(self._in_flight),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "average_hit_age_ms": round(self.total_hit_age / self.hits * 1000, 2) if self.hits else 0,
+                "max_hit_age_ms": round(self.max_hit_age * 1000, 2),
+                "oldest_entry_age_ms": round(max(ages) * 1000, 2) if ages else 0
+            }
+
+
+# Global cache for the analytics endpoints
+analytics_cache = ResponseCache(
+    ttl_seconds=float(os.getenv("ANALYTICS_CACHE_TTL_S", "30")),
+    max_entries=int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "1024"))
+)
@@ -0,0 +1,51 @@
+"""
+NDJSON Streaming Helpers
+Incremental reading of newline-delimited JSON request bodies and a
+streaming response that can be produced while the body is still arriving.
+"""
+
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose content generator reads the request body.
+
+    Starlette's StreamingResponse listens for client disconnects by calling
+    ``receive()`` alongside the generator, which would swallow request body
+    messages. Here the generator is the only reader; ``request.stream()``
+    raises ClientDisconnect itself if the client goes away mid-upload.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(request: Request, max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Yield (line_number, line) from an NDJSON request body as it arrives.
+
+    Only the current partial line is buffered. Lines longer than
+    ``max_line_bytes`` are discarded and yielded as ``None``.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+    async for chunk in request.stream():
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_number += 1
+            # A whole line can arrive within one chunk, so check every line
+            yield line_number, None if oversized or len(line) > max_line_bytes else line
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            buffer = b""
+            oversized = True
+    if buffer.strip() or oversized:
+        yield line_number + 1, None if oversized else buffer
@@ -0,0 +1,93 @@
+"""
+Inference Allocation Benchmark
+Compares the memory allocated per inference call by the plain path (fresh
+int64 input arrays + ``session.run``) and the IOBinding path (inputs and
+outputs in reused, shape-keyed buffers). numpy reports its data buffers to
+tracemalloc, so the traced peak per call is the Python-visible allocation
+churn; ORT's own arena is not included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_allocations
+    python -m benchmarks.bench_allocations --calls 2000 --batch-size 8
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+
+import numpy as np
+
+from benchmarks.bench_tokenizer import sample_texts
+
+
+def measure(name: str, fn: Callable[[List[List[int]]], None], batches: List[List[List[int]]]):
+    for windows in batches[:10]:
+        fn(windows)  # warm-up, lets the reused buffers reach their steady-state size
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    start = time.perf_counter()
+    for windows in batches:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(windows)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    peaks = np.asarray(peaks)
+    print(f"{name:<12} {peaks.mean() / 1024:>12.1f} {np.percentile(peaks, 99) / 1024:>12.1f} "
+          f"{retained / 1024:>12.1f} {elapsed / len(batches) * 1000:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from models import model
+
+    sentiment_model = model.get_model()
+    prefix, suffix, pad_id = sentiment_model.prefix_ids, sentiment_model.suffix_ids, sentiment_model.pad_id
+    content_length = sentiment_model.max_length - len(prefix) - len(suffix)
+
+    rng = random.Random(args.seed)
+    batches = []
+    for _ in range(args.calls):
+        encoded = sentiment_model._encode(sample_texts(args.batch_size, rng))
+        batches.append([ids[:content_length] for ids in encoded])
+
+    with sentiment_model.session_pool.checkout() as bound:
+        def plain(windows):
+            longest = max(len(ids) for ids in windows) + len(prefix) + len(suffix)
+            input_ids = np.full((len(windows), longest), pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(windows), longest), dtype=np.int64)
+            for row, ids in enumerate(windows):
+                sequence = prefix + ids + suffix
+                input_ids[row, :len(sequence)] = sequence
+                attention_mask[row, :len(sequence)] = 1
+            inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+            bound.session.run(None, {name: inputs[name] for name in bound.input_names})
+
+        def io_binding(windows):
+            inputs = bound.buffers.fill(windows, range(len(windows)), prefix, suffix, pad_id)
+            bound.infer(inputs)
+
+        print(f"Allocations per call, {args.calls} calls of batch {args.batch_size} (KiB)")
+        print("=" * 64)
+        print(f"{'path':<12} {'mean/call':>12} {'p99/call':>12} {'retained':>12} {'ms/call':>10}")
+        measure("plain", plain, batches)
+        measure("io_binding", io_binding, batches)
+        print("-" * 64)
+        print(f"Buffer (re)allocations over the run: {bound.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
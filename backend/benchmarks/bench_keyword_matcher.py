@@ -0,0 +1,94 @@
+"""
+Crisis Keyword Matching Benchmark
+Measures time per call to find the crisis keywords and severity in a text:
+the original loop (substring test per keyword plus list lookups for the
+severity) versus the compiled KeywordMatcher token index. The matcher only
+accepts whole words, so the inputs include words ("number", "attend it")
+that the substring loop reports and the matcher does not.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keyword_matcher
+    python -m benchmarks.bench_keyword_matcher --size-kb 10 --iterations 20000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from services.crisis_detection import CrisisDetector
+
+WORDS = ["i", "feel", "really", "tired", "today", "but", "my", "friends", "helped", "and", "work",
+         "was", "stressful", "sleep", "number", "attend", "it", "hopeless", "cutting", "board", "over"]
+
+
+def sample_text(size_bytes: int, rng: random.Random) -> str:
+    words = []
+    length = 0
+    while length < size_bytes:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size_bytes]
+
+
+def legacy_matcher(detector: CrisisDetector) -> Callable[[str], tuple]:
+    def match(text):
+        text_lower = text.lower()
+        found_keywords = []
+        severity_level = "none"
+        for keyword in detector.crisis_keywords:
+            if keyword in text_lower:
+                found_keywords.append(keyword)
+                if keyword in detector.high_severity_keywords:
+                    severity_level = "high"
+                elif keyword in detector.medium_severity_keywords and severity_level != "high":
+                    severity_level = "medium"
+                elif severity_level == "none":
+                    severity_level = "low"
+        return found_keywords, severity_level
+    return match
+
+
+def us_per_call(match: Callable, texts, iterations: int) -> float:
+    match(texts[0])  # warm-up
+    start = time.perf_counter()
+    for i in range(iterations):
+        match(texts[i % len(texts)])
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=float, default=10)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    detector = CrisisDetector()
+    modes = {
+        "legacy loop": legacy_matcher(detector),
+        "keyword matcher": detector.keyword_matcher.match,
+    }
+
+    inputs = {
+        f"{args.size_kb:g} KB": [sample_text(int(args.size_kb * 1024), rng) for _ in range(16)],
+        "chat message": ["I can't take it anymore and I feel hopeless about work",
+                         "Had a good day with my friends, feeling better"],
+    }
+    print(f"{len(detector.crisis_keywords)} keywords, {args.iterations} calls per mode")
+    print("=" * 64)
+    print(f"{'mode':<26}" + "".join(f"{name:>19}" for name in inputs))
+    for name, match in modes.items():
+        timings = [us_per_call(match, texts, args.iterations) for texts in inputs.values()]
+        print(f"{name:<26}" + "".join(f"{timing:>16.1f} us" for timing in timings))
+
+    print("\nKeywords found in the first input of each kind:")
+    for input_name, texts in inputs.items():
+        for name, match in modes.items():
+            print(f"  {input_name:<14} {name:<18} {match(texts[0])}")
+
+
+if __name__ == "__main__":
+    main()
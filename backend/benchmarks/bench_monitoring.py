@@ -0,0 +1,99 @@
+"""
+Analytics Database Benchmark
+Measures interactions written per second under a mixed read/write load:
+writer threads call log_interaction while reader threads call the analytics
+queries. The connect-per-call baseline (default journal, no pragmas) is
+compared with pooled per-thread WAL connections.
+
+Usage (from backend/):
+    python -m benchmarks.bench_monitoring
+    python -m benchmarks.bench_monitoring --writers 4 --readers 2 --seconds 10
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+
+from services.db import ConnectionManager
+from services.monitoring import MentalHealthMonitor
+
+USERS = [f"bench_user_{i}" for i in range(50)]
+
+
+def run_load(monitor: MentalHealthMonitor, writers: int, readers: int, seconds: float, seed: int):
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0}
+    lock = threading.Lock()
+
+    def writer(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        sessions = {user: monitor.start_session(user) for user in USERS}
+        done = 0
+        while not stop.is_set():
+            user = rng.choice(USERS)
+            is_crisis = rng.random() < 0.02
+            monitor.log_interaction(
+                session_id=sessions[user], user_id=user, input_text="benchmark entry", input_type="text",
+                mood_score=rng.uniform(-1, 1), mood_label="POSITIVE", is_crisis=is_crisis,
+                crisis_level="high" if is_crisis else "none"
+            )
+            done += 1
+        with lock:
+            counts["writes"] += done
+
+    def reader(worker_id: int):
+        rng = random.Random(seed + 1000 + worker_id)
+        done = 0
+        while not stop.is_set():
+            if rng.random() < 0.5:
+                monitor.get_analytics_summary(days=1)
+            else:
+                monitor.get_user_analytics(rng.choice(USERS), days=7)
+            done += 1
+        with lock:
+            counts["reads"] += done
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts["writes"] / seconds, counts["reads"] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Per-call INFO logs would dominate the measurement
+    logging.getLogger("services.monitoring").setLevel(logging.ERROR)
+
+    print(f"Mixed load: {args.writers} writer(s), {args.readers} reader(s), {args.seconds:.0f}s per mode")
+    print("=" * 64)
+    print(f"{'mode':<20} {'interactions/s':>16} {'analytics reads/s':>18}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        modes = {
+            "connect-per-call": lambda path: ConnectionManager(path, pooled=False, pragmas={}),
+            "pooled + WAL": lambda path: ConnectionManager(path),
+        }
+        for name, make_manager in modes.items():
+            db_path = os.path.join(tmp_dir, f"{name.split()[0]}.db")
+            monitor = MentalHealthMonitor(db_path, db=make_manager(db_path))
+            writes, reads = run_load(monitor, args.writers, args.readers, args.seconds, args.seed)
+            monitor.db.close_all()
+            print(f"{name:<20} {writes:>16.1f} {reads:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Padding Benchmark for Length-Bucketed Batching
+Compares tokens processed vs. tokens padded when a batch is padded to its
+longest item versus when it is split into length buckets.
+
+Usage (from backend/):
+    python -m benchmarks.bench_padding
+    python -m benchmarks.bench_padding --with-model   # also time real ORT runs
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from models.bucketing import plan_length_buckets, padding_stats
+
+# Realistic traffic mix: (share, min_tokens, max_tokens)
+LENGTH_MIX = [
+    (0.70, 4, 24),     # daily check-ins and short replies
+    (0.22, 40, 160),   # journal paragraphs
+    (0.08, 250, 512),  # long diary entries
+]
+
+
+def sample_lengths(count: int, rng: random.Random) -> List[int]:
+    lengths = []
+    for _ in range(count):
+        roll = rng.random()
+        cumulative = 0.0
+        for share, low, high in LENGTH_MIX:
+            cumulative += share
+            if roll <= cumulative:
+                lengths.append(rng.randint(low, high))
+                break
+        else:
+            low, high = LENGTH_MIX[-1][1:]
+            lengths.append(rng.randint(low, high))
+    return lengths
+
+
+def compare_padding(num_batches: int, batch_size: int, length_ratio: float, seed: int):
+    rng = random.Random(seed)
+    totals = {
+        "single": {"buckets": 0, "real_tokens": 0, "processed_tokens": 0, "padded_tokens": 0, "attention_cells": 0},
+        "bucketed": {"buckets": 0, "real_tokens": 0, "processed_tokens": 0, "padded_tokens": 0, "attention_cells": 0},
+    }
+
+    for _ in range(num_batches):
+        lengths = sample_lengths(batch_size, rng)
+        plans = {
+            "single": [list(range(len(lengths)))],
+            "bucketed": plan_length_buckets(lengths, length_ratio=length_ratio),
+        }
+        for name, buckets in plans.items():
+            for key, value in padding_stats(lengths, buckets).items():
+                totals[name][key] += value
+
+    print(f"Length mix over {num_batches} batches of {batch_size} (bucket ratio {length_ratio})")
+    print("=" * 72)
+    print(f"{'strategy':<10} {'ORT calls':>10} {'real tok':>12} {'processed':>12} {'padded':>12} {'pad %':>7}")
+    for name, stats in totals.items():
+        pad_pct = stats["padded_tokens"] / stats["processed_tokens"] * 100
+        print(
+            f"{name:<10} {stats['buckets']:>10} {stats['real_tokens']:>12} "
+            f"{stats['processed_tokens']:>12} {stats['padded_tokens']:>12} {pad_pct:>6.1f}%"
+        )
+
+    single, bucketed = totals["single"], totals["bucketed"]
+    print("-" * 72)
+    print(f"Processed tokens reduced {single['processed_tokens'] / bucketed['processed_tokens']:.2f}x, "
+          f"attention cells reduced {single['attention_cells'] / bucketed['attention_cells']:.2f}x")
+
+
+def time_model(num_batches: int, batch_size: int, seed: int):
+    """Time a single padded ORT call against the bucketed analyze_mood_batch."""
+    import numpy as np
+    from models import model
+
+    rng = random.Random(seed)
+    batches = []
+    for _ in range(num_batches):
+        # One common word is roughly one token
+        batches.append([" ".join(["okay"] * max(1, n - 2)) for n in sample_lengths(batch_size, rng)])
+
+    sentiment_model = model.get_model()
+
+    def single_padded(texts):
+        inputs = sentiment_model.tokenizer(texts, return_tensors="np", padding=True, truncation=True)
+        sentiment_model.session_pool.run(None, {k: np.asarray(v, dtype=np.int64) for k, v in inputs.items()})
+
+    for name, fn in (("single", single_padded), ("bucketed", model.analyze_mood_batch)):
+        fn(batches[0])  # warm-up
+        start = time.perf_counter()
+        for texts in batches:
+            fn(texts)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {elapsed / num_batches * 1000:8.2f} ms/batch")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--ratio", type=float, default=1.5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--with-model", action="store_true", help="Also time real inference with ./onnx_model")
+    args = parser.parse_args()
+
+    compare_padding(args.batches, args.batch_size, args.ratio, args.seed)
+    if args.with_model:
+        print()
+        time_model(min(args.batches, 20), args.batch_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
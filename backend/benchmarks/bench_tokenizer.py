@@ -0,0 +1,92 @@
+"""
+Tokenization Microbenchmark
+Measures CPU time per request spent turning texts into int64 model inputs:
+the transformers ``__call__`` path with per-key numpy conversion versus the
+Rust ``tokenizers`` batch path writing into reused buffers. No inference is run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tokenizer
+    python -m benchmarks.bench_tokenizer --batch-sizes 1,8,32 --iterations 500
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from benchmarks.bench_padding import sample_lengths
+from models.bucketing import BucketBuffers
+from models.fast_tokenizer import FastTokenizer
+from models.model import ONNX_DIR
+
+WORDS = ["i", "feel", "really", "tired", "today", "but", "my", "friends", "helped", "and",
+         "work", "was", "stressful", "sleep", "better", "anxious", "about", "tomorrow"]
+
+
+def sample_texts(count: int, rng: random.Random) -> List[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(length)) for length in sample_lengths(count, rng)]
+
+
+def hf_encode(tokenizer, max_length: int) -> Callable[[List[str]], dict]:
+    def encode(texts):
+        encoded = tokenizer(texts, padding=True, truncation=True, max_length=max_length)
+        return {name: np.asarray(encoded[name], dtype=np.int64) for name in tokenizer.model_input_names}
+    return encode
+
+
+def fast_encode(tokenizer, fast_tokenizer: FastTokenizer, max_length: int) -> Callable[[List[str]], dict]:
+    buffers = BucketBuffers(tokenizer.model_input_names)
+    prefix, suffix = [tokenizer.cls_token_id], [tokenizer.sep_token_id]
+    content_length = max_length - len(prefix) - len(suffix)
+
+    def encode(texts):
+        windows = [ids[:content_length] for ids in fast_tokenizer.encode_ids(texts)]
+        return buffers.fill(windows, range(len(windows)), prefix, suffix, tokenizer.pad_token_id or 0)
+    return encode
+
+
+def cpu_ms_per_request(encode: Callable, batches: List[List[str]]) -> float:
+    encode(batches[0])  # warm-up
+    start = time.process_time()
+    for texts in batches:
+        encode(texts)
+    elapsed = time.process_time() - start
+    return elapsed * 1000 / sum(len(texts) for texts in batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default="1,32")
+    parser.add_argument("--iterations", type=int, default=300, help="Batches timed per batch size")
+    parser.add_argument("--max-length", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(str(ONNX_DIR))
+    fast_tokenizer = FastTokenizer.from_dir(ONNX_DIR)
+    if fast_tokenizer is None:
+        raise SystemExit(f"{ONNX_DIR / 'tokenizer.json'} is required for the fast path")
+
+    paths = {
+        "transformers": hf_encode(tokenizer, args.max_length),
+        "fast": fast_encode(tokenizer, fast_tokenizer, args.max_length),
+    }
+
+    print(f"CPU time per request to build model inputs ({args.iterations} batches per size)")
+    print("=" * 64)
+    print(f"{'batch':>6} {'transformers us':>16} {'fast us':>10} {'saved us':>10} {'speedup':>8}")
+    for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+        rng = random.Random(args.seed)
+        batches = [sample_texts(batch_size, rng) for _ in range(args.iterations)]
+        timings = {name: cpu_ms_per_request(encode, batches) * 1000 for name, encode in paths.items()}
+        saved = timings["transformers"] - timings["fast"]
+        print(f"{batch_size:>6} {timings['transformers']:>16.1f} {timings['fast']:>10.1f} "
+              f"{saved:>10.1f} {timings['transformers'] / timings['fast']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
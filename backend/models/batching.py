@@ -0,0 +1,160 @@
+"""
+Micro-batching Engine for Mental Health Assistant
+Collects concurrent inference requests into small batches so a single
+ONNX Runtime call can serve many callers at once.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets
+HISTOGRAM_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+class MicroBatcher:
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0,
+                 name: str = "batcher",
+                 num_workers: int = 1):
+        """
+        Args:
+            batch_fn: Function that maps a list of items to a list of results
+                in the same order
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: How long the first item of a batch may wait for
+                company before the batch is dispatched
+            name: Name used for the worker threads and in logs
+            num_workers: Number of dispatcher threads, i.e. batches that may
+                run concurrently (match the inference session pool size)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self.num_workers = max(1, int(num_workers))
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Statistics
+        self.total_batches = 0
+        self.total_items = 0
+        self.total_batch_time = 0.0
+        self.histogram = {bucket: 0 for bucket in HISTOGRAM_BUCKETS}
+        self.histogram_overflow = 0
+
+    def _ensure_workers(self):
+        """Start the dispatcher threads on first use."""
+        if self._workers:
+            return
+        with self._start_lock:
+            if not self._workers:
+                for i in range(self.num_workers):
+                    worker = threading.Thread(target=self._run, name=f"{self.name}-dispatcher-{i}", daemon=True)
+                    worker.start()
+                    self._workers.append(worker)
+                logger.info(
+                    f"Started micro-batcher '{self.name}' with {self.num_workers} dispatcher(s) "
+                    f"(max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait * 1000:.1f})"
+                )
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item for batched processing and return a future for its result."""
+        future: Future = Future()
+        self._ensure_workers()
+        self._queue.put((item, future))
+        return future
+
+    def infer(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Queue an item and block until its result is available."""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect_batch(self) -> List:
+        """Block for the first item, then gather more until the batch is full or the window closes."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    # Window closed, but still take anything that is already queued
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+
+            start = time.perf_counter()
+            try:
+                results = self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"Batch function returned {len(results)} results for {len(items)} items"
+                    )
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"Micro-batch '{self.name}' failed: {e}")
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+
+            self._record_batch(len(items), time.perf_counter() - start)
+
+    def _record_batch(self, size: int, elapsed: float):
+        with self._stats_lock:
+            self.total_batches += 1
+            self.total_items += size
+            self.total_batch_time += elapsed
+            for bucket in HISTOGRAM_BUCKETS:
+                if size <= bucket:
+                    self.histogram[bucket] += 1
+                    break
+            else:
+                self.histogram_overflow += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch-size histogram and throughput statistics."""
+        with self._stats_lock:
+            histogram = {}
+            lower = 1
+            for bucket in HISTOGRAM_BUCKETS:
+                label = str(bucket) if lower == bucket else f"{lower}-{bucket}"
+                histogram[label] = self.histogram[bucket]
+                lower = bucket + 1
+            if self.histogram_overflow:
+                histogram[f">{HISTOGRAM_BUCKETS[-1]}"] = self.histogram_overflow
+
+            return {
+                "name": self.name,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "dispatchers": self.num_workers,
+                "total_batches": self.total_batches,
+                "total_items": self.total_items,
+                "average_batch_size": round(self.total_items / self.total_batches, 2) if self.total_batches else 0,
+                "average_batch_time_ms": round(self.total_batch_time / self.total_batches * 1000, 2) if self.total_batches else 0,
+                "queue_depth": self._queue.qsize(),
+                "batch_size_histogram": histogram
+            }
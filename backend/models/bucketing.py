@@ -0,0 +1,145 @@
+"""
+Length Bucketing for Batched Tokenization
+Groups texts of similar token length so each ONNX Runtime call only pads
+to the longest text in its own bucket instead of the whole batch.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+
+def plan_length_buckets(lengths: Sequence[int],
+                        length_ratio: float = 1.5,
+                        min_slack: int = 8,
+                        max_bucket_size: Optional[int] = None) -> List[List[int]]:
+    """
+    Split a batch into buckets of similar token length.
+
+    Items are sorted by length and a new bucket is started whenever the next
+    item would be both ``length_ratio`` times and ``min_slack`` tokens longer
+    than the shortest item in the current bucket.
+
+    Args:
+        lengths: Token length of each item
+        length_ratio: Maximum longest/shortest ratio inside a bucket
+        min_slack: Length difference that is always tolerated, so short
+            texts are not split into many tiny runs
+        max_bucket_size: Optional cap on items per bucket
+
+    Returns:
+        List of buckets, each a list of indices into ``lengths``
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+
+    buckets: List[List[int]] = []
+    current: List[int] = []
+    bucket_min = 0
+
+    for index in order:
+        length = lengths[index]
+        if current:
+            too_long = length > bucket_min * length_ratio and length - bucket_min > min_slack
+            too_big = max_bucket_size is not None and len(current) >= max_bucket_size
+            if too_long or too_big:
+                buckets.append(current)
+                current = []
+        if not current:
+            bucket_min = length
+        current.append(index)
+
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+class BucketBuffers:
+    """
+    Reusable int64 model input buffers.
+
+    Each bucket is written into a view of a flat per-input buffer that only
+    grows, so in steady state building model inputs allocates nothing. The
+    views are overwritten by the next ``fill`` call, so keep one instance per
+    session or thread and finish the ORT run before filling again.
+    """
+
+    def __init__(self, input_names: Sequence[str]):
+        self.input_names = list(input_names)
+        self._flat = {name: np.empty(0, dtype=np.int64) for name in self.input_names}
+        self.allocations = 0
+
+    def _view(self, name: str, rows: int, cols: int) -> np.ndarray:
+        needed = rows * cols
+        flat = self._flat[name]
+        if flat.size < needed:
+            flat = np.empty(max(needed, flat.size * 2), dtype=np.int64)
+            self._flat[name] = flat
+            self.allocations += 1
+        # A prefix of a flat buffer reshapes to a C-contiguous view
+        return flat[:needed].reshape(rows, cols)
+
+    def fill(self,
+             windows: Sequence[Sequence[int]],
+             indices: Sequence[int],
+             prefix: Sequence[int] = (),
+             suffix: Sequence[int] = (),
+             pad_id: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Write one bucket of token windows as padded model inputs.
+
+        Args:
+            windows: Token ids of every window (without special tokens)
+            indices: Windows that belong to the bucket
+            prefix: Special tokens prepended to each window (e.g. [CLS])
+            suffix: Special tokens appended to each window (e.g. [SEP])
+            pad_id: Padding token id
+
+        Returns:
+            Dictionary of ``(len(indices), max_length)`` int64 arrays
+        """
+        extra = len(prefix) + len(suffix)
+        rows = len(indices)
+        cols = max(len(windows[i]) for i in indices) + extra
+
+        inputs = {}
+        ids = None
+        mask = None
+        for name in self.input_names:
+            view = self._view(name, rows, cols)
+            if name == "input_ids":
+                view.fill(pad_id)
+                ids = view
+            else:
+                view.fill(0)
+                if name == "attention_mask":
+                    mask = view
+            inputs[name] = view
+
+        for row, index in enumerate(indices):
+            window = windows[index]
+            end = len(prefix) + len(window)
+            if ids is not None:
+                ids[row, :len(prefix)] = prefix
+                ids[row, len(prefix):end] = window
+                ids[row, end:end + len(suffix)] = suffix
+            if mask is not None:
+                mask[row, :end + len(suffix)] = 1
+        return inputs
+
+
+def padding_stats(lengths: Sequence[int], buckets: List[List[int]]) -> Dict[str, int]:
+    """Count real tokens and padding tokens processed for a bucket plan."""
+    real_tokens = int(sum(lengths))
+    processed_tokens = 0
+    attention_cells = 0
+    for bucket in buckets:
+        longest = max(lengths[i] for i in bucket)
+        processed_tokens += longest * len(bucket)
+        attention_cells += longest * longest * len(bucket)
+
+    return {
+        "buckets": len(buckets),
+        "real_tokens": real_tokens,
+        "processed_tokens": processed_tokens,
+        "padded_tokens": processed_tokens - real_tokens,
+        "attention_cells": attention_cells
+    }
@@ -0,0 +1,128 @@
+"""
+Result Cache for Text Sentiment
+Bounded LRU/TTL cache keyed by normalized text, so resent messages
+("I'm fine", retries, repeated check-in answers) skip tokenization and
+ONNX inference entirely.
+"""
+
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Approximate per-entry overhead (OrderedDict node, tuple, result tuple, float)
+ENTRY_OVERHEAD_BYTES = 240
+
+
+class MoodCache:
+    def __init__(self,
+                 max_entries: int = 10000,
+                 max_bytes: int = 16 * 1024 * 1024,
+                 ttl_seconds: float = 3600,
+                 lowercase: bool = False):
+        """
+        Args:
+            max_entries: Maximum number of cached texts
+            max_bytes: Approximate memory bound for keys and results
+            ttl_seconds: Time after which an entry is treated as a miss
+            lowercase: Fold case in the key (only safe for uncased models)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.lowercase = lowercase
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._version: Optional[Hashable] = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def normalize(self, text: str) -> str:
+        """Normalize text into a cache key (Unicode NFC, collapsed whitespace)."""
+        key = " ".join(unicodedata.normalize("NFC", text).split())
+        return key.lower() if self.lowercase else key
+
+    def _check_version(self, version: Optional[Hashable]):
+        """Drop every entry when the model the results came from has changed."""
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, text: str, version: Optional[Hashable] = None) -> Optional[Any]:
+        """Return the cached result for ``text`` or None on a miss."""
+        key = self.normalize(text)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, size = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, text: str, value: Any, version: Optional[Hashable] = None):
+        """Cache ``value`` for ``text``, evicting least recently used entries as needed."""
+        key = self.normalize(text)
+        size = sys.getsizeof(key) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approx_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
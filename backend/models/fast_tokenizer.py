@@ -0,0 +1,43 @@
+"""
+Fast Tokenization Path
+Drives the Rust ``tokenizers`` backend directly in batch mode, skipping the
+per-call overhead of the transformers ``__call__`` path (BatchEncoding,
+padding/truncation bookkeeping, per-key tensor conversion).
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FastTokenizer:
+    def __init__(self, tokenizer_file: Path):
+        from tokenizers import Tokenizer
+
+        self.tokenizer_file = Path(tokenizer_file)
+        self._tokenizer = Tokenizer.from_file(str(self.tokenizer_file))
+        # Padding and windowing are done by the caller on raw token ids
+        self._tokenizer.no_padding()
+        self._tokenizer.no_truncation()
+
+    @classmethod
+    def from_dir(cls, model_dir: Path) -> Optional["FastTokenizer"]:
+        """Load ``tokenizer.json`` from a model directory, or return None if unavailable."""
+        tokenizer_file = Path(model_dir) / "tokenizer.json"
+        if not tokenizer_file.exists():
+            logger.warning(f"{tokenizer_file} not found, using the transformers tokenizer")
+            return None
+        try:
+            return cls(tokenizer_file)
+        except Exception as e:
+            logger.warning(f"Could not load fast tokenizer from {tokenizer_file}: {e}")
+            return None
+
+    def encode_ids(self, texts: List[str]) -> List[List[int]]:
+        """Token ids for each text, without special tokens, truncation or padding."""
+        encodings = self._tokenizer.encode_batch(texts, add_special_tokens=False)
+        return [encoding.ids for encoding in encodings]
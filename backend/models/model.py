@@ -1,8 +1,9 @@
 import os
+import threading
+import time
 from pathlib import Path
+from typing import List, Optional, Tuple
 import numpy as np
-import onnxruntime as ort
-from transformers import AutoTokenizer
 import logging
 
 # Setup logging
@@ -11,37 +12,30 @@ logger = logging.getLogger(__name__)
 
 # Import model manager
 from .model_manager import ensure_model_available
-
-# Ensure model is available before proceeding
-if not ensure_model_available():
-    raise RuntimeError("Failed to download or locate ONNX model. Please check your internet connection and try again.")
+from .batching import MicroBatcher
+from .bucketing import plan_length_buckets
+from .windowing import AGGREGATION_METHODS, split_windows, aggregate_windows
+from .cache import MoodCache
+from .registry import ModelRegistry
 
 # Paths
 ONNX_DIR = Path("./onnx_model")
 QUANT_MODEL_PATH = ONNX_DIR / "model_quantized.onnx"
 MODEL_PATH = ONNX_DIR / "model.onnx"
 
-# Load tokenizer
-try:
-    tokenizer = AutoTokenizer.from_pretrained(str(ONNX_DIR))
-except Exception as e:
-    logger.error(f"Failed to load tokenizer: {e}")
-    raise RuntimeError("Failed to load tokenizer. Model may be corrupted.")
-
-# Prefer quantized model if available
-onnx_model_file = QUANT_MODEL_PATH if QUANT_MODEL_PATH.exists() else MODEL_PATH
-if not onnx_model_file.exists():
-    raise FileNotFoundError(
-        f"ONNX model not found at {onnx_model_file}. This should not happen after model_manager check."
-    )
-
-# Initialize ONNX Runtime session (CPU)
-try:
-    session = ort.InferenceSession(str(onnx_model_file), providers=["CPUExecutionProvider"])
-    logger.info(f"Successfully loaded ONNX model: {onnx_model_file}")
-except Exception as e:
-    logger.error(f"Failed to initialize ONNX session: {e}")
-    raise RuntimeError("Failed to initialize ONNX model session.")
+# Number of ONNX Runtime sessions per worker
+SESSION_POOL_SIZE = int(os.getenv("ORT_SESSION_POOL_SIZE", "1"))
+
+# Texts are grouped so that no bucket pads to more than this ratio of its shortest item
+BUCKET_LENGTH_RATIO = float(os.getenv("MOOD_BUCKET_LENGTH_RATIO", "1.5"))
+
+# Long texts are scored as overlapping windows instead of being truncated
+MAX_LENGTH_LIMIT = int(os.getenv("MOOD_MAX_LENGTH", "512"))
+WINDOW_OVERLAP = int(os.getenv("MOOD_WINDOW_OVERLAP", "128"))
+LONG_TEXT_AGGREGATION = os.getenv("MOOD_LONG_TEXT_AGGREGATION", "mean").lower()
+if LONG_TEXT_AGGREGATION not in AGGREGATION_METHODS:
+    logger.warning(f"Unknown MOOD_LONG_TEXT_AGGREGATION '{LONG_TEXT_AGGREGATION}', using 'mean'")
+    LONG_TEXT_AGGREGATION = "mean"
 
 
 def softmax(logits: np.ndarray) -> np.ndarray:
@@ -51,26 +45,305 @@ def softmax(logits: np.ndarray) -> np.ndarray:
     return exp / exp.sum(axis=-1, keepdims=True)
 
 
+class SentimentModel:
+    """Tokenizer and ONNX Runtime session pool for one model file."""
+
+    def __init__(self, model_file: Path, tokenizer_dir: Path = ONNX_DIR, pool_size: int = SESSION_POOL_SIZE):
+        # Heavy imports are deferred so importing this module stays cheap
+        from transformers import AutoTokenizer
+        from .fast_tokenizer import FastTokenizer
+        from .session_profile import SessionProfile
+        from .session_pool import SessionPool
+
+        self.model_file = Path(model_file)
+        if not self.model_file.exists():
+            raise FileNotFoundError(
+                f"ONNX model not found at {self.model_file}. This should not happen after model_manager check."
+            )
+
+        # Load tokenizer
+        try:
+            self.tokenizer = AutoTokenizer.from_pretrained(str(tokenizer_dir))
+        except Exception as e:
+            logger.error(f"Failed to load tokenizer: {e}")
+            raise RuntimeError("Failed to load tokenizer. Model may be corrupted.")
+        # Batch encoding straight through the Rust backend when tokenizer.json is present
+        self.fast_tokenizer = FastTokenizer.from_dir(tokenizer_dir)
+
+        # Initialize a pool of ONNX Runtime sessions (CPU) with the configured tuning profile
+        self.session_profile = SessionProfile.from_env(sessions_per_worker=pool_size)
+        try:
+            self.session_pool = SessionPool(self.model_file, size=pool_size, profile=self.session_profile)
+            logger.info(
+                f"Successfully loaded ONNX model: {self.model_file} in {self.session_pool.load_info[0]['load_ms']} ms "
+                f"(optimized graph cached: {self.session_pool.load_info[0]['optimized_graph_cached']})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize ONNX session: {e}")
+            raise RuntimeError("Failed to initialize ONNX model session.")
+
+        self.max_length = min(int(getattr(self.tokenizer, "model_max_length", 512) or 512), MAX_LENGTH_LIMIT)
+        self.lowercase = bool(getattr(self.tokenizer, "do_lower_case", False))
+        # DistilBERT wraps every sequence as [CLS] ... [SEP]
+        self.prefix_ids = [self.tokenizer.cls_token_id] if self.tokenizer.cls_token_id is not None else []
+        self.suffix_ids = [self.tokenizer.sep_token_id] if self.tokenizer.sep_token_id is not None else []
+        self.pad_id = self.tokenizer.pad_token_id or 0
+
+    def file_signature(self):
+        """Identify the model file on disk so cached results can be invalidated when it changes."""
+        try:
+            stat = self.model_file.stat()
+            return (str(self.model_file), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (str(self.model_file), None, None)
+
+    def _encode(self, texts: List[str]) -> List[List[int]]:
+        """Token ids per text without special tokens, truncation or padding."""
+        if self.fast_tokenizer is not None:
+            return self.fast_tokenizer.encode_ids(list(texts))
+        return self.tokenizer(list(texts), add_special_tokens=False, truncation=False, verbose=False)["input_ids"]
+
+    def _build_windows(self, texts: List[str], aggregation: str):
+        """Tokenize texts into model-sized windows, remembering which text each window came from."""
+        content_length = self.max_length - len(self.prefix_ids) - len(self.suffix_ids)
+
+        windows = []
+        owners = []
+        for index, ids in enumerate(self._encode(texts)):
+            chunks = split_windows(ids, content_length, WINDOW_OVERLAP)
+            if aggregation == "truncate":
+                chunks = chunks[:1]
+            windows.extend(chunks)
+            owners.extend([index] * len(chunks))
+        return windows, owners
+
+    def analyze_batch(self, texts: List[str], aggregation: Optional[str] = None) -> List[Tuple[float, str]]:
+        """
+        Score several texts, running one ONNX Runtime call per length bucket.
+
+        Texts are tokenized without padding; texts longer than the model's
+        maximum length are split into overlapping windows. Windows are grouped
+        with windows of similar token length, padded only to the longest item
+        in their bucket, scored exactly once, and aggregated back per text in
+        the original order.
+
+        Args:
+            texts: Texts to score
+            aggregation: How window scores of long texts are combined
+                (``mean``, ``min``, ``attention`` or ``truncate``);
+                defaults to MOOD_LONG_TEXT_AGGREGATION
+        """
+        if not texts:
+            return []
+        aggregation = aggregation or LONG_TEXT_AGGREGATION
+
+        windows, owners = self._build_windows(texts, aggregation)
+        special = len(self.prefix_ids) + len(self.suffix_ids)
+        lengths = [len(ids) + special for ids in windows]
+
+        window_probs = np.empty((len(owners), 2), dtype=np.float64)
+        with self.session_pool.checkout() as session:
+            for bucket in plan_length_buckets(lengths, length_ratio=BUCKET_LENGTH_RATIO):
+                # int64 inputs and logits live in the checked-out session's reusable buffers
+                ort_inputs = session.buffers.fill(windows, bucket, self.prefix_ids, self.suffix_ids, self.pad_id)
+                ort_outputs = session.infer(ort_inputs)
+                window_probs[bucket] = softmax(ort_outputs[0])
+
+        # Windows of one text are contiguous, in text order
+        results = []
+        owners = np.asarray(owners)
+        lengths = np.asarray(lengths)
+        bounds = np.searchsorted(owners, np.arange(len(texts) + 1))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            results.append(aggregate_windows(window_probs[start:end], lengths[start:end], aggregation))
+        return results
+
+
+# Lazily loaded model: nothing heavy happens at import time. The registry
+# holds the active model and swaps in reloaded variants atomically.
+registry = ModelRegistry(ONNX_DIR, loader=SentimentModel)
+_load_lock = threading.Lock()
+_load_state = {"status": "not_loaded", "error": None, "load_ms": None, "warmup_thread": None}
+
+
+def _load_model() -> SentimentModel:
+    # Ensure model is available before proceeding
+    if not ensure_model_available():
+        raise RuntimeError("Failed to download or locate ONNX model. Please check your internet connection and try again.")
+
+    # Prefer quantized model if available, unless a variant is pinned
+    pinned_variant = os.getenv("MODEL_VARIANT")
+    if pinned_variant:
+        onnx_model_file = registry.resolve_variant(pinned_variant)
+    else:
+        onnx_model_file = QUANT_MODEL_PATH if QUANT_MODEL_PATH.exists() else MODEL_PATH
+    return SentimentModel(onnx_model_file)
+
+
+def get_model() -> SentimentModel:
+    """Return the active model, loading it on first use (thread-safe)."""
+    model = registry.active
+    if model is not None:
+        return model
+
+    with _load_lock:
+        if registry.active is None:
+            _load_state.update({"status": "loading", "error": None})
+            start = time.perf_counter()
+            try:
+                registry.activate(_load_model())
+            except Exception as e:
+                _load_state.update({"status": "failed", "error": str(e)})
+                raise
+            _load_state.update({"status": "ready", "load_ms": round((time.perf_counter() - start) * 1000, 1)})
+    return registry.active
+
+
+def is_model_ready() -> bool:
+    return registry.active is not None
+
+
+def start_background_warmup() -> threading.Thread:
+    """Load the model and run one warm-up inference on a background thread."""
+    def _warmup():
+        try:
+            get_model().analyze_batch(["warm-up"])
+            logger.info("Sentiment model warmed up")
+        except Exception as e:
+            logger.error(f"Background model warm-up failed: {e}")
+
+    with _load_lock:
+        thread = _load_state["warmup_thread"]
+        if thread is None:
+            thread = threading.Thread(target=_warmup, name="model-warmup", daemon=True)
+            _load_state["warmup_thread"] = thread
+            thread.start()
+    return thread
+
+
+def get_model_status() -> dict:
+    """Get the loading state of the sentiment model and the registry."""
+    status = {
+        "status": _load_state["status"],
+        "ready": is_model_ready(),
+        "load_ms": _load_state["load_ms"],
+        "error": _load_state["error"]
+    }
+    status.update(registry.get_status())
+    return status
+
+
+def reload_model(variant: Optional[str] = None) -> dict:
+    """Load a model variant in the background, warm it up and swap it in."""
+    get_model()
+    return registry.reload(variant)
+
+
+def rollback_model() -> dict:
+    """Swap back to the previously active model variant."""
+    return registry.rollback()
+
+
+def list_model_variants() -> List[dict]:
+    """List model variants available in the model directory."""
+    return registry.list_variants()
+
+
+def analyze_mood_batch(texts: List[str], aggregation: Optional[str] = None) -> List[Tuple[float, str]]:
+    """Score several texts with the loaded model (see SentimentModel.analyze_batch)."""
+    return get_model().analyze_batch(texts, aggregation)
+
+
+# Micro-batching: concurrent analyze_mood calls share one ORT run
+BATCHING_ENABLED = os.getenv("MOOD_BATCHING_ENABLED", "true").lower() == "true"
+BATCH_MAX_SIZE = int(os.getenv("MOOD_BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("MOOD_BATCH_MAX_WAIT_MS", "5"))
+
+batcher = MicroBatcher(
+    analyze_mood_batch,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_MAX_WAIT_MS,
+    name="mood",
+    num_workers=SESSION_POOL_SIZE,
+) if BATCHING_ENABLED and BATCH_MAX_SIZE > 1 else None
+
+
+# Result cache in front of the model, invalidated when the model file changes
+CACHE_ENABLED = os.getenv("MOOD_CACHE_ENABLED", "true").lower() == "true"
+
+mood_cache = MoodCache(
+    max_entries=int(os.getenv("MOOD_CACHE_MAX_ENTRIES", "10000")),
+    max_bytes=int(float(os.getenv("MOOD_CACHE_MAX_MB", "16")) * 1024 * 1024),
+    ttl_seconds=float(os.getenv("MOOD_CACHE_TTL_SECONDS", "3600")),
+) if CACHE_ENABLED else None
+
+
+# Cache key settings of the active model, bound on every registry swap
+_cache_binding = {"version": None}
+
+
+def _bind_mood_cache(model):
+    """Key cached results to a newly active model: its file signature and case folding."""
+    _cache_binding["version"] = model.file_signature()
+    if mood_cache is not None:
+        mood_cache.lowercase = model.lowercase
+
+
+registry.add_listener(_bind_mood_cache)
+
+
 def analyze_mood(text: str):
-    # Tokenize to NumPy tensors
-    inputs = tokenizer(text, return_tensors="np", padding=True, truncation=True)
-
-    # Map inputs to ORT inputs with correct dtypes (int64 expected by model)
-    ort_inputs = {}
-    for k, v in inputs.items():
-        arr = np.asarray(v)
-        if arr.dtype != np.int64:
-            arr = arr.astype(np.int64)
-        ort_inputs[k] = arr
-
-    # Run inference
-    ort_outputs = session.run(None, ort_inputs)
-    logits = ort_outputs[0]
-
-    probs = softmax(logits)
-    label_id = int(np.argmax(probs, axis=-1)[0])
-    score = float(probs[0][label_id])
-
-    label = "POSITIVE" if label_id == 1 else "NEGATIVE"
-    mood_score = score if label == "POSITIVE" else -score
-    return mood_score, label
+    version = None
+    if mood_cache is not None:
+        get_model()
+        version = _cache_binding["version"]
+        cached = mood_cache.get(text, version)
+        if cached is not None:
+            return cached
+
+    if batcher is not None:
+        result = batcher.infer(text)
+    else:
+        result = analyze_mood_batch([text])[0]
+
+    if mood_cache is not None:
+        mood_cache.put(text, result, version)
+    return result
+
+
+def analyze_moods(texts: List[str]) -> List[Tuple[float, str]]:
+    """
+    Score many texts at once, for bulk requests.
+
+    Cached results are reused; the remaining distinct texts are scored
+    together in one batched model call instead of going through the
+    micro-batcher one by one. Results are returned in input order.
+    """
+    results: List[Optional[Tuple[float, str]]] = [None] * len(texts)
+    version = None
+    if mood_cache is not None:
+        get_model()
+        version = _cache_binding["version"]
+        for index, text in enumerate(texts):
+            results[index] = mood_cache.get(text, version)
+
+    pending = list(dict.fromkeys(text for text, result in zip(texts, results) if result is None))
+    if pending:
+        scored = dict(zip(pending, analyze_mood_batch(pending)))
+        for index, text in enumerate(texts):
+            if results[index] is None:
+                results[index] = scored[text]
+        if mood_cache is not None:
+            for text, result in scored.items():
+                mood_cache.put(text, result, version)
+    return results
+
+
+def get_inference_stats() -> dict:
+    """Get micro-batching, result cache and session pool statistics for the sentiment model."""
+    stats = {"batching_enabled": False} if batcher is None else {"batching_enabled": True, **batcher.get_stats()}
+    stats["cache"] = mood_cache.get_stats() if mood_cache is not None else {"enabled": False}
+    stats["model"] = get_model_status()
+    if registry.active is not None:
+        stats["session_pool"] = registry.active.session_pool.get_stats()
+    return stats
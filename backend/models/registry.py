@@ -0,0 +1,179 @@
+"""
+Model Variant Registry
+Lists the ONNX model variants available on disk, loads and warms a new
+variant in the background and atomically swaps it in. Requests that already
+hold the previous model finish on its sessions; the previous model is kept
+loaded so it can be rolled back to instantly.
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXTS = [
+    "I'm fine",
+    "I had a really good day with my friends today.",
+    "I feel hopeless and I don't know what to do anymore.",
+]
+
+
+class ModelRegistry:
+    def __init__(self,
+                 model_dir: Path,
+                 loader: Callable[[Path], Any],
+                 max_history: int = 1):
+        """
+        Args:
+            model_dir: Directory containing ``*.onnx`` variants
+            loader: Builds a ready-to-use model object from a model file;
+                the object must provide ``model_file`` and ``analyze_batch``
+            max_history: Number of previous models kept loaded for rollback
+        """
+        self.model_dir = Path(model_dir)
+        self.loader = loader
+
+        self._active = None
+        self._history: deque = deque(maxlen=max(1, max_history))
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self.last_reload: Dict[str, Any] = {}
+        # Called with the new active model after every activation and rollback
+        self.listeners: List[Callable[[Any], None]] = []
+
+    @property
+    def active(self):
+        """The model currently serving requests (None until one is activated)."""
+        return self._active
+
+    def list_variants(self) -> List[Dict[str, Any]]:
+        """List the model files available in the model directory."""
+        active_file = Path(self._active.model_file) if self._active is not None else None
+        variants = []
+        for path in sorted(self.model_dir.glob("*.onnx")):
+            stat = path.stat()
+            variants.append({
+                "name": path.stem,
+                "path": str(path),
+                "size_mb": round(stat.st_size / (1024 * 1024), 2),
+                "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                "active": active_file is not None and path.resolve() == active_file.resolve()
+            })
+        return variants
+
+    def resolve_variant(self, name: str) -> Path:
+        """Map a variant name (file stem) to its model file."""
+        path = self.model_dir / f"{Path(name).stem}.onnx"
+        if not path.exists():
+            available = ", ".join(variant["name"] for variant in self.list_variants())
+            raise ValueError(f"Unknown model variant '{name}'. Available: {available}")
+        return path
+
+    def add_listener(self, listener: Callable[[Any], None]):
+        """Register a callback run with the new active model on every swap (e.g. to rebind caches)."""
+        self.listeners.append(listener)
+
+    def _notify_listeners(self, model):
+        for listener in self.listeners:
+            try:
+                listener(model)
+            except Exception as e:
+                logger.error(f"Model swap listener failed: {e}")
+
+    def activate(self, model) -> None:
+        """Atomically make ``model`` the active model, keeping the previous one for rollback."""
+        with self._swap_lock:
+            previous = self._active
+            self._active = model
+            if previous is not None:
+                self._history.append(previous)
+            # Under the swap lock, so listeners see swaps in order
+            self._notify_listeners(model)
+        logger.info(f"Active model is now {model.model_file}")
+
+    def _warm_up(self, model):
+        model.analyze_batch(WARMUP_TEXTS)
+
+    def _reload(self, path: Path):
+        start = time.perf_counter()
+        self.last_reload = {"status": "loading", "variant": path.stem, "started_at": datetime.now().isoformat()}
+        try:
+            model = self.loader(path)
+            self._warm_up(model)
+            self.activate(model)
+            self.last_reload.update({
+                "status": "completed",
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+            })
+        except Exception as e:
+            logger.error(f"Failed to reload model variant {path.stem}: {e}")
+            self.last_reload.update({"status": "failed", "error": str(e)})
+        finally:
+            self._reload_lock.release()
+
+    def reload(self, variant: Optional[str] = None, background: bool = True) -> Dict[str, Any]:
+        """
+        Load ``variant`` (default: the active model's file), warm it up and swap it in.
+
+        Returns:
+            Reload status; ``status`` is ``reloading`` for background reloads
+
+        Raises:
+            ValueError: If the variant does not exist
+            RuntimeError: If another reload is already in progress
+        """
+        if variant:
+            path = self.resolve_variant(variant)
+        elif self._active is not None:
+            path = Path(self._active.model_file)
+        else:
+            raise ValueError("No variant given and no model is active")
+
+        if not self._reload_lock.acquire(blocking=False):
+            raise RuntimeError("A model reload is already in progress")
+
+        if background:
+            self._reload_thread = threading.Thread(
+                target=self._reload, args=(path,), name="model-reload", daemon=True
+            )
+            self._reload_thread.start()
+            return {"status": "reloading", "variant": path.stem}
+
+        self._reload(path)
+        return dict(self.last_reload)
+
+    def rollback(self) -> Dict[str, Any]:
+        """
+        Swap back to the most recently replaced model.
+
+        Raises:
+            RuntimeError: If there is no previous model to roll back to
+        """
+        with self._swap_lock:
+            if not self._history:
+                raise RuntimeError("No previous model to roll back to")
+            previous = self._history.pop()
+            current = self._active
+            self._active = previous
+            if current is not None:
+                self._history.append(current)
+            self._notify_listeners(previous)
+        logger.info(f"Rolled back to model {previous.model_file}")
+        return {"status": "rolled_back", "variant": Path(previous.model_file).stem}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get active model, rollback history and last reload result."""
+        return {
+            "active": str(self._active.model_file) if self._active is not None else None,
+            "rollback_available": [str(model.model_file) for model in self._history],
+            "reload_in_progress": self._reload_lock.locked(),
+            "last_reload": dict(self.last_reload)
+        }
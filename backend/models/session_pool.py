@@ -0,0 +1,124 @@
+"""
+ONNX Runtime Session Pool
+Holds N independent inference sessions (each with its own intra-op thread
+count) with checkout/return semantics, so throughput vs. latency can be
+tuned as "N sessions x M threads" on multi-core nodes.
+"""
+
+import queue
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .io_binding import BoundSession
+from .session_profile import SessionProfile, create_session
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    def __init__(self, model_path: Path, size: int = 1, profile: Optional[SessionProfile] = None):
+        """
+        Args:
+            model_path: ONNX model to load into every session
+            size: Number of sessions in the pool
+            profile: Session tuning profile shared by all sessions
+        """
+        self.model_path = Path(model_path)
+        self.size = max(1, int(size))
+        self.profile = profile or SessionProfile(sessions_per_worker=self.size)
+
+        self._available: "queue.LifoQueue" = queue.LifoQueue()
+        self._stats_lock = threading.Lock()
+        self.load_info: List[Dict[str, Any]] = []
+        self.sessions: List[BoundSession] = []
+
+        for _ in range(self.size):
+            session, info = create_session(self.model_path, self.profile)
+            bound = BoundSession(session, io_binding=self.profile.io_binding)
+            self.sessions.append(bound)
+            self._available.put(bound)
+            self.load_info.append(info)
+
+        # Statistics
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.contended_checkouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+        logger.info(
+            f"Session pool ready: {self.size} session(s) x "
+            f"{self.profile.intra_op_threads} intra-op thread(s) for {self.model_path}"
+        )
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Borrow a session for the duration of a ``with`` block.
+
+        Yields a ``BoundSession``; its buffers belong to the borrower until
+        the block exits.
+
+        Raises:
+            TimeoutError: If no session becomes available within ``timeout`` seconds
+        """
+        start = time.perf_counter()
+        with self._stats_lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+        try:
+            try:
+                session = self._available.get_nowait()
+                contended = False
+            except queue.Empty:
+                contended = True
+                session = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No inference session available within {timeout}s")
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.waiting -= 1
+
+        with self._stats_lock:
+            self.checkouts += 1
+            self.contended_checkouts += 1 if contended else 0
+            self.total_wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+        try:
+            yield session
+        finally:
+            self._available.put(session)
+
+    def run(self, output_names, inputs: Dict[str, Any], timeout: Optional[float] = None):
+        """Run one inference on any free session."""
+        with self.checkout(timeout=timeout) as session:
+            return session.run(output_names, inputs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size, queue depth and checkout wait statistics."""
+        with self._stats_lock:
+            return {
+                "model_path": str(self.model_path),
+                "size": self.size,
+                "available": self._available.qsize(),
+                "in_use": self.size - self._available.qsize(),
+                "queue_depth": self.waiting,
+                "max_queue_depth": self.max_waiting,
+                "checkouts": self.checkouts,
+                "contended_checkouts": self.contended_checkouts,
+                "average_wait_ms": round(self.total_wait_time / self.checkouts * 1000, 3) if self.checkouts else 0,
+                "max_wait_ms": round(self.max_wait_time * 1000, 3),
+                "buffers": [bound.get_stats() for bound in self.sessions],
+                "profile": self.profile.to_dict(),
+                "load_info": self.load_info
+            }
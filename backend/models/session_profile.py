@@ -0,0 +1,196 @@
+"""
+ONNX Runtime Session Profile
+Configurable SessionOptions (threads, execution mode, graph optimization
+level, memory arena) and an on-disk cache of the optimized graph so later
+boots skip graph optimization.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import onnxruntime as ort
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+# Optimized graphs are kept out of the model directory listing
+OPTIMIZED_CACHE_DIRNAME = ".ort_cache"
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "true" if default else "false").lower() == "true"
+
+
+class SessionProfile:
+    def __init__(self,
+                 intra_op_threads: Optional[int] = None,
+                 inter_op_threads: int = 1,
+                 execution_mode: str = "sequential",
+                 optimization_level: str = "extended",
+                 enable_cpu_mem_arena: bool = True,
+                 allow_spinning: Optional[bool] = None,
+                 cache_optimized_graph: bool = True,
+                 io_binding: bool = True,
+                 sessions_per_worker: int = 1):
+        """
+        Args:
+            intra_op_threads: Threads used inside an operator. Defaults to the
+                CPU count divided by the number of uvicorn workers
+                (WEB_CONCURRENCY) and sessions per worker, so sessions sharing
+                a box do not oversubscribe it
+            inter_op_threads: Threads used across operators (parallel mode only)
+            execution_mode: ``sequential`` or ``parallel``
+            optimization_level: ``disable``, ``basic``, ``extended`` or ``all``
+            enable_cpu_mem_arena: Keep ORT's CPU memory arena
+            allow_spinning: Let idle intra-op threads busy-wait. Defaults to
+                on only when a single session owns the machine
+            cache_optimized_graph: Serialize the optimized graph and reuse it
+            io_binding: Run through IOBinding with reusable input/output buffers
+            sessions_per_worker: Number of pooled sessions in each worker
+        """
+        workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+        cpu_count = os.cpu_count() or 1
+
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution_mode}'")
+        if optimization_level not in OPTIMIZATION_LEVELS:
+            raise ValueError(f"Unknown graph optimization level '{optimization_level}'")
+
+        self.intra_op_threads = intra_op_threads or max(1, cpu_count // (workers * max(1, sessions_per_worker)))
+        self.inter_op_threads = inter_op_threads
+        self.execution_mode = execution_mode
+        self.optimization_level = optimization_level
+        self.enable_cpu_mem_arena = enable_cpu_mem_arena
+        self.allow_spinning = allow_spinning if allow_spinning is not None else workers * sessions_per_worker == 1
+        self.cache_optimized_graph = cache_optimized_graph
+        self.io_binding = io_binding
+
+    @classmethod
+    def from_env(cls, sessions_per_worker: int = 1) -> "SessionProfile":
+        """Build a profile from ORT_* environment variables."""
+        spinning = os.getenv("ORT_ALLOW_SPINNING")
+        return cls(
+            intra_op_threads=int(os.getenv("ORT_INTRA_OP_THREADS", "0")) or None,
+            inter_op_threads=int(os.getenv("ORT_INTER_OP_THREADS", "1")),
+            execution_mode=os.getenv("ORT_EXECUTION_MODE", "sequential").lower(),
+            optimization_level=os.getenv("ORT_GRAPH_OPTIMIZATION_LEVEL", "extended").lower(),
+            enable_cpu_mem_arena=_env_bool("ORT_ENABLE_CPU_MEM_ARENA", True),
+            allow_spinning=spinning.lower() == "true" if spinning else None,
+            cache_optimized_graph=_env_bool("ORT_CACHE_OPTIMIZED_GRAPH", True),
+            io_binding=_env_bool("ORT_IO_BINDING", True),
+            sessions_per_worker=sessions_per_worker,
+        )
+
+    def session_options(self, optimization_level: Optional[str] = None) -> ort.SessionOptions:
+        """Create SessionOptions for this profile."""
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = self.inter_op_threads
+        options.execution_mode = EXECUTION_MODES[self.execution_mode]
+        options.graph_optimization_level = OPTIMIZATION_LEVELS[optimization_level or self.optimization_level]
+        options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        options.add_session_config_entry("session.intra_op.allow_spinning", "1" if self.allow_spinning else "0")
+        return options
+
+    def optimized_graph_path(self, model_path: Path) -> Path:
+        """
+        Cache location of the optimized graph for ``model_path``, per model
+        signature (size and modification time), ORT version and level, so a
+        replaced model file never loads a stale graph.
+        """
+        stat = model_path.stat()
+        signature = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        return (model_path.parent / OPTIMIZED_CACHE_DIRNAME /
+                f"{model_path.stem}.{signature}.ort-{ort.__version__}.{self.optimization_level}.onnx")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "execution_mode": self.execution_mode,
+            "optimization_level": self.optimization_level,
+            "enable_cpu_mem_arena": self.enable_cpu_mem_arena,
+            "allow_spinning": self.allow_spinning,
+            "cache_optimized_graph": self.cache_optimized_graph,
+            "io_binding": self.io_binding
+        }
+
+
+def _remove_stale_graphs(model_path: Path, cached_path: Path):
+    """Delete optimized graphs cached for earlier versions of ``model_path`` at the same level."""
+    suffix = cached_path.name.split(".ort-", 1)[1]
+    for path in cached_path.parent.glob(f"{model_path.stem}.*.ort-{suffix}"):
+        if path != cached_path:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def create_session(model_path: Path, profile: SessionProfile,
+                   providers=("CPUExecutionProvider",)) -> Tuple[ort.InferenceSession, Dict[str, Any]]:
+    """
+    Create an InferenceSession, reusing a previously optimized graph when possible.
+
+    The first load optimizes ``model_path`` and writes the result next to it
+    (atomically, so concurrent workers never read a partial file). Later
+    loads of the same model file read the cached graph with optimizations
+    disabled.
+
+    Returns:
+        Tuple of (session, load info)
+    """
+    model_path = Path(model_path)
+    start = time.perf_counter()
+    info = {"model_path": str(model_path), "optimized_graph_cached": False}
+
+    if profile.cache_optimized_graph and profile.optimization_level != "disable":
+        cached_path = profile.optimized_graph_path(model_path)
+        if cached_path.exists():
+            try:
+                session = ort.InferenceSession(
+                    str(cached_path), sess_options=profile.session_options("disable"), providers=list(providers)
+                )
+                info.update({
+                    "optimized_graph_cached": True,
+                    "optimized_graph_path": str(cached_path),
+                    "load_ms": round((time.perf_counter() - start) * 1000, 1)
+                })
+                return session, info
+            except Exception as e:
+                logger.warning(f"Ignoring unusable optimized graph {cached_path}: {e}")
+
+        options = profile.session_options()
+        tmp_path = cached_path.with_name(f"{cached_path.name}.{os.getpid()}.tmp")
+        try:
+            cached_path.parent.mkdir(parents=True, exist_ok=True)
+            options.optimized_model_filepath = str(tmp_path)
+            session = ort.InferenceSession(str(model_path), sess_options=options, providers=list(providers))
+            os.replace(tmp_path, cached_path)
+            info["optimized_graph_path"] = str(cached_path)
+            logger.info(f"Saved optimized graph to {cached_path}")
+            _remove_stale_graphs(model_path, cached_path)
+        except OSError as e:
+            logger.warning(f"Could not cache optimized graph for {model_path}: {e}")
+            session = ort.InferenceSession(str(model_path), sess_options=profile.session_options(), providers=list(providers))
+    else:
+        session = ort.InferenceSession(str(model_path), sess_options=profile.session_options(), providers=list(providers))
+
+    info["load_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return session, info
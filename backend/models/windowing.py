@@ -0,0 +1,62 @@
+"""
+Sliding-window Scoring for Long Texts
+Splits token sequences longer than the model's maximum length into
+overlapping windows and aggregates the per-window sentiment into one score.
+"""
+
+from typing import List, Sequence, Tuple
+import numpy as np
+
+AGGREGATION_METHODS = ("mean", "min", "attention", "truncate")
+
+
+def split_windows(ids: Sequence[int], window_length: int, overlap: int) -> List[Sequence[int]]:
+    """
+    Split token ids into overlapping windows of at most ``window_length`` tokens.
+
+    The last window is aligned to the end of the sequence, so every token is
+    covered and the number of windows grows linearly with the text length.
+    """
+    if len(ids) <= window_length:
+        return [ids]
+
+    stride = max(1, window_length - max(0, overlap))
+    starts = list(range(0, len(ids) - window_length, stride))
+    starts.append(len(ids) - window_length)
+    return [ids[start:start + window_length] for start in starts]
+
+
+def aggregate_windows(probs: np.ndarray, token_counts: Sequence[int], method: str = "mean") -> Tuple[float, str]:
+    """
+    Combine per-window class probabilities into a single mood score.
+
+    Args:
+        probs: ``(num_windows, 2)`` softmax output, column 1 being POSITIVE
+        token_counts: Number of real tokens in each window
+        method: ``mean`` (token-weighted average), ``min`` (most negative
+            window), ``attention`` (windows weighted by how confident the
+            model is about them) or ``truncate`` (first window only)
+
+    Returns:
+        Tuple of (mood_score, label), mood_score in [-1, 1]
+    """
+    # Signed score per window: +p(positive) or -p(negative), whichever wins
+    label_ids = np.argmax(probs, axis=-1)
+    window_scores = np.where(label_ids == 1, probs[:, 1], -probs[:, 0])
+
+    if method == "truncate" or len(window_scores) == 1:
+        mood_score = float(window_scores[0])
+    elif method == "min":
+        mood_score = float(window_scores.min())
+    else:
+        weights = np.asarray(token_counts, dtype=np.float64)
+        if method == "attention":
+            # Softmax over each window's confidence margin, so strongly
+            # worded passages dominate a long, mostly neutral entry
+            margin = np.abs(probs[:, 1] - probs[:, 0]) * 10.0
+            attention = np.exp(margin - margin.max())
+            weights = weights * attention
+        mood_score = float(np.dot(window_scores, weights) / weights.sum())
+
+    label = "POSITIVE" if mood_score > 0 else "NEGATIVE"
+    return mood_score, label
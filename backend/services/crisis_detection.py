@@ -3,15 +3,111 @@ Crisis Detection System for Mental Health Assistant
 Detects crisis-level emotions and provides appropriate responses.
 """
 
+import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 import re
 
+import numpy as np
+
+from .keyword_matcher import SEVERITIES, SEVERITY_RANK, KeywordMatcher
+from .risk_state import RiskTracker
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Mood score below which the sentiment alone signals a crisis
+SENTIMENT_CRISIS_THRESHOLD = -0.8
+# Mood score below which a message without keywords is a moderate concern
+MODERATE_MOOD_THRESHOLD = -0.6
+
+CRISIS_LEVELS = ("none", "moderate", "high", "critical")
+
+# Interactions read per query when rebuilding the risk state
+RISK_REBUILD_CHUNK = 10000
+
+# Crisis response fields the API copies into its responses
+CRISIS_RESPONSE_FIELDS = ("status", "priority", "message", "helplines", "immediate_steps")
+
+
+class FrozenDict(dict):
+    """
+    A dict that cannot be modified. It is still a dict, so ``json.dumps``
+    and ``isinstance(..., dict)`` work on it; ``dict(...)`` or ``.copy()``
+    give a mutable (shallow) copy.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("crisis responses are shared and read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of a response: dicts become FrozenDicts, lists tuples."""
+    if isinstance(value, dict):
+        return FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class CrisisBatchResult:
+    """
+    Crisis screening results for a batch of texts, one array entry per text.
+    ``crisis_level`` and ``severity`` hold indices into CRISIS_LEVELS and
+    SEVERITIES.
+    """
+
+    def __init__(self,
+                 is_crisis: np.ndarray,
+                 crisis_level: np.ndarray,
+                 severity: np.ndarray,
+                 sentiment_crisis: np.ndarray,
+                 mood_scores: np.ndarray,
+                 found_keywords: List[List[str]]):
+        self.is_crisis = is_crisis
+        self.crisis_level = crisis_level
+        self.severity = severity
+        self.sentiment_crisis = sentiment_crisis
+        self.mood_scores = mood_scores
+        self.found_keywords = found_keywords
+        self.timestamp = datetime.now().isoformat()
+
+    def __len__(self) -> int:
+        return len(self.crisis_level)
+
+    def levels(self) -> List[str]:
+        """Crisis level names, in input order."""
+        return [CRISIS_LEVELS[level] for level in self.crisis_level.tolist()]
+
+    def level_counts(self) -> Dict[str, int]:
+        """Number of texts at each crisis level."""
+        counts = np.bincount(self.crisis_level, minlength=len(CRISIS_LEVELS))
+        return dict(zip(CRISIS_LEVELS, counts.tolist()))
+
+    def analysis(self, index: int) -> Dict:
+        """The ``analyze_crisis_level`` result for one text of the batch."""
+        mood_score = float(self.mood_scores[index])
+        return {
+            "is_crisis": bool(self.is_crisis[index]),
+            "crisis_level": CRISIS_LEVELS[self.crisis_level[index]],
+            "found_keywords": self.found_keywords[index],
+            "sentiment_crisis": bool(self.sentiment_crisis[index]),
+            "mood_score": None if np.isnan(mood_score) else mood_score,
+            "severity_assessment": SEVERITIES[self.severity[index]],
+            "timestamp": self.timestamp
+        }
+
+
 class CrisisDetector:
     def __init__(self):
         # Crisis keywords - comprehensive list
@@ -49,6 +145,7 @@ class CrisisDetector:
             "hurt myself", "cut myself", "self harm", "hopeless", "worthless",
             "can't go on", "give up", "no way out"
         ]
+        self.compile_keywords()
         
         # Helpline resources
         self.helplines = {
@@ -76,37 +173,41 @@ class CrisisDetector:
                 "description": "24/7 crisis support in India"
             }
         }
+        self.compile_responses()
+        
+        # Rolling per-user risk (None when RISK_STATE_ENABLED=false)
+        self.risk_tracker = RiskTracker.from_env()
 
-    def analyze_crisis_level(self, text: str, mood_score: float) -> Dict:
+    def compile_keywords(self):
+        """Build the keyword matcher; call again after changing the keyword lists."""
+        keyword_severities = {}
+        for keyword in self.crisis_keywords:
+            if keyword in self.high_severity_keywords:
+                keyword_severities[keyword] = "high"
+            elif keyword in self.medium_severity_keywords:
+                keyword_severities[keyword] = "medium"
+            else:
+                keyword_severities[keyword] = "low"
+        self.keyword_matcher = KeywordMatcher(keyword_severities)
+
+    def analyze_crisis_level(self, text: str, mood_score: float, user_id: Optional[str] = None) -> Dict:
         """
         Analyze text and mood score for crisis indicators.
         
         Args:
             text: User input text
             mood_score: Sentiment analysis score (-1 to 1)
+            user_id: If given, the message is added to the user's rolling risk
+                state and a run of concerning messages raises its level
             
         Returns:
             Dictionary with crisis analysis results
         """
-        text_lower = text.lower()
-        
         # Check for crisis keywords
-        found_keywords = []
-        severity_level = "none"
-        
-        for keyword in self.crisis_keywords:
-            if keyword in text_lower:
-                found_keywords.append(keyword)
-                
-                if keyword in self.high_severity_keywords:
-                    severity_level = "high"
-                elif keyword in self.medium_severity_keywords and severity_level != "high":
-                    severity_level = "medium"
-                elif severity_level == "none":
-                    severity_level = "low"
+        found_keywords, severity_level = self.keyword_matcher.match(text)
         
         # Sentiment-based crisis detection
-        sentiment_crisis = mood_score < -0.8
+        sentiment_crisis = mood_score < SENTIMENT_CRISIS_THRESHOLD
         
         # Combined crisis assessment
         is_crisis = (
@@ -120,12 +221,12 @@ class CrisisDetector:
             crisis_level = "critical"
         elif severity_level == "medium" or sentiment_crisis or len(found_keywords) >= 2:
             crisis_level = "high"
-        elif len(found_keywords) > 0 or mood_score < -0.6:
+        elif len(found_keywords) > 0 or mood_score < MODERATE_MOOD_THRESHOLD:
             crisis_level = "moderate"
         else:
             crisis_level = "none"
         
-        return {
+        analysis = {
             "is_crisis": is_crisis,
             "crisis_level": crisis_level,
             "found_keywords": found_keywords,
@@ -134,20 +235,155 @@ class CrisisDetector:
             "severity_assessment": severity_level,
             "timestamp": datetime.now().isoformat()
         }
+        
+        # Escalate based on the user's recent messages
+        if user_id is not None and self.risk_tracker is not None:
+            risk = self.risk_tracker.update(user_id, crisis_level, mood_score, len(found_keywords))
+            escalated_level = risk.pop("crisis_level")
+            analysis["escalated"] = escalated_level != crisis_level
+            analysis["risk"] = risk
+            if analysis["escalated"]:
+                analysis["base_crisis_level"] = crisis_level
+                analysis["crisis_level"] = escalated_level
+                analysis["is_crisis"] = True
+        
+        return analysis
+
+    def analyze_crisis_batch(self, texts: Sequence[str], mood_scores: Sequence[Optional[float]]) -> CrisisBatchResult:
+        """
+        Analyze many texts at once (e.g. re-screening stored interactions).
+        
+        Gives the same levels as ``analyze_crisis_level`` per text, but the
+        keywords are matched in one pass over the batch and the mood
+        thresholds are applied to whole arrays.
+        
+        Args:
+            texts: User input texts (None is treated as empty)
+            mood_scores: Sentiment analysis score per text; None (no score)
+                never meets a mood threshold
+            
+        Returns:
+            Columnar results for the batch
+        """
+        if len(texts) != len(mood_scores):
+            raise ValueError(f"Got {len(texts)} texts but {len(mood_scores)} mood scores")
+        
+        found_keywords, severity_ranks = self.keyword_matcher.match_batch(text or "" for text in texts)
+        severity = np.array(severity_ranks, dtype=np.int8)
+        keyword_counts = np.fromiter(map(len, found_keywords), dtype=np.int32, count=len(found_keywords))
+        scores = np.array(mood_scores, dtype=np.float64)
+        
+        has_keywords = keyword_counts > 0
+        with np.errstate(invalid="ignore"):
+            sentiment_crisis = scores < SENTIMENT_CRISIS_THRESHOLD
+            low_mood = scores < MODERATE_MOOD_THRESHOLD
+        is_crisis = sentiment_crisis | has_keywords | (severity >= SEVERITY_RANK["medium"])
+        
+        # Same precedence as analyze_crisis_level: the first true condition wins
+        crisis_level = np.select(
+            [
+                (severity == SEVERITY_RANK["high"]) | (sentiment_crisis & has_keywords),
+                (severity == SEVERITY_RANK["medium"]) | sentiment_crisis | (keyword_counts >= 2),
+                has_keywords | low_mood,
+            ],
+            [CRISIS_LEVELS.index("critical"), CRISIS_LEVELS.index("high"), CRISIS_LEVELS.index("moderate")],
+            default=CRISIS_LEVELS.index("none"),
+        ).astype(np.int8)
+        
+        return CrisisBatchResult(is_crisis, crisis_level, severity, sentiment_crisis, scores, found_keywords)
+
+    def rebuild_risk_state(self, db, window_seconds: float) -> int:
+        """
+        Replay the last ``window_seconds`` of stored interactions into the
+        risk tracker, e.g. at startup. Each interaction is re-screened so
+        that its own (not escalated) level is replayed.
+        
+        Args:
+            db: ConnectionManager of the analytics database
+            window_seconds: How far back to replay
+            
+        Returns:
+            Number of interactions replayed
+        """
+        if self.risk_tracker is None:
+            return 0
+        
+        replayed = 0
+        last_rowid = 0
+        while True:
+            with db.connection() as conn:
+                rows = conn.execute('''
+                    SELECT rowid, user_id, CAST(strftime('%s', timestamp) AS REAL), input_text, mood_score
+                    FROM interactions
+                    WHERE timestamp >= datetime('now', ?) AND rowid > ?
+                        AND user_id IS NOT NULL AND user_id NOT LIKE 'anonymous%'
+                    ORDER BY rowid
+                    LIMIT ?
+                ''', (f"-{int(window_seconds)} seconds", last_rowid, RISK_REBUILD_CHUNK)).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            
+            result = self.analyze_crisis_batch([row[3] for row in rows], [row[4] for row in rows])
+            levels = result.levels()
+            replayed += self.risk_tracker.rebuild(
+                (row[1], row[2], levels[i], row[4], len(result.found_keywords[i]))
+                for i, row in enumerate(rows)
+            )
+        
+        logger.info(f"Rebuilt risk state from {replayed} interactions")
+        return replayed
+
+    def compile_responses(self):
+        """
+        Build the response for every (crisis level, helpline location) once,
+        plus its API fields as JSON; call again after changing the helplines.
+        The responses are shared by all requests, so they are frozen.
+        """
+        responses = {}
+        responses_json = {}
+        for location in self.helplines:
+            for crisis_level in CRISIS_LEVELS:
+                response = self._build_crisis_response(crisis_level, location)
+                fields = {field: response[field] for field in CRISIS_RESPONSE_FIELDS}
+                responses[crisis_level, location] = _freeze(response)
+                # Same encoding as FastAPI's JSONResponse
+                responses_json[crisis_level, location] = json.dumps(
+                    fields, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+                ).encode("utf-8")
+        self._responses = responses
+        self._responses_json = responses_json
+
+    def _response_key(self, crisis_level: str, user_location: Optional[str]) -> Tuple[str, str]:
+        location = (user_location or "international").lower()
+        if location not in self.helplines:
+            location = "international"
+        return (crisis_level if crisis_level in CRISIS_LEVELS else "none"), location
 
     def get_crisis_response(self, crisis_analysis: Dict, user_location: str = "international") -> Dict:
         """
-        Generate appropriate crisis response based on analysis.
+        Get the crisis response for an analysis.
         
         Args:
             crisis_analysis: Result from analyze_crisis_level
             user_location: User's location for localized helplines
             
         Returns:
-            Crisis response with messages and resources
+            Crisis response with messages and resources. It is shared by
+            all callers, so it is a read-only FrozenDict with tuples for
+            lists; it serializes like a plain dict
         """
-        crisis_level = crisis_analysis["crisis_level"]
-        
+        return self._responses[self._response_key(crisis_analysis["crisis_level"], user_location)]
+
+    def get_crisis_response_json(self, crisis_level: str, user_location: str = "international") -> bytes:
+        """
+        Get the CRISIS_RESPONSE_FIELDS of a crisis response as a JSON object,
+        encoded once at startup.
+        """
+        return self._responses_json[self._response_key(crisis_level, user_location)]
+
+    def _build_crisis_response(self, crisis_level: str, user_location: str) -> Dict:
+        """Build the crisis response for a crisis level and helpline location."""
         if crisis_level == "critical":
             return {
                 "status": "CRITICAL_CRISIS",
@@ -237,6 +473,9 @@ class CrisisDetector:
             "found_keywords": crisis_analysis["found_keywords"],
             "mood_score": crisis_analysis["mood_score"]
         }
+        if crisis_analysis.get("escalated"):
+            log_data["escalated_from"] = crisis_analysis["base_crisis_level"]
+            log_data["risk_score"] = crisis_analysis["risk"]["risk_score"]
         
         if crisis_analysis["is_crisis"]:
             logger.warning(f"CRISIS DETECTED: {log_data}")
@@ -248,7 +487,8 @@ class CrisisDetector:
 # Global crisis detector instance
 crisis_detector = CrisisDetector()
 
-def check_crisis(text: str, mood_score: float, user_location: str = "international", user_id: Optional[str] = None) -> Dict:
+def check_crisis(text: str, mood_score: float, user_location: str = "international", user_id: Optional[str] = None,
+                 track_risk: bool = True) -> Dict:
     """
     Convenience function to perform complete crisis check.
     
@@ -256,13 +496,19 @@ def check_crisis(text: str, mood_score: float, user_location: str = "internation
         text: User input text
         mood_score: Sentiment analysis score
         user_location: User's location for localized resources
-        user_id: Optional user identifier for logging
+        user_id: Optional user identifier for logging and rolling risk state
+        track_risk: Add the message to the user's rolling risk state; pass
+            False for imported or re-processed messages, which were not
+            sent now
         
     Returns:
-        Complete crisis analysis and response
+        Complete crisis analysis, the shared read-only response and the
+        response's API fields as precomputed JSON bytes
     """
-    # Analyze crisis level
-    crisis_analysis = crisis_detector.analyze_crisis_level(text, mood_score)
+    # Analyze crisis level; generated anonymous ids are not one person, so
+    # they get no rolling risk state
+    tracked_user = user_id if track_risk and user_id and not user_id.startswith("anonymous") else None
+    crisis_analysis = crisis_detector.analyze_crisis_level(text, mood_score, tracked_user)
     
     # Get appropriate response
     crisis_response = crisis_detector.get_crisis_response(crisis_analysis, user_location)
@@ -273,9 +519,32 @@ def check_crisis(text: str, mood_score: float, user_location: str = "internation
     # Combine analysis and response
     return {
         "analysis": crisis_analysis,
-        "response": crisis_response
+        "response": crisis_response,
+        "response_json": crisis_detector.get_crisis_response_json(crisis_analysis["crisis_level"], user_location)
     }
 
+def check_crisis_batch(texts: Sequence[str], mood_scores: Sequence[Optional[float]]) -> CrisisBatchResult:
+    """
+    Convenience function to screen many texts at once.
+    
+    Logs one summary line for the batch instead of one line per text; no
+    responses are generated and nothing is recorded as a crisis event.
+    
+    Args:
+        texts: User input texts
+        mood_scores: Sentiment analysis score per text
+        
+    Returns:
+        Columnar crisis analysis for the batch
+    """
+    result = crisis_detector.analyze_crisis_batch(texts, mood_scores)
+    crises = int(result.is_crisis.sum())
+    if crises:
+        logger.warning(f"Batch crisis screening: {crises} of {len(result)} texts flagged, levels {result.level_counts()}")
+    else:
+        logger.info(f"Batch crisis screening: none of {len(result)} texts flagged")
+    return result
+
 if __name__ == "__main__":
     # Test the crisis detection system
     test_cases = [
@@ -0,0 +1,140 @@
+"""
+SQLite Connection Management
+Long-lived per-thread connections for the analytics database with WAL
+journaling and tuned pragmas. Connections are reused across calls, so the
+schema is parsed once per thread and prepared statements stay in each
+connection's statement cache.
+"""
+
+import os
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    # Readers no longer block on the writer and commits append to the WAL
+    "journal_mode": "WAL",
+    # With WAL, NORMAL only syncs at checkpoints; a power loss can drop the
+    # last commits but never corrupts the database
+    "synchronous": "NORMAL",
+    # Negative values are KiB
+    "cache_size": -16384,
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+class ConnectionManager:
+    def __init__(self,
+                 db_path: str,
+                 pooled: bool = True,
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: int = 256):
+        """
+        Args:
+            db_path: SQLite database file
+            pooled: Keep one connection per thread open across calls; when
+                False every call opens and closes its own connection
+            pragmas: PRAGMA settings applied to each new connection
+                (defaults to DEFAULT_PRAGMAS; ``{}`` applies none)
+            cached_statements: Size of each connection's prepared statement cache
+        """
+        self.db_path = db_path
+        self.pooled = pooled
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.cached_statements = cached_statements
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self.connections_opened = 0
+
+    @classmethod
+    def from_env(cls, db_path: str) -> "ConnectionManager":
+        """Build a manager from MONITOR_DB_* environment variables."""
+        pragmas = dict(DEFAULT_PRAGMAS)
+        pragmas["journal_mode"] = os.getenv("MONITOR_DB_JOURNAL_MODE", pragmas["journal_mode"])
+        pragmas["synchronous"] = os.getenv("MONITOR_DB_SYNCHRONOUS", pragmas["synchronous"])
+        pragmas["cache_size"] = -int(os.getenv("MONITOR_DB_CACHE_KB", str(-pragmas["cache_size"])))
+        pragmas["mmap_size"] = int(os.getenv("MONITOR_DB_MMAP_MB", "128")) * 1024 * 1024
+        return cls(
+            db_path,
+            pooled=os.getenv("MONITOR_DB_POOLED", "true").lower() == "true",
+            pragmas=pragmas,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.pragmas.get("busy_timeout", 5000) / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                # Close connections left behind by threads that have exited
+                alive = []
+                for thread, other in self._connections:
+                    if thread.is_alive():
+                        alive.append((thread, other))
+                    else:
+                        other.close()
+                alive.append((threading.current_thread(), conn))
+                self._connections = alive
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Use a connection for one unit of work.
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        conn = self._thread_connection() if self.pooled else self._connect()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if not self.pooled:
+                conn.close()
+
+    def close_all(self):
+        """Close every pooled connection (e.g. on shutdown)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close database connection: {e}")
+        self._local = threading.local()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "db_path": self.db_path,
+                "pooled": self.pooled,
+                "open_connections": len(self._connections),
+                "connections_opened": self.connections_opened,
+                "pragmas": dict(self.pragmas)
+            }
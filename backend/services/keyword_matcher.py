@@ -0,0 +1,170 @@
+"""
+Crisis Keyword Matcher
+Compiles the crisis keyword lists once into a word-boundary-aware phrase
+matcher. The text is normalized and tokenized once; single-word keywords
+(and their inflections, e.g. "numbness") are looked up in the token set and
+multi-word phrases are only checked, as whole words, when all of their
+tokens occur. "end it" no longer fires inside "attend it", nor "numb"
+inside "number". A phrase's last word is only inflected where
+PHRASE_INFLECTIONS allows it ("self harming"), so "end its" stays clear.
+"""
+
+import re
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEVERITY_RANK = {"none": 0, "low": 1, "medium": 2, "high": 3}
+SEVERITIES = tuple(SEVERITY_RANK)
+
+# Endings accepted after a single-word keyword ("hopelessness", "numbed")
+INFLECTION_SUFFIXES = ("s", "es", "ness", "ed", "ing", "ly")
+
+# Inflected forms accepted for the last word of a multi-word keyword. Only
+# content words are listed: suffixing function words turns "end it" and
+# "over it" into "end its" and "over its"
+PHRASE_INFLECTIONS: Dict[str, Tuple[str, ...]] = {
+    "self harm": ("harms", "harmed", "harming"),
+    "suicide plan": ("plans", "planned", "planning"),
+}
+
+APOSTROPHES = "'‘’`"
+# ASCII fast path (bytes.translate): apostrophes are dropped ("can't" ->
+# "cant") and any other non-alphanumeric byte separates tokens
+ASCII_TOKEN_TABLE = bytes(code if chr(code).isalnum() and code < 128 else ord(" ") for code in range(256))
+ASCII_APOSTROPHES = b"'`"
+APOSTROPHE_RE = re.compile(f"[{APOSTROPHES}]")
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase ``text``, drop apostrophes and split it into alphanumeric tokens."""
+    text = text.lower()
+    if text.isascii():
+        return text.encode("ascii").translate(ASCII_TOKEN_TABLE, ASCII_APOSTROPHES).decode("ascii").split()
+    return TOKEN_RE.findall(APOSTROPHE_RE.sub("", text))
+
+
+class KeywordMatcher:
+    def __init__(self,
+                 keyword_severities: Dict[str, str],
+                 suffixes: Tuple[str, ...] = INFLECTION_SUFFIXES,
+                 phrase_inflections: Dict[str, Tuple[str, ...]] = PHRASE_INFLECTIONS):
+        """
+        Args:
+            keyword_severities: Keyword -> severity ("low", "medium" or
+                "high"), in the order matches should be reported. Keywords
+                that normalize to the same words ("self harm", "self-harm")
+                are reported once, under the first spelling, with the
+                highest of their severities.
+            suffixes: Endings accepted after single-word keywords
+            phrase_inflections: Multi-word keyword -> other forms accepted
+                for its last word
+        """
+        inflections = {tuple(normalize_tokens(keyword)): tuple(forms) for keyword, forms in phrase_inflections.items()}
+        entries: List[Tuple[str, str]] = []
+        phrase_index: Dict[Tuple[str, ...], int] = {}
+        # Token (or inflected token) -> entries of single-word keywords
+        self._words: Dict[str, List[int]] = {}
+        # Key token -> (entry, leading tokens, forms of the last token,
+        # space-padded phrase per form) of multi-word keywords. A phrase is
+        # keyed by its longest word, the one least likely to occur in
+        # unrelated text
+        self._phrases: Dict[str, List[Tuple[int, Tuple[str, ...], FrozenSet[str], Tuple[str, ...]]]] = {}
+
+        for keyword, severity in keyword_severities.items():
+            tokens = tuple(normalize_tokens(keyword))
+            if not tokens:
+                logger.warning(f"Ignoring crisis keyword without words: {keyword!r}")
+                continue
+            if tokens in phrase_index:
+                index = phrase_index[tokens]
+                if SEVERITY_RANK[severity] > SEVERITY_RANK[entries[index][1]]:
+                    entries[index] = (entries[index][0], severity)
+                continue
+
+            index = phrase_index[tokens] = len(entries)
+            entries.append((keyword.lower(), severity))
+            if len(tokens) == 1:
+                for form in (tokens[0],) + tuple(tokens[0] + suffix for suffix in suffixes):
+                    self._words.setdefault(form, []).append(index)
+                continue
+
+            forms = (tokens[-1],) + inflections.get(tokens, ())
+            leading = " ".join(tokens[:-1])
+            phrase = (index, tokens[:-1], frozenset(forms), tuple(f" {leading} {form} " for form in forms))
+            key = max(tokens[:-1], key=len)
+            for key_token in (forms if len(tokens[-1]) > len(key) else (key,)):
+                self._phrases.setdefault(key_token, []).append(phrase)
+
+        self.entries: Tuple[Tuple[str, str], ...] = tuple(entries)
+        self._ranks = tuple(SEVERITY_RANK[severity] for _, severity in self.entries)
+        self._index_keys = frozenset(self._words) | frozenset(self._phrases)
+
+    def _match_indices(self, text: str) -> List[int]:
+        tokens = normalize_tokens(text)
+        candidates = self._index_keys.intersection(tokens)
+        if not candidates:
+            return []
+
+        found: Set[int] = set()
+        token_set: Optional[Set[str]] = None
+        padded_text: Optional[str] = None
+        for token in candidates:
+            words = self._words.get(token)
+            if words is not None:
+                found.update(words)
+            phrases = self._phrases.get(token)
+            if phrases is None:
+                continue
+            if token_set is None:
+                token_set = set(tokens)
+            for index, leading_tokens, last_forms, padded_phrases in phrases:
+                if index in found or not token_set.issuperset(leading_tokens) or token_set.isdisjoint(last_forms):
+                    continue
+                # All words occur; check they occur together, in order
+                if padded_text is None:
+                    padded_text = f" {' '.join(tokens)} "
+                if any(padded_phrase in padded_text for padded_phrase in padded_phrases):
+                    found.add(index)
+        return sorted(found)
+
+    def find(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Find the keywords occurring in ``text`` as whole words (case-insensitive).
+
+        Returns:
+            ``(keyword, severity)`` for each keyword found, once each, in
+            keyword order
+        """
+        return [self.entries[index] for index in self._match_indices(text)]
+
+    def match(self, text: str) -> Tuple[List[str], str]:
+        """
+        Like ``find``, but return the keywords and their highest severity
+        ("none" if nothing matched).
+        """
+        indices = self._match_indices(text)
+        if not indices:
+            return [], "none"
+        entries = self.entries
+        return [entries[index][0] for index in indices], SEVERITIES[max(map(self._ranks.__getitem__, indices))]
+
+    def match_batch(self, texts: Iterable[str]) -> Tuple[List[List[str]], List[int]]:
+        """
+        Like ``match`` for many texts, with severities as ``SEVERITY_RANK``
+        values (0 for no match) so callers can vectorize over them.
+        """
+        entries = self.entries
+        ranks = self._ranks
+        match_indices = self._match_indices
+        keywords: List[List[str]] = []
+        severity_ranks: List[int] = []
+        for text in texts:
+            indices = match_indices(text)
+            keywords.append([entries[index][0] for index in indices])
+            severity_ranks.append(max((ranks[index] for index in indices), default=0))
+        return keywords, severity_ranks
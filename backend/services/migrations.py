@@ -0,0 +1,267 @@
+"""
+Schema Migrations
+Versioned, forward-only changes to the analytics database. Each migration
+runs once, in order, inside a write transaction, and is recorded in the
+schema_version table so every worker and restart agrees on the schema.
+"""
+
+import sqlite3
+import logging
+from typing import Callable, List, Tuple, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A step is either one SQL statement or a callable taking the cursor
+MigrationStep = Union[str, Callable[[sqlite3.Cursor], None]]
+
+
+def backfill_session_aggregates(cursor: sqlite3.Cursor):
+    """Recompute each session's running mood score sum, count and average from its interactions."""
+    cursor.execute('''
+        UPDATE user_sessions
+        SET mood_score_sum = COALESCE((
+                SELECT SUM(mood_score) FROM interactions WHERE session_id = user_sessions.id
+            ), 0),
+            mood_score_count = (
+                SELECT COUNT(mood_score) FROM interactions WHERE session_id = user_sessions.id
+            ),
+            average_mood_score = (
+                SELECT AVG(mood_score) FROM interactions WHERE session_id = user_sessions.id
+            )
+    ''')
+    logger.info(f"Backfilled mood score aggregates for {cursor.rowcount} session(s)")
+
+
+# Rollup periods and the SQL expression mapping a timestamp to its bucket
+ROLLUP_BUCKETS = {
+    "hourly": "strftime('%Y-%m-%d %H:00:00', {column})",
+    "daily": "date({column})",
+}
+
+
+def backfill_rollups(cursor: sqlite3.Cursor):
+    """
+    Rebuild the interaction and crisis event rollups from existing rows.
+
+    Missing key values are stored as '' like the triggers do, so NULLs from
+    anonymous or unlabelled rows group into one row per bucket.
+    """
+    for period, bucket in ROLLUP_BUCKETS.items():
+        bucket = bucket.format(column="timestamp")
+        cursor.execute(f"DELETE FROM interaction_rollup_{period}")
+        cursor.execute(f"DELETE FROM crisis_rollup_{period}")
+        cursor.execute(f'''
+            INSERT INTO interaction_rollup_{period}
+                (bucket, user_id, session_id, interactions, mood_score_sum, mood_score_count)
+            SELECT {bucket}, COALESCE(user_id, ''), COALESCE(session_id, ''),
+                   COUNT(*), COALESCE(SUM(mood_score), 0), COUNT(mood_score)
+            FROM interactions
+            WHERE {bucket} IS NOT NULL
+            GROUP BY 1, 2, 3
+        ''')
+        cursor.execute(f'''
+            INSERT INTO crisis_rollup_{period} (bucket, user_id, crisis_level, events)
+            SELECT {bucket}, COALESCE(user_id, ''), COALESCE(crisis_level, ''), COUNT(*)
+            FROM crisis_events
+            WHERE {bucket} IS NOT NULL
+            GROUP BY 1, 2, 3
+        ''')
+    logger.info("Backfilled analytics rollups")
+
+
+MIGRATIONS: List[Tuple[int, str, List[MigrationStep]]] = [
+    (1, "Covering indexes for analytics, session statistics and crisis alerts", [
+        # get_analytics_summary: time-range counts, mood averages and distinct users
+        "CREATE INDEX IF NOT EXISTS idx_interactions_timestamp "
+        "ON interactions (timestamp, user_id, mood_score)",
+        # get_user_analytics: per-user time range, mood trend and session count
+        "CREATE INDEX IF NOT EXISTS idx_interactions_user_timestamp "
+        "ON interactions (user_id, timestamp, mood_score, session_id)",
+        # Session aggregate backfill and consistency checks
+        "CREATE INDEX IF NOT EXISTS idx_interactions_session "
+        "ON interactions (session_id, mood_score)",
+        "CREATE INDEX IF NOT EXISTS idx_crisis_events_timestamp "
+        "ON crisis_events (timestamp, crisis_level)",
+        "CREATE INDEX IF NOT EXISTS idx_crisis_events_user_timestamp "
+        "ON crisis_events (user_id, timestamp, crisis_level)",
+        # get_crisis_alerts: open follow-ups, newest first
+        "CREATE INDEX IF NOT EXISTS idx_crisis_events_follow_up "
+        "ON crisis_events (follow_up_required, follow_up_completed, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_user_sessions_user "
+        "ON user_sessions (user_id, session_start)",
+    ]),
+    (2, "Running mood score sum and count on user_sessions", [
+        "ALTER TABLE user_sessions ADD COLUMN mood_score_sum REAL NOT NULL DEFAULT 0",
+        "ALTER TABLE user_sessions ADD COLUMN mood_score_count INTEGER NOT NULL DEFAULT 0",
+        backfill_session_aggregates,
+    ]),
+    (3, "Hourly and daily rollups of interactions and crisis events", [
+        *[f'''
+            CREATE TABLE IF NOT EXISTS interaction_rollup_{period} (
+                bucket TEXT,
+                user_id TEXT,
+                session_id TEXT,
+                interactions INTEGER NOT NULL DEFAULT 0,
+                mood_score_sum REAL NOT NULL DEFAULT 0,
+                mood_score_count INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (bucket, user_id, session_id)
+            )
+        ''' for period in ROLLUP_BUCKETS],
+        *[f'''
+            CREATE TABLE IF NOT EXISTS crisis_rollup_{period} (
+                bucket TEXT,
+                user_id TEXT,
+                crisis_level TEXT,
+                events INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (bucket, user_id, crisis_level)
+            )
+        ''' for period in ROLLUP_BUCKETS],
+        # get_user_analytics reads a single user's hourly buckets
+        "CREATE INDEX IF NOT EXISTS idx_interaction_rollup_hourly_user "
+        "ON interaction_rollup_hourly (user_id, bucket)",
+        "CREATE INDEX IF NOT EXISTS idx_crisis_rollup_hourly_user "
+        "ON crisis_rollup_hourly (user_id, bucket)",
+        backfill_rollups,
+        # Rollups are updated in the same transaction as the insert
+        '''
+            CREATE TRIGGER IF NOT EXISTS interactions_rollup
+            AFTER INSERT ON interactions
+            WHEN NEW.timestamp IS NOT NULL
+            BEGIN
+        ''' + "".join(f'''
+                INSERT INTO interaction_rollup_{period}
+                    (bucket, user_id, session_id, interactions, mood_score_sum, mood_score_count)
+                VALUES ({bucket.format(column="NEW.timestamp")}, NEW.user_id, NEW.session_id, 1,
+                        COALESCE(NEW.mood_score, 0), NEW.mood_score IS NOT NULL)
+                ON CONFLICT (bucket, user_id, session_id) DO UPDATE SET
+                    interactions = interactions + 1,
+                    mood_score_sum = mood_score_sum + excluded.mood_score_sum,
+                    mood_score_count = mood_score_count + excluded.mood_score_count;
+        ''' for period, bucket in ROLLUP_BUCKETS.items()) + "END",
+        '''
+            CREATE TRIGGER IF NOT EXISTS crisis_events_rollup
+            AFTER INSERT ON crisis_events
+            WHEN NEW.timestamp IS NOT NULL
+            BEGIN
+        ''' + "".join(f'''
+                INSERT INTO crisis_rollup_{period} (bucket, user_id, crisis_level, events)
+                VALUES ({bucket.format(column="NEW.timestamp")}, NEW.user_id, NEW.crisis_level, 1)
+                ON CONFLICT (bucket, user_id, crisis_level) DO UPDATE SET events = events + 1;
+        ''' for period, bucket in ROLLUP_BUCKETS.items()) + "END",
+    ]),
+    # SQLite treats NULLs as distinct in UNIQUE constraints, so rows with a
+    # NULL key never hit ON CONFLICT and each inserted a new rollup row.
+    # Keys are now NOT NULL with '' for missing values; readers map '' back
+    # to NULL. The rollups are derived data and are rebuilt from the raw rows.
+    (4, "NOT NULL rollup keys so rows without a user, session or crisis level aggregate", [
+        "DROP TRIGGER IF EXISTS interactions_rollup",
+        "DROP TRIGGER IF EXISTS crisis_events_rollup",
+        *[f"DROP TABLE IF EXISTS {table}_{period}"
+          for table in ("interaction_rollup", "crisis_rollup") for period in ROLLUP_BUCKETS],
+        *[f'''
+            CREATE TABLE interaction_rollup_{period} (
+                bucket TEXT NOT NULL,
+                user_id TEXT NOT NULL DEFAULT '',
+                session_id TEXT NOT NULL DEFAULT '',
+                interactions INTEGER NOT NULL DEFAULT 0,
+                mood_score_sum REAL NOT NULL DEFAULT 0,
+                mood_score_count INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (bucket, user_id, session_id)
+            )
+        ''' for period in ROLLUP_BUCKETS],
+        *[f'''
+            CREATE TABLE crisis_rollup_{period} (
+                bucket TEXT NOT NULL,
+                user_id TEXT NOT NULL DEFAULT '',
+                crisis_level TEXT NOT NULL DEFAULT '',
+                events INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (bucket, user_id, crisis_level)
+            )
+        ''' for period in ROLLUP_BUCKETS],
+        "CREATE INDEX idx_interaction_rollup_hourly_user ON interaction_rollup_hourly (user_id, bucket)",
+        "CREATE INDEX idx_crisis_rollup_hourly_user ON crisis_rollup_hourly (user_id, bucket)",
+        backfill_rollups,
+        # Rows whose timestamp does not parse have no bucket and are skipped
+        '''
+            CREATE TRIGGER interactions_rollup
+            AFTER INSERT ON interactions
+            WHEN date(NEW.timestamp) IS NOT NULL
+            BEGIN
+        ''' + "".join(f'''
+                INSERT INTO interaction_rollup_{period}
+                    (bucket, user_id, session_id, interactions, mood_score_sum, mood_score_count)
+                VALUES ({bucket.format(column="NEW.timestamp")}, COALESCE(NEW.user_id, ''),
+                        COALESCE(NEW.session_id, ''), 1,
+                        COALESCE(NEW.mood_score, 0), NEW.mood_score IS NOT NULL)
+                ON CONFLICT (bucket, user_id, session_id) DO UPDATE SET
+                    interactions = interactions + 1,
+                    mood_score_sum = mood_score_sum + excluded.mood_score_sum,
+                    mood_score_count = mood_score_count + excluded.mood_score_count;
+        ''' for period, bucket in ROLLUP_BUCKETS.items()) + "END",
+        '''
+            CREATE TRIGGER crisis_events_rollup
+            AFTER INSERT ON crisis_events
+            WHEN date(NEW.timestamp) IS NOT NULL
+            BEGIN
+        ''' + "".join(f'''
+                INSERT INTO crisis_rollup_{period} (bucket, user_id, crisis_level, events)
+                VALUES ({bucket.format(column="NEW.timestamp")}, COALESCE(NEW.user_id, ''),
+                        COALESCE(NEW.crisis_level, ''), 1)
+                ON CONFLICT (bucket, user_id, crisis_level) DO UPDATE SET events = events + 1;
+        ''' for period, bucket in ROLLUP_BUCKETS.items()) + "END",
+    ]),
+]
+
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    """Highest applied migration version (0 for a fresh database)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    return cursor.fetchone()[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply pending migrations in version order.
+
+    Takes the database write lock first, so when several workers start at
+    once only one of them migrates and the others see the new version.
+
+    Returns:
+        Versions applied by this call
+    """
+    if conn.in_transaction:
+        conn.commit()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    applied = []
+    try:
+        current = get_schema_version(cursor)
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            applied.append(version)
+            logger.info(f"Applied schema migration {version}: {description}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
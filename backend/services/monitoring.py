@@ -5,13 +5,16 @@ Provides comprehensive logging, analytics, and monitoring capabilities.
 
 import os
 import json
-import sqlite3
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, List, Optional, Any
 from pathlib import Path
 import uuid
 
+from .db import ConnectionManager
+from .migrations import apply_migrations
+from .write_behind import WriteBehindQueue
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,115 +26,212 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Session statistics are kept as a running sum and count, so each update is
+# O(1) instead of re-averaging every interaction in the session. The SET
+# expressions all see the old row values.
+SESSION_STATS_UPDATE = '''
+    UPDATE user_sessions
+    SET total_interactions = total_interactions + :total,
+        crisis_events = crisis_events + :crises,
+        mood_score_sum = mood_score_sum + :score_sum,
+        mood_score_count = mood_score_count + :scored,
+        average_mood_score = CASE
+            WHEN mood_score_count + :scored > 0
+            THEN (mood_score_sum + :score_sum) / (mood_score_count + :scored)
+            ELSE average_mood_score
+        END
+    WHERE id = :session_id
+'''
+
+def _rollup_window(start: datetime) -> Dict[str, str]:
+    """
+    Split a rolling window starting at ``start`` into rollup-aligned ranges.
+
+    Rows from ``start`` up to the first full hour are read raw; whole hours
+    up to the first full day come from the hourly rollups and the rest from
+    the daily rollups. Rollups are written by triggers in the same
+    transaction as the rows, so the current bucket is never stale.
+    """
+    hour_start = start.replace(minute=0, second=0, microsecond=0)
+    if hour_start < start:
+        hour_start += timedelta(hours=1)
+    day_start = hour_start.replace(hour=0)
+    if day_start < hour_start:
+        day_start += timedelta(days=1)
+    return {
+        "start": start.isoformat(" "),
+        "hour_start": hour_start.strftime("%Y-%m-%d %H:00:00"),
+        "day_start": day_start.strftime("%Y-%m-%d"),
+    }
+
+
+def _rollup_source(raw_table: str, raw_columns: str, rollup_table: str, columns: str,
+                   per_user: bool = False, use_daily: bool = True) -> str:
+    """
+    UNION ALL of raw rows for the leading partial hour and the hourly (and
+    daily) rollup rows covering the rest of a ``_rollup_window``.
+
+    ``raw_columns`` selects raw rows in the rollup column layout ``columns``;
+    rollup keys store missing values as '', which ``columns`` maps back to NULL.
+    Daily buckets carry no hour, so callers that group by hour of day pass
+    ``use_daily=False`` to read hourly buckets for the whole window.
+    """
+    user_filter = " AND user_id = :user_id" if per_user else ""
+    # The first SELECT names the result columns
+    parts = [
+        f"SELECT bucket, {columns} FROM {rollup_table}_hourly "
+        f"WHERE bucket >= :hour_start{' AND bucket < :day_start' if use_daily else ''}{user_filter}",
+        f"SELECT timestamp, {raw_columns} FROM {raw_table} "
+        f"WHERE timestamp >= :start AND timestamp < :hour_start{user_filter}",
+    ]
+    if use_daily:
+        parts.append(f"SELECT bucket, {columns} FROM {rollup_table}_daily WHERE bucket >= :day_start{user_filter}")
+    return " UNION ALL ".join(parts)
+
+
+def _interaction_source(per_user: bool = False, use_daily: bool = True) -> str:
+    return _rollup_source(
+        "interactions",
+        "user_id, session_id, 1, COALESCE(mood_score, 0), mood_score IS NOT NULL",
+        "interaction_rollup",
+        "NULLIF(user_id, '') AS user_id, NULLIF(session_id, '') AS session_id, "
+        "interactions, mood_score_sum, mood_score_count",
+        per_user, use_daily
+    )
+
+
+def _crisis_source(per_user: bool = False) -> str:
+    return _rollup_source(
+        "crisis_events", "user_id, crisis_level, 1",
+        "crisis_rollup", "NULLIF(user_id, '') AS user_id, NULLIF(crisis_level, '') AS crisis_level, events",
+        per_user
+    )
+
 class MentalHealthMonitor:
-    def __init__(self, db_path: str = "mental_health_analytics.db"):
+    def __init__(self, db_path: str = "mental_health_analytics.db", db: Optional[ConnectionManager] = None):
         self.db_path = db_path
+        self.db = db or ConnectionManager.from_env(db_path)
+        # Called with the user_id after crisis events are written
+        self.crisis_listeners: List[Callable[[str], None]] = []
         self.init_database()
+
+    def add_crisis_listener(self, listener: Callable[[str], None]):
+        """Register a callback run with the user_id after each crisis event is logged (e.g. cache invalidation)."""
+        self.crisis_listeners.append(listener)
+
+    def _notify_crisis_listeners(self, user_ids: Iterable[str]):
+        for user_id in user_ids:
+            for listener in self.crisis_listeners:
+                try:
+                    listener(user_id)
+                except Exception as e:
+                    logger.error(f"Crisis listener failed: {e}")
         
     def init_database(self):
         """Initialize SQLite database for analytics and monitoring."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # User sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_sessions (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT,
-                    session_start TIMESTAMP,
-                    session_end TIMESTAMP,
-                    total_interactions INTEGER DEFAULT 0,
-                    crisis_events INTEGER DEFAULT 0,
-                    average_mood_score REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Individual interactions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS interactions (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT,
-                    user_id TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    input_text TEXT,
-                    input_type TEXT,  -- 'text', 'voice', 'multimodal'
-                    mood_score REAL,
-                    mood_label TEXT,
-                    is_crisis BOOLEAN,
-                    crisis_level TEXT,
-                    crisis_keywords TEXT,  -- JSON array
-                    response_type TEXT,
-                    processing_time_ms INTEGER,
-                    user_location TEXT,
-                    FOREIGN KEY (session_id) REFERENCES user_sessions (id)
-                )
-            ''')
-            
-            # Crisis events table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS crisis_events (
-                    id TEXT PRIMARY KEY,
-                    interaction_id TEXT,
-                    user_id TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    crisis_level TEXT,
-                    crisis_keywords TEXT,  -- JSON array
-                    mood_score REAL,
-                    emergency_contacts_notified BOOLEAN DEFAULT FALSE,
-                    notification_results TEXT,  -- JSON
-                    follow_up_required BOOLEAN DEFAULT FALSE,
-                    follow_up_completed BOOLEAN DEFAULT FALSE,
-                    resolution_status TEXT,
-                    FOREIGN KEY (interaction_id) REFERENCES interactions (id)
-                )
-            ''')
-            
-            # System metrics table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS system_metrics (
-                    id TEXT PRIMARY KEY,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    metric_name TEXT,
-                    metric_value REAL,
-                    metric_unit TEXT,
-                    additional_data TEXT  -- JSON
-                )
-            ''')
-            
-            # Daily check-ins table for streak system
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_checkins (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT,
-                    date DATE,
-                    questions_data TEXT,  -- JSON of questions asked
-                    answers_data TEXT,    -- JSON of user answers
-                    wellness_score REAL,
-                    wellness_category TEXT,
-                    category_scores TEXT, -- JSON of category breakdowns
-                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, date)
-                )
-            ''')
-            
-            # User streaks table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_streaks (
-                    user_id TEXT PRIMARY KEY,
-                    current_streak INTEGER DEFAULT 0,
-                    longest_streak INTEGER DEFAULT 0,
-                    last_checkin_date DATE,
-                    total_checkins INTEGER DEFAULT 0,
-                    streak_milestones TEXT,  -- JSON array of achieved milestones
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+            
+                # User sessions table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS user_sessions (
+                        id TEXT PRIMARY KEY,
+                        user_id TEXT,
+                        session_start TIMESTAMP,
+                        session_end TIMESTAMP,
+                        total_interactions INTEGER DEFAULT 0,
+                        crisis_events INTEGER DEFAULT 0,
+                        average_mood_score REAL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # Individual interactions table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS interactions (
+                        id TEXT PRIMARY KEY,
+                        session_id TEXT,
+                        user_id TEXT,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        input_text TEXT,
+                        input_type TEXT,  -- 'text', 'voice', 'multimodal'
+                        mood_score REAL,
+                        mood_label TEXT,
+                        is_crisis BOOLEAN,
+                        crisis_level TEXT,
+                        crisis_keywords TEXT,  -- JSON array
+                        response_type TEXT,
+                        processing_time_ms INTEGER,
+                        user_location TEXT,
+                        FOREIGN KEY (session_id) REFERENCES user_sessions (id)
+                    )
+                ''')
+            
+                # Crisis events table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS crisis_events (
+                        id TEXT PRIMARY KEY,
+                        interaction_id TEXT,
+                        user_id TEXT,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        crisis_level TEXT,
+                        crisis_keywords TEXT,  -- JSON array
+                        mood_score REAL,
+                        emergency_contacts_notified BOOLEAN DEFAULT FALSE,
+                        notification_results TEXT,  -- JSON
+                        follow_up_required BOOLEAN DEFAULT FALSE,
+                        follow_up_completed BOOLEAN DEFAULT FALSE,
+                        resolution_status TEXT,
+                        FOREIGN KEY (interaction_id) REFERENCES interactions (id)
+                    )
+                ''')
+            
+                # System metrics table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS system_metrics (
+                        id TEXT PRIMARY KEY,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        metric_name TEXT,
+                        metric_value REAL,
+                        metric_unit TEXT,
+                        additional_data TEXT  -- JSON
+                    )
+                ''')
+            
+                # Daily check-ins table for streak system
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS daily_checkins (
+                        id TEXT PRIMARY KEY,
+                        user_id TEXT,
+                        date DATE,
+                        questions_data TEXT,  -- JSON of questions asked
+                        answers_data TEXT,    -- JSON of user answers
+                        wellness_score REAL,
+                        wellness_category TEXT,
+                        category_scores TEXT, -- JSON of category breakdowns
+                        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(user_id, date)
+                    )
+                ''')
+            
+                # User streaks table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS user_streaks (
+                        user_id TEXT PRIMARY KEY,
+                        current_streak INTEGER DEFAULT 0,
+                        longest_streak INTEGER DEFAULT 0,
+                        last_checkin_date DATE,
+                        total_checkins INTEGER DEFAULT 0,
+                        streak_milestones TEXT,  -- JSON array of achieved milestones
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # Indexes and later schema changes
+                apply_migrations(conn)
+            
             logger.info("Database initialized successfully")
             
         except Exception as e:
@@ -144,16 +244,13 @@ class MentalHealthMonitor:
         user_id = user_id or f"anonymous_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO user_sessions (id, user_id, session_start)
-                VALUES (?, ?, ?)
-            ''', (session_id, user_id, datetime.now()))
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT INTO user_sessions (id, user_id, session_start)
+                    VALUES (?, ?, ?)
+                ''', (session_id, user_id, datetime.now()))
             
             logger.info(f"Started session {session_id} for user {user_id}")
             return session_id
@@ -179,37 +276,27 @@ class MentalHealthMonitor:
         interaction_id = str(uuid.uuid4())
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO interactions (
-                    id, session_id, user_id, input_text, input_type,
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    INSERT INTO interactions (
+                        id, session_id, user_id, input_text, input_type,
+                        mood_score, mood_label, is_crisis, crisis_level,
+                        crisis_keywords, response_type, processing_time_ms, user_location
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    interaction_id, session_id, user_id, input_text, input_type,
                     mood_score, mood_label, is_crisis, crisis_level,
-                    crisis_keywords, response_type, processing_time_ms, user_location
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                interaction_id, session_id, user_id, input_text, input_type,
-                mood_score, mood_label, is_crisis, crisis_level,
-                json.dumps(crisis_keywords) if crisis_keywords else None,
-                response_type, processing_time_ms, user_location
-            ))
-            
-            # Update session statistics
-            cursor.execute('''
-                UPDATE user_sessions 
-                SET total_interactions = total_interactions + 1,
-                    crisis_events = crisis_events + ?,
-                    average_mood_score = (
-                        SELECT AVG(mood_score) 
-                        FROM interactions 
-                        WHERE session_id = ?
-                    )
-                WHERE id = ?
-            ''', (1 if is_crisis else 0, session_id, session_id))
-            
-            conn.commit()
-            conn.close()
+                    json.dumps(crisis_keywords) if crisis_keywords else None,
+                    response_type, processing_time_ms, user_location
+                ))
+            
+                # Update session statistics
+                cursor.execute(SESSION_STATS_UPDATE, {
+                    "total": 1, "crises": 1 if is_crisis else 0, "session_id": session_id,
+                    "score_sum": mood_score or 0, "scored": 0 if mood_score is None else 1
+                })
             
             logger.info(f"Logged interaction {interaction_id} for session {session_id}")
             return interaction_id
@@ -231,49 +318,146 @@ class MentalHealthMonitor:
         crisis_id = str(uuid.uuid4())
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO crisis_events (
-                    id, interaction_id, user_id, crisis_level, crisis_keywords,
-                    mood_score, emergency_contacts_notified, notification_results,
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute('''
+                    INSERT INTO crisis_events (
+                        id, interaction_id, user_id, crisis_level, crisis_keywords,
+                        mood_score, emergency_contacts_notified, notification_results,
+                        follow_up_required
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    crisis_id, interaction_id, user_id, crisis_level,
+                    json.dumps(crisis_keywords), mood_score,
+                    emergency_contacts_notified,
+                    json.dumps(notification_results) if notification_results else None,
                     follow_up_required
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                crisis_id, interaction_id, user_id, crisis_level,
-                json.dumps(crisis_keywords), mood_score,
-                emergency_contacts_notified,
-                json.dumps(notification_results) if notification_results else None,
-                follow_up_required
-            ))
-            
-            conn.commit()
-            conn.close()
+                ))
             
             logger.warning(f"CRISIS EVENT LOGGED: {crisis_id} - Level: {crisis_level}")
+            self._notify_crisis_listeners([user_id])
             return crisis_id
             
         except Exception as e:
             logger.error(f"Failed to log crisis event: {e}")
             return crisis_id
 
+    def log_interactions_batch(self, records: List[Dict[str, Any]], raise_errors: bool = False) -> List[Dict[str, str]]:
+        """
+        Log many interactions, and crisis events for those flagged, in one transaction.
+
+        Args:
+            records: One dict per interaction with the ``log_interaction``
+                arguments; crisis interactions may also carry the
+                ``log_crisis_event`` fields (``emergency_contacts_notified``,
+                ``notification_results``, ``follow_up_required``). Records
+                without a ``session_id`` share a new session per user.
+            raise_errors: Re-raise database errors instead of only logging them
+
+        Returns:
+            ``session_id`` and ``interaction_id`` for each record, in order
+        """
+        results = []
+        new_sessions = {}
+        interaction_rows = []
+        crisis_rows = []
+        session_updates: Dict[str, List[float]] = {}
+
+        for record in records:
+            user_id = record["user_id"]
+            session_id = record.get("session_id")
+            if not session_id:
+                if user_id not in new_sessions:
+                    new_sessions[user_id] = str(uuid.uuid4())
+                session_id = new_sessions[user_id]
+
+            interaction_id = record.get("interaction_id") or str(uuid.uuid4())
+            is_crisis = bool(record.get("is_crisis", False))
+            crisis_keywords = record.get("crisis_keywords")
+            interaction_rows.append((
+                interaction_id, session_id, user_id, record.get("input_text", ""), record.get("input_type", "text"),
+                record.get("mood_score", 0), record.get("mood_label", "unknown"), is_crisis,
+                record.get("crisis_level"), json.dumps(crisis_keywords) if crisis_keywords else None,
+                record.get("response_type", "standard"), record.get("processing_time_ms", 0),
+                record.get("user_location", "unknown")
+            ))
+            if is_crisis:
+                notification_results = record.get("notification_results")
+                crisis_rows.append((
+                    str(uuid.uuid4()), interaction_id, user_id, record.get("crisis_level", "unknown"),
+                    json.dumps(crisis_keywords or []), record.get("mood_score", 0),
+                    record.get("emergency_contacts_notified", False),
+                    json.dumps(notification_results) if notification_results else None,
+                    record.get("follow_up_required", False)
+                ))
+
+            mood_score = record.get("mood_score", 0)
+            counts = session_updates.setdefault(session_id, [0, 0, 0.0, 0])
+            counts[0] += 1
+            counts[1] += 1 if is_crisis else 0
+            if mood_score is not None:
+                counts[2] += mood_score
+                counts[3] += 1
+            results.append({"session_id": session_id, "interaction_id": interaction_id})
+
+        try:
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+
+                now = datetime.now()
+                cursor.executemany('''
+                    INSERT INTO user_sessions (id, user_id, session_start)
+                    VALUES (?, ?, ?)
+                ''', [(session_id, user_id, now) for user_id, session_id in new_sessions.items()])
+
+                cursor.executemany('''
+                    INSERT INTO interactions (
+                        id, session_id, user_id, input_text, input_type,
+                        mood_score, mood_label, is_crisis, crisis_level,
+                        crisis_keywords, response_type, processing_time_ms, user_location
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', interaction_rows)
+
+                cursor.executemany('''
+                    INSERT INTO crisis_events (
+                        id, interaction_id, user_id, crisis_level, crisis_keywords,
+                        mood_score, emergency_contacts_notified, notification_results,
+                        follow_up_required
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', crisis_rows)
+
+                # Update session statistics once per session
+                cursor.executemany(SESSION_STATS_UPDATE, [
+                    {"total": total, "crises": crises, "score_sum": score_sum, "scored": scored, "session_id": session_id}
+                    for session_id, (total, crises, score_sum, scored) in session_updates.items()
+                ])
+
+            logger.info(f"Logged {len(interaction_rows)} interactions in one batch")
+            if crisis_rows:
+                logger.warning(f"CRISIS EVENTS LOGGED: {len(crisis_rows)} in batch")
+                self._notify_crisis_listeners(dict.fromkeys(row[2] for row in crisis_rows))
+
+        except Exception as e:
+            logger.error(f"Failed to log interaction batch: {e}")
+            if raise_errors:
+                raise
+
+        return results
+
     def log_system_metric(self, metric_name: str, metric_value: float, metric_unit: str = "", additional_data: Dict = None):
         """Log system performance metrics."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO system_metrics (id, metric_name, metric_value, metric_unit, additional_data)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                str(uuid.uuid4()), metric_name, metric_value, metric_unit,
-                json.dumps(additional_data) if additional_data else None
-            ))
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT INTO system_metrics (id, metric_name, metric_value, metric_unit, additional_data)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    str(uuid.uuid4()), metric_name, metric_value, metric_unit,
+                    json.dumps(additional_data) if additional_data else None
+                ))
             
         except Exception as e:
             logger.error(f"Failed to log system metric: {e}")
@@ -281,80 +465,125 @@ class MentalHealthMonitor:
     def end_session(self, session_id: str):
         """End a user session."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE user_sessions 
-                SET session_end = ?
-                WHERE id = ?
-            ''', (datetime.now(), session_id))
-            
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    UPDATE user_sessions 
+                    SET session_end = ?
+                    WHERE id = ?
+                ''', (datetime.now(), session_id))
             
             logger.info(f"Ended session {session_id}")
             
         except Exception as e:
             logger.error(f"Failed to end session: {e}")
 
+    def check_session_aggregates(self, repair: bool = False, tolerance: float = 1e-6) -> Dict[str, Any]:
+        """
+        Compare each session's running mood score sum, count and average with
+        values recomputed from its interactions.
+
+        Args:
+            repair: Overwrite mismatched sessions with the recomputed values
+            tolerance: Allowed absolute difference for the sum and average
+                (running sums accumulate in a different order than SUM())
+
+        Returns:
+            Number of sessions checked and the mismatched sessions
+        """
+        try:
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    SELECT s.id, s.mood_score_sum, s.mood_score_count, s.average_mood_score,
+                           COALESCE(i.score_sum, 0), COALESCE(i.scored, 0), i.average
+                    FROM user_sessions s
+                    LEFT JOIN (
+                        SELECT session_id, SUM(mood_score) AS score_sum,
+                               COUNT(mood_score) AS scored, AVG(mood_score) AS average
+                        FROM interactions
+                        GROUP BY session_id
+                    ) i ON i.session_id = s.id
+                ''')
+
+                checked = 0
+                mismatches = []
+                for session_id, score_sum, scored, average, expected_sum, expected_scored, expected_average in cursor.fetchall():
+                    checked += 1
+                    averages_match = (average is None and expected_average is None) or (
+                        average is not None and expected_average is not None
+                        and abs(average - expected_average) <= tolerance
+                    )
+                    if scored == expected_scored and abs(score_sum - expected_sum) <= tolerance and averages_match:
+                        continue
+                    mismatches.append({
+                        "session_id": session_id,
+                        "mood_score_sum": score_sum,
+                        "expected_mood_score_sum": expected_sum,
+                        "mood_score_count": scored,
+                        "expected_mood_score_count": expected_scored,
+                        "average_mood_score": average,
+                        "expected_average_mood_score": expected_average
+                    })
+
+                if repair and mismatches:
+                    cursor.executemany('''
+                        UPDATE user_sessions
+                        SET mood_score_sum = ?, mood_score_count = ?, average_mood_score = ?
+                        WHERE id = ?
+                    ''', [
+                        (m["expected_mood_score_sum"], m["expected_mood_score_count"],
+                         m["expected_average_mood_score"], m["session_id"])
+                        for m in mismatches
+                    ])
+
+            if mismatches:
+                logger.warning(f"{len(mismatches)} of {checked} session(s) have inconsistent mood aggregates"
+                               f"{' (repaired)' if repair else ''}")
+            return {"sessions_checked": checked, "mismatches": mismatches, "repaired": repair and bool(mismatches)}
+
+        except Exception as e:
+            logger.error(f"Failed to check session aggregates: {e}")
+            return {"error": str(e)}
+
     def get_analytics_summary(self, days: int = 7) -> Dict:
         """Get analytics summary for the specified number of days."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            start_date = datetime.now() - timedelta(days=days)
-            
-            # Total interactions
-            cursor.execute('''
-                SELECT COUNT(*) FROM interactions 
-                WHERE timestamp >= ?
-            ''', (start_date,))
-            total_interactions = cursor.fetchone()[0]
-            
-            # Crisis events
-            cursor.execute('''
-                SELECT COUNT(*) FROM crisis_events 
-                WHERE timestamp >= ?
-            ''', (start_date,))
-            total_crisis_events = cursor.fetchone()[0]
-            
-            # Average mood score
-            cursor.execute('''
-                SELECT AVG(mood_score) FROM interactions 
-                WHERE timestamp >= ? AND mood_score IS NOT NULL
-            ''', (start_date,))
-            avg_mood_score = cursor.fetchone()[0] or 0
-            
-            # Crisis levels breakdown
-            cursor.execute('''
-                SELECT crisis_level, COUNT(*) 
-                FROM crisis_events 
-                WHERE timestamp >= ?
-                GROUP BY crisis_level
-            ''', (start_date,))
-            crisis_breakdown = dict(cursor.fetchall())
-            
-            # Daily interaction counts
-            cursor.execute('''
-                SELECT DATE(timestamp) as date, COUNT(*) as count
-                FROM interactions 
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            ''', (start_date,))
-            daily_interactions = dict(cursor.fetchall())
-            
-            # Unique users
-            cursor.execute('''
-                SELECT COUNT(DISTINCT user_id) FROM interactions 
-                WHERE timestamp >= ?
-            ''', (start_date,))
-            unique_users = cursor.fetchone()[0]
-            
-            conn.close()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
+                window = _rollup_window(datetime.now() - timedelta(days=days))
+                source = _interaction_source()
+
+                # Interaction totals, mood average and unique users
+                cursor.execute(f'''
+                    SELECT COALESCE(SUM(interactions), 0), SUM(mood_score_sum),
+                           SUM(mood_score_count), COUNT(DISTINCT user_id)
+                    FROM ({source})
+                ''', window)
+                total_interactions, mood_score_sum, mood_score_count, unique_users = cursor.fetchone()
+                avg_mood_score = mood_score_sum / mood_score_count if mood_score_count else 0
+
+                # Crisis levels breakdown
+                cursor.execute(f'''
+                    SELECT crisis_level, SUM(events)
+                    FROM ({_crisis_source()})
+                    GROUP BY crisis_level
+                ''', window)
+                crisis_breakdown = dict(cursor.fetchall())
+                total_crisis_events = sum(crisis_breakdown.values())
+
+                # Daily interaction counts
+                cursor.execute(f'''
+                    SELECT substr(bucket, 1, 10) as date, SUM(interactions) as count
+                    FROM ({source})
+                    GROUP BY date
+                    ORDER BY date
+                ''', window)
+                daily_interactions = dict(cursor.fetchall())
+
             return {
                 "period_days": days,
                 "total_interactions": total_interactions,
@@ -374,89 +603,65 @@ class MentalHealthMonitor:
     def get_user_analytics(self, user_id: str, days: int = 7) -> Dict[str, Any]:
         """Get analytics specific to a user for the specified number of days."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            start_date = datetime.now() - timedelta(days=days)
-            
-            # User's total interactions
-            cursor.execute('''
-                SELECT COUNT(*) FROM interactions 
-                WHERE user_id = ? AND timestamp >= ?
-            ''', (user_id, start_date))
-            user_interactions = cursor.fetchone()[0]
-            
-            # User's crisis events
-            cursor.execute('''
-                SELECT COUNT(*) FROM crisis_events 
-                WHERE user_id = ? AND timestamp >= ?
-            ''', (user_id, start_date))
-            user_crisis_events = cursor.fetchone()[0]
-            
-            # User's average mood score
-            cursor.execute('''
-                SELECT AVG(mood_score) FROM interactions 
-                WHERE user_id = ? AND timestamp >= ? AND mood_score IS NOT NULL
-            ''', (user_id, start_date))
-            user_avg_mood = cursor.fetchone()[0] or 0
-            
-            # User's mood trend (daily averages)
-            cursor.execute('''
-                SELECT DATE(timestamp) as date, AVG(mood_score) as avg_mood
-                FROM interactions 
-                WHERE user_id = ? AND timestamp >= ? AND mood_score IS NOT NULL
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            ''', (user_id, start_date))
-            mood_trend = dict(cursor.fetchall())
-            
-            # User's crisis levels breakdown
-            cursor.execute('''
-                SELECT crisis_level, COUNT(*) 
-                FROM crisis_events 
-                WHERE user_id = ? AND timestamp >= ?
-                GROUP BY crisis_level
-            ''', (user_id, start_date))
-            user_crisis_breakdown = dict(cursor.fetchall())
-            
-            # User's daily activity pattern
-            cursor.execute('''
-                SELECT DATE(timestamp) as date, COUNT(*) as interactions
-                FROM interactions 
-                WHERE user_id = ? AND timestamp >= ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            ''', (user_id, start_date))
-            daily_activity = dict(cursor.fetchall())
-            
-            # User's most active hours
-            cursor.execute('''
-                SELECT strftime('%H', timestamp) as hour, COUNT(*) as count
-                FROM interactions 
-                WHERE user_id = ? AND timestamp >= ?
-                GROUP BY strftime('%H', timestamp)
-                ORDER BY count DESC
-                LIMIT 3
-            ''', (user_id, start_date))
-            active_hours = cursor.fetchall()
-            
-            # User's session count
-            cursor.execute('''
-                SELECT COUNT(DISTINCT session_id) FROM interactions 
-                WHERE user_id = ? AND timestamp >= ?
-            ''', (user_id, start_date))
-            session_count = cursor.fetchone()[0]
-            
-            # User's improvement indicators
-            if len(mood_trend) >= 2:
-                mood_values = list(mood_trend.values())
-                recent_mood = sum(mood_values[-3:]) / min(3, len(mood_values[-3:]))  # Last 3 days average
-                earlier_mood = sum(mood_values[:3]) / min(3, len(mood_values[:3]))   # First 3 days average
-                mood_improvement = recent_mood - earlier_mood
-            else:
-                mood_improvement = 0
-            
-            conn.close()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+            
+                window = _rollup_window(datetime.now() - timedelta(days=days))
+                window["user_id"] = user_id
+                # Hourly buckets throughout, for the most active hours
+                source = _interaction_source(per_user=True, use_daily=False)
+
+                # User's total interactions, average mood score and session count
+                cursor.execute(f'''
+                    SELECT COALESCE(SUM(interactions), 0), SUM(mood_score_sum),
+                           SUM(mood_score_count), COUNT(DISTINCT session_id)
+                    FROM ({source})
+                ''', window)
+                user_interactions, mood_score_sum, mood_score_count, session_count = cursor.fetchone()
+                user_avg_mood = mood_score_sum / mood_score_count if mood_score_count else 0
+
+                # User's crisis levels breakdown
+                cursor.execute(f'''
+                    SELECT crisis_level, SUM(events)
+                    FROM ({_crisis_source(per_user=True)})
+                    GROUP BY crisis_level
+                ''', window)
+                user_crisis_breakdown = dict(cursor.fetchall())
+                user_crisis_events = sum(user_crisis_breakdown.values())
+
+                # User's daily activity pattern and mood trend (daily averages)
+                cursor.execute(f'''
+                    SELECT substr(bucket, 1, 10) as date, SUM(interactions),
+                           SUM(mood_score_sum), SUM(mood_score_count)
+                    FROM ({source})
+                    GROUP BY date
+                    ORDER BY date
+                ''', window)
+                daily_activity = {}
+                mood_trend = {}
+                for date, interactions, day_mood_sum, day_mood_count in cursor.fetchall():
+                    daily_activity[date] = interactions
+                    if day_mood_count:
+                        mood_trend[date] = day_mood_sum / day_mood_count
+
+                # User's most active hours
+                cursor.execute(f'''
+                    SELECT substr(bucket, 12, 2) as hour, SUM(interactions) as count
+                    FROM ({source})
+                    GROUP BY hour
+                    ORDER BY count DESC
+                    LIMIT 3
+                ''', window)
+                active_hours = cursor.fetchall()
+
+                # User's improvement indicators
+                if len(mood_trend) >= 2:
+                    mood_values = list(mood_trend.values())
+                    recent_mood = sum(mood_values[-3:]) / min(3, len(mood_values[-3:]))  # Last 3 days average
+                    earlier_mood = sum(mood_values[:3]) / min(3, len(mood_values[:3]))   # First 3 days average
+                    mood_improvement = recent_mood - earlier_mood
+                else:
+                    mood_improvement = 0
             
             return {
                 "user_id": user_id,
@@ -491,30 +696,27 @@ class MentalHealthMonitor:
                           wellness_score: float, wellness_category: str, category_scores: Dict) -> str:
         """Save daily check-in data and update streak."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            checkin_id = str(uuid.uuid4())
-            today = datetime.now().date()
-            
-            # Save daily check-in
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_checkins 
-                (id, user_id, date, questions_data, answers_data, wellness_score, 
-                 wellness_category, category_scores, completed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                checkin_id, user_id, today,
-                json.dumps(questions_data), json.dumps(answers_data),
-                wellness_score, wellness_category, json.dumps(category_scores),
-                datetime.now()
-            ))
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            # Update user streak
-            self._update_user_streak(cursor, user_id, today)
+                checkin_id = str(uuid.uuid4())
+                today = datetime.now().date()
             
-            conn.commit()
-            conn.close()
+                # Save daily check-in
+                cursor.execute('''
+                    INSERT OR REPLACE INTO daily_checkins 
+                    (id, user_id, date, questions_data, answers_data, wellness_score, 
+                     wellness_category, category_scores, completed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    checkin_id, user_id, today,
+                    json.dumps(questions_data), json.dumps(answers_data),
+                    wellness_score, wellness_category, json.dumps(category_scores),
+                    datetime.now()
+                ))
+            
+                # Update user streak
+                self._update_user_streak(cursor, user_id, today)
             
             logger.info(f"Daily check-in saved for user {user_id}")
             return checkin_id
@@ -577,48 +779,46 @@ class MentalHealthMonitor:
     def get_user_streak_info(self, user_id: str) -> Dict[str, Any]:
         """Get user's streak information."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT current_streak, longest_streak, last_checkin_date, 
-                       total_checkins, streak_milestones
-                FROM user_streaks WHERE user_id = ?
-            ''', (user_id,))
+                cursor.execute('''
+                    SELECT current_streak, longest_streak, last_checkin_date, 
+                           total_checkins, streak_milestones
+                    FROM user_streaks WHERE user_id = ?
+                ''', (user_id,))
             
-            result = cursor.fetchone()
+                result = cursor.fetchone()
             
-            if result:
-                current_streak, longest_streak, last_checkin_str, total_checkins, milestones_str = result
-                milestones = json.loads(milestones_str) if milestones_str else []
+                if result:
+                    current_streak, longest_streak, last_checkin_str, total_checkins, milestones_str = result
+                    milestones = json.loads(milestones_str) if milestones_str else []
                 
-                # Check if streak is still active (checked in today or yesterday)
-                today = datetime.now().date()
-                last_checkin = datetime.strptime(last_checkin_str, '%Y-%m-%d').date() if last_checkin_str else None
-                
-                if last_checkin and (today - last_checkin).days > 1:
-                    # Streak is broken
-                    current_streak = 0
+                    # Check if streak is still active (checked in today or yesterday)
+                    today = datetime.now().date()
+                    last_checkin = datetime.strptime(last_checkin_str, '%Y-%m-%d').date() if last_checkin_str else None
                 
-                return {
-                    "current_streak": current_streak,
-                    "longest_streak": longest_streak,
-                    "last_checkin_date": last_checkin_str,
-                    "total_checkins": total_checkins,
-                    "milestones_achieved": milestones,
-                    "checked_in_today": last_checkin == today if last_checkin else False
-                }
-            else:
-                return {
-                    "current_streak": 0,
-                    "longest_streak": 0,
-                    "last_checkin_date": None,
-                    "total_checkins": 0,
-                    "milestones_achieved": [],
-                    "checked_in_today": False
-                }
+                    if last_checkin and (today - last_checkin).days > 1:
+                        # Streak is broken
+                        current_streak = 0
                 
-            conn.close()
+                    return {
+                        "current_streak": current_streak,
+                        "longest_streak": longest_streak,
+                        "last_checkin_date": last_checkin_str,
+                        "total_checkins": total_checkins,
+                        "milestones_achieved": milestones,
+                        "checked_in_today": last_checkin == today if last_checkin else False
+                    }
+                else:
+                    return {
+                        "current_streak": 0,
+                        "longest_streak": 0,
+                        "last_checkin_date": None,
+                        "total_checkins": 0,
+                        "milestones_achieved": [],
+                        "checked_in_today": False
+                    }
             
         except Exception as e:
             logger.error(f"Failed to get streak info for {user_id}: {e}")
@@ -627,30 +827,29 @@ class MentalHealthMonitor:
     def get_user_daily_scores(self, user_id: str, days: int = 30) -> List[Dict[str, Any]]:
         """Get user's daily wellness scores for trend analysis."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            start_date = datetime.now() - timedelta(days=days)
-            
-            cursor.execute('''
-                SELECT date, wellness_score, wellness_category, category_scores
-                FROM daily_checkins 
-                WHERE user_id = ? AND date >= ?
-                ORDER BY date DESC
-            ''', (user_id, start_date.date()))
-            
-            results = cursor.fetchall()
-            
-            daily_scores = []
-            for date_str, score, category, category_scores_str in results:
-                daily_scores.append({
-                    "date": date_str,
-                    "overall_score": score,
-                    "wellness_category": category,
-                    "category_scores": json.loads(category_scores_str) if category_scores_str else {}
-                })
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+            
+                start_date = datetime.now() - timedelta(days=days)
+            
+                cursor.execute('''
+                    SELECT date, wellness_score, wellness_category, category_scores
+                    FROM daily_checkins 
+                    WHERE user_id = ? AND date >= ?
+                    ORDER BY date DESC
+                ''', (user_id, start_date.date()))
+            
+                results = cursor.fetchall()
+            
+                daily_scores = []
+                for date_str, score, category, category_scores_str in results:
+                    daily_scores.append({
+                        "date": date_str,
+                        "overall_score": score,
+                        "wellness_category": category,
+                        "category_scores": json.loads(category_scores_str) if category_scores_str else {}
+                    })
             
-            conn.close()
             return daily_scores
             
         except Exception as e:
@@ -660,29 +859,27 @@ class MentalHealthMonitor:
     def get_crisis_alerts(self, unresolved_only: bool = True) -> List[Dict]:
         """Get crisis alerts that may need follow-up."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            query = '''
-                SELECT ce.*, i.input_text, i.user_location
-                FROM crisis_events ce
-                JOIN interactions i ON ce.interaction_id = i.id
-                WHERE ce.follow_up_required = TRUE
-            '''
+                query = '''
+                    SELECT ce.*, i.input_text, i.user_location
+                    FROM crisis_events ce
+                    JOIN interactions i ON ce.interaction_id = i.id
+                    WHERE ce.follow_up_required = TRUE
+                '''
             
-            if unresolved_only:
-                query += ' AND ce.follow_up_completed = FALSE'
+                if unresolved_only:
+                    query += ' AND ce.follow_up_completed = FALSE'
             
-            query += ' ORDER BY ce.timestamp DESC'
+                query += ' ORDER BY ce.timestamp DESC'
             
-            cursor.execute(query)
-            results = cursor.fetchall()
+                cursor.execute(query)
+                results = cursor.fetchall()
             
-            # Convert to list of dictionaries
-            columns = [description[0] for description in cursor.description]
-            alerts = [dict(zip(columns, row)) for row in results]
-            
-            conn.close()
+                # Convert to list of dictionaries
+                columns = [description[0] for description in cursor.description]
+                alerts = [dict(zip(columns, row)) for row in results]
             
             return alerts
             
@@ -693,17 +890,14 @@ class MentalHealthMonitor:
     def mark_crisis_resolved(self, crisis_id: str, resolution_status: str = "resolved"):
         """Mark a crisis event as resolved."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE crisis_events 
-                SET follow_up_completed = TRUE, resolution_status = ?
-                WHERE id = ?
-            ''', (resolution_status, crisis_id))
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    UPDATE crisis_events 
+                    SET follow_up_completed = TRUE, resolution_status = ?
+                    WHERE id = ?
+                ''', (resolution_status, crisis_id))
             
             logger.info(f"Crisis {crisis_id} marked as {resolution_status}")
             
@@ -738,9 +932,48 @@ class MentalHealthMonitor:
 # Global monitor instance
 monitor = MentalHealthMonitor()
 
+def _request_record(session_id: Optional[str], user_id: str, input_data: Dict,
+                    analysis_result: Dict, processing_time_ms: int = 0) -> Dict[str, Any]:
+    """Flatten a request into a ``log_interactions_batch`` record."""
+    return {
+        "session_id": session_id,
+        "user_id": user_id,
+        "input_text": input_data.get("text", ""),
+        "input_type": input_data.get("type", "text"),
+        "mood_score": analysis_result.get("mood_score", 0),
+        "mood_label": analysis_result.get("mood_label", "unknown"),
+        "is_crisis": analysis_result.get("is_crisis", False),
+        "crisis_level": analysis_result.get("crisis_level"),
+        "crisis_keywords": analysis_result.get("crisis_keywords", []),
+        "response_type": analysis_result.get("response_type", "standard"),
+        "processing_time_ms": processing_time_ms,
+        "user_location": input_data.get("location", "unknown"),
+        "emergency_contacts_notified": analysis_result.get("emergency_contacts_notified", False),
+        "notification_results": analysis_result.get("notification_results"),
+        "follow_up_required": analysis_result.get("follow_up_required", False)
+    }
+
+def _write_request_records(records: List[Dict[str, Any]]):
+    monitor.log_interactions_batch(records, raise_errors=True)
+
+# Write-behind logging: requests are queued and group-committed by one writer thread
+WRITE_BEHIND_ENABLED = os.getenv("MONITOR_WRITE_BEHIND", "true").lower() == "true"
+
+request_log_queue = WriteBehindQueue(
+    _write_request_records,
+    capacity=int(os.getenv("MONITOR_QUEUE_CAPACITY", "10000")),
+    batch_size=int(os.getenv("MONITOR_QUEUE_BATCH_SIZE", "256")),
+    flush_interval_ms=float(os.getenv("MONITOR_QUEUE_FLUSH_MS", "50")),
+    max_attempts=int(os.getenv("MONITOR_QUEUE_MAX_ATTEMPTS", "3")),
+    name="request-log-writer",
+) if WRITE_BEHIND_ENABLED else None
+
 def log_request(session_id: str, user_id: str, input_data: Dict, analysis_result: Dict, processing_time_ms: int = 0) -> str:
     """
     Convenience function to log a complete request.
+
+    With write-behind enabled the interaction is queued and written shortly
+    after by the writer thread; crisis interactions use the priority lane.
     
     Args:
         session_id: User session ID
@@ -752,6 +985,12 @@ def log_request(session_id: str, user_id: str, input_data: Dict, analysis_result
     Returns:
         Interaction ID
     """
+    if request_log_queue is not None:
+        record = _request_record(session_id, user_id, input_data, analysis_result, processing_time_ms)
+        record["interaction_id"] = str(uuid.uuid4())
+        request_log_queue.put(record, priority=bool(record["is_crisis"]))
+        return record["interaction_id"]
+
     interaction_id = monitor.log_interaction(
         session_id=session_id,
         user_id=user_id,
@@ -782,6 +1021,41 @@ def log_request(session_id: str, user_id: str, input_data: Dict, analysis_result
     
     return interaction_id
 
+def log_requests_batch(requests: List[Dict]) -> List[Dict[str, str]]:
+    """
+    Convenience function to log many complete requests in one transaction.
+
+    Args:
+        requests: One dict per request with the ``log_request`` arguments
+            (``session_id`` may be None to open a session per user)
+
+    Returns:
+        ``session_id`` and ``interaction_id`` for each request, in order
+    """
+    records = [
+        _request_record(request.get("session_id"), request["user_id"], request["input_data"],
+                        request["analysis_result"], request.get("processing_time_ms", 0))
+        for request in requests
+    ]
+    return monitor.log_interactions_batch(records)
+
+def flush_request_log(timeout: float = 10.0) -> bool:
+    """Wait until queued request logs are written (e.g. on shutdown or before reading analytics)."""
+    if request_log_queue is None:
+        return True
+    return request_log_queue.flush(timeout)
+
+def close_request_log(timeout: float = 10.0):
+    """Write all queued request logs and stop the writer thread."""
+    if request_log_queue is not None:
+        request_log_queue.close(timeout)
+
+def get_request_log_stats() -> Dict[str, Any]:
+    """Get write-behind queue depth, lag and drop statistics."""
+    if request_log_queue is None:
+        return {"write_behind": False}
+    return {"write_behind": True, **request_log_queue.get_stats()}
+
 if __name__ == "__main__":
     # Test the monitoring system
     print("Mental Health Monitoring System Test")
@@ -0,0 +1,228 @@
+"""
+Per-User Risk State
+Rolling crisis risk per user, so that a run of concerning messages
+escalates even when no single message would. Each user keeps a ring buffer
+of recent messages, used to detect sustained low mood, and exponentially
+decayed totals that are updated in O(1) per message. State is in memory
+only; the least recently active users are evicted beyond max_users.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Risk each message adds, by its own crisis level
+LEVEL_WEIGHTS = {"none": 0.0, "moderate": 1.0, "high": 2.0, "critical": 4.0}
+LEVEL_ORDER = tuple(LEVEL_WEIGHTS)
+
+
+class UserRiskState:
+    __slots__ = ("recent", "updated_at", "risk", "messages", "mood_sum", "keyword_hits")
+
+    def __init__(self, window_size: int, now: float):
+        # (timestamp, mood_score, keyword_hits, crisis_level) of the latest messages
+        self.recent: Deque[Tuple[float, Optional[float], int, str]] = deque(maxlen=window_size)
+        self.updated_at = now
+        # Exponentially decayed totals
+        self.risk = 0.0
+        self.messages = 0.0
+        self.mood_sum = 0.0
+        self.keyword_hits = 0.0
+
+    def decay(self, now: float, half_life_s: float):
+        """Age the decayed totals to ``now`` (out-of-order times are not decayed)."""
+        if now <= self.updated_at:
+            return
+        factor = 0.5 ** ((now - self.updated_at) / half_life_s)
+        self.risk *= factor
+        self.messages *= factor
+        self.mood_sum *= factor
+        self.keyword_hits *= factor
+        self.updated_at = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "risk_score": round(self.risk, 3),
+            "recent_messages": len(self.recent),
+            "average_mood": round(self.mood_sum / self.messages, 3) if self.messages else None,
+            "keyword_hits": round(self.keyword_hits, 3)
+        }
+
+
+class RiskTracker:
+    def __init__(self,
+                 half_life_s: float = 900.0,
+                 window_size: int = 20,
+                 max_users: int = 10000,
+                 high_threshold: float = 3.5,
+                 critical_threshold: float = 8.0,
+                 sustained_messages: int = 3,
+                 sustained_mood: float = -0.6):
+        """
+        Args:
+            half_life_s: Time for a message's contribution to halve
+            window_size: Recent messages kept per user
+            max_users: Least recently active users beyond this are evicted
+            high_threshold: Decayed risk at which a concerning message is
+                raised to at least "high" (e.g. four "moderate" messages in
+                quick succession)
+            critical_threshold: Decayed risk at which it is raised to "critical"
+            sustained_messages: A concerning message is also raised to at
+                least "high" when this many latest messages, all sent
+                within one half-life, have a mood below ``sustained_mood``
+            sustained_mood: Mood score threshold for sustained low mood
+        """
+        self.half_life_s = half_life_s
+        self.window_size = max(1, window_size)
+        self.max_users = max(1, max_users)
+        self.high_threshold = high_threshold
+        self.critical_threshold = critical_threshold
+        self.sustained_messages = max(1, min(sustained_messages, self.window_size))
+        self.sustained_mood = sustained_mood
+
+        self._users: "OrderedDict[str, UserRiskState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.updates = 0
+        self.escalations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["RiskTracker"]:
+        """Build a tracker from RISK_STATE_* environment variables (None if disabled)."""
+        if os.getenv("RISK_STATE_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            half_life_s=float(os.getenv("RISK_STATE_HALF_LIFE_S", "900")),
+            window_size=int(os.getenv("RISK_STATE_WINDOW_SIZE", "20")),
+            max_users=int(os.getenv("RISK_STATE_MAX_USERS", "10000")),
+            high_threshold=float(os.getenv("RISK_STATE_HIGH_THRESHOLD", "3.5")),
+            critical_threshold=float(os.getenv("RISK_STATE_CRITICAL_THRESHOLD", "8")),
+            sustained_messages=int(os.getenv("RISK_STATE_SUSTAINED_MESSAGES", "3")),
+            sustained_mood=float(os.getenv("RISK_STATE_SUSTAINED_MOOD", "-0.6")),
+        )
+
+    def _sustained_low_mood(self, state: UserRiskState, now: float) -> bool:
+        if len(state.recent) < self.sustained_messages:
+            return False
+        for timestamp, mood_score, _, _ in islice(reversed(state.recent), self.sustained_messages):
+            if now - timestamp > self.half_life_s or mood_score is None or not mood_score < self.sustained_mood:
+                return False
+        return True
+
+    def _escalated_level(self, crisis_level: str, risk: float, sustained_low_mood: bool) -> str:
+        # Messages without any concern of their own are never escalated
+        if crisis_level not in LEVEL_WEIGHTS or crisis_level == "none":
+            return crisis_level
+        if risk >= self.critical_threshold:
+            return "critical"
+        if ((risk >= self.high_threshold or sustained_low_mood)
+                and LEVEL_ORDER.index(crisis_level) < LEVEL_ORDER.index("high")):
+            return "high"
+        return crisis_level
+
+    def update(self,
+               user_id: str,
+               crisis_level: str,
+               mood_score: Optional[float],
+               keyword_hits: int,
+               now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Record a message and apply the escalation rule.
+
+        Args:
+            user_id: User who sent the message
+            crisis_level: The message's own crisis level
+            mood_score: Its sentiment score (None or NaN if unknown)
+            keyword_hits: Number of crisis keywords found in it
+            now: Message time in epoch seconds (defaults to the current time)
+
+        Returns:
+            The user's risk snapshot, with the (possibly raised)
+            ``crisis_level`` for this message
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None:
+                state = self._users[user_id] = UserRiskState(self.window_size, now)
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._users.move_to_end(user_id)
+                state.decay(now, self.half_life_s)
+
+            state.recent.append((now, mood_score, keyword_hits, crisis_level))
+            state.risk += LEVEL_WEIGHTS.get(crisis_level, 0.0)
+            state.keyword_hits += keyword_hits
+            # NaN != NaN: unknown moods do not count towards the average
+            if mood_score is not None and mood_score == mood_score:
+                state.messages += 1
+                state.mood_sum += mood_score
+
+            sustained_low_mood = self._sustained_low_mood(state, now)
+            escalated_level = self._escalated_level(crisis_level, state.risk, sustained_low_mood)
+            self.updates += 1
+            if escalated_level != crisis_level:
+                self.escalations += 1
+            snapshot = state.snapshot()
+
+        snapshot["sustained_low_mood"] = sustained_low_mood
+        snapshot["crisis_level"] = escalated_level
+        return snapshot
+
+    def get(self, user_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Current risk snapshot for a user, or None if they are not tracked."""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None:
+                return None
+            state.decay(now, self.half_life_s)
+            return state.snapshot()
+
+    def rebuild(self, messages: Iterable[Tuple[str, float, str, Optional[float], int]]) -> int:
+        """
+        Replay past messages, oldest first, into the tracker.
+
+        Args:
+            messages: (user_id, epoch seconds, crisis level, mood score,
+                keyword hits) per message
+
+        Returns:
+            Number of messages replayed
+        """
+        replayed = 0
+        for user_id, timestamp, crisis_level, mood_score, keyword_hits in messages:
+            self.update(user_id, crisis_level, mood_score, keyword_hits, now=timestamp)
+            replayed += 1
+        return replayed
+
+    def reset(self, user_id: Optional[str] = None):
+        """Forget one user's state, or everyone's."""
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+            else:
+                self._users.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tracked_users": len(self._users),
+                "max_users": self.max_users,
+                "half_life_s": self.half_life_s,
+                "updates": self.updates,
+                "escalations": self.escalations,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,263 @@
+"""
+Write-behind Queue for Request Logging
+Takes database writes off the request path: records are queued in memory
+and a single writer thread group-commits them in batches. Crisis records go
+through a priority lane that is written first and never dropped for lack of
+room. A batch that keeps failing is written record by record, and a record
+that cannot be written while the others can is logged and dropped
+(dead-lettered) so it does not block the records behind it.
+"""
+
+import atexit
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    def __init__(self,
+                 writer: Callable[[List[Dict[str, Any]]], Any],
+                 capacity: int = 10000,
+                 batch_size: int = 256,
+                 flush_interval_ms: float = 50.0,
+                 retry_delay_s: float = 1.0,
+                 max_attempts: int = 3,
+                 name: str = "write-behind"):
+        """
+        Args:
+            writer: Persists a list of records in one transaction; must raise
+                on failure so records can be retried
+            capacity: Maximum records waiting in the normal lane; further
+                records are dropped (and counted) while it is full
+            batch_size: Maximum records per commit
+            flush_interval_ms: How long the writer waits for more records
+                before committing a partial batch
+            retry_delay_s: Pause after a failed commit before retrying
+            max_attempts: Failed commits of a batch in a row after which its
+                records are written one by one to find the ones that fail
+            name: Writer thread name
+        """
+        self.writer = writer
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.retry_delay = retry_delay_s
+        self.max_attempts = max(1, max_attempts)
+        self.name = name
+
+        # Lanes hold (enqueued_at, record)
+        self._priority: deque = deque()
+        self._normal: deque = deque()
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+        # Statistics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.total_commit_lag = 0.0
+        self.max_commit_lag = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, record: Dict[str, Any], priority: bool = False) -> bool:
+        """
+        Queue a record for writing.
+
+        Args:
+            record: Record passed to the writer
+            priority: Use the priority lane (never dropped, written first)
+
+        Returns:
+            False if the record was dropped because the normal lane is full
+        """
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                if priority:
+                    self._priority.append((time.monotonic(), record))
+                elif len(self._normal) >= self.capacity:
+                    self.dropped += 1
+                    if self.dropped == 1 or self.dropped % 1000 == 0:
+                        logger.warning(f"{self.name} queue full, {self.dropped} record(s) dropped so far")
+                    return False
+                else:
+                    self._normal.append((time.monotonic(), record))
+                self.enqueued += 1
+                self._condition.notify()
+
+        if closed:
+            # After shutdown there is no writer thread; write inline
+            self.writer([record])
+        return True
+
+    def _take_batch(self) -> List:
+        """Wait for records and take up to ``batch_size`` of them, priority lane first."""
+        with self._condition:
+            while not self._priority and not self._normal and not self._closed:
+                self._condition.wait()
+
+            # Give a partial batch a moment to fill up (group commit)
+            deadline = time.monotonic() + self.flush_interval
+            while (len(self._priority) + len(self._normal) < self.batch_size and not self._closed):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = []
+            while self._priority and len(batch) < self.batch_size:
+                batch.append((True,) + self._priority.popleft())
+            while self._normal and len(batch) < self.batch_size:
+                batch.append((False,) + self._normal.popleft())
+            self._in_flight = len(batch)
+            return batch
+
+    def _record_written(self, entries: List):
+        now = time.monotonic()
+        with self._condition:
+            for _, enqueued_at, _ in entries:
+                lag = now - enqueued_at
+                self.total_commit_lag += lag
+                self.max_commit_lag = max(self.max_commit_lag, lag)
+            self.written += len(entries)
+            self.batches += 1
+
+    def _write_one_by_one(self, batch: List) -> List:
+        """
+        Write the records of a repeatedly failing batch one at a time.
+
+        Returns:
+            The entries to retry: none if any record could be written (the
+            ones that still fail on a second try are dead-lettered), all of
+            them if every record failed, which points at the database rather
+            than the data
+        """
+        written = []
+        errors = {}
+        pending = batch
+        # A record that fails is tried once more after the others, so one
+        # that only hit the tail of an outage is not dropped
+        for _ in range(2):
+            failed = []
+            for entry in pending:
+                try:
+                    self.writer([entry[2]])
+                    written.append(entry)
+                except Exception as e:
+                    errors[id(entry)] = e
+                    failed.append(entry)
+            if not written:
+                return batch
+            pending = failed
+
+        self._record_written(written)
+        for entry in pending:
+            is_priority, _, record = entry
+            logger.error(f"{self.name} dropped a{' crisis' if is_priority else ''} record that cannot be written "
+                         f"({errors[id(entry)]}): {record!r}")
+        with self._condition:
+            self.dead_lettered += len(pending)
+        return []
+
+    def _run(self):
+        attempts = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                if self._closed:
+                    return
+                continue
+
+            try:
+                self.writer([record for _, _, record in batch])
+                self._record_written(batch)
+                failed = []
+            except Exception as e:
+                logger.error(f"{self.name} failed to write {len(batch)} record(s): {e}")
+                attempts += 1
+                failed = batch
+                if attempts >= self.max_attempts:
+                    failed = self._write_one_by_one(batch)
+                    attempts = 0
+
+            if not failed:
+                attempts = 0
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+                continue
+
+            with self._condition:
+                self.failures += 1
+                # Records are put back in order at the front of their lane;
+                # normal records only while that lane has room
+                for is_priority, enqueued_at, record in reversed(failed):
+                    if is_priority:
+                        self._priority.appendleft((enqueued_at, record))
+                    elif len(self._normal) < self.capacity:
+                        self._normal.appendleft((enqueued_at, record))
+                    else:
+                        self.dropped += 1
+                self._in_flight = 0
+                self._condition.notify_all()
+            time.sleep(self.retry_delay)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued record has been written. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._priority or self._normal or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Write everything still queued and stop the writer thread."""
+        if self._closed:
+            return
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        pending = len(self._priority) + len(self._normal)
+        if not flushed or pending:
+            logger.error(f"{self.name} closed with {pending} record(s) still unwritten")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, lag and throughput statistics."""
+        with self._condition:
+            oldest = [lane[0][0] for lane in (self._priority, self._normal) if lane]
+            lag = time.monotonic() - min(oldest) if oldest else 0.0
+            return {
+                "pending": len(self._priority) + len(self._normal),
+                "priority_pending": len(self._priority),
+                "in_flight": self._in_flight,
+                "capacity": self.capacity,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "average_batch_size": round(self.written / self.batches, 2) if self.batches else 0,
+                "failures": self.failures,
+                "dead_lettered": self.dead_lettered,
+                "queue_lag_ms": round(lag * 1000, 2),
+                "average_commit_lag_ms": round(self.total_commit_lag / self.written * 1000, 2) if self.written else 0,
+                "max_commit_lag_ms": round(self.max_commit_lag * 1000, 2)
+            }
@@ -0,0 +1,85 @@
+"""
+Shared fixtures: a toy two-class ONNX model with the sentiment model's
+inputs, built on the fly so session tests need no downloaded model, and
+the API app on a throwaway analytics database.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_toy_model(path):
+    """
+    Write a model mapping (input_ids, attention_mask) of shape
+    [batch, sequence] to logits [batch, 2]: the masked sum of the ids and
+    its negation.
+    """
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper
+
+    nodes = [
+        helper.make_node("Mul", ["input_ids", "attention_mask"], ["masked"]),
+        helper.make_node("ReduceSum", ["masked", "axes"], ["summed"], keepdims=1),
+        helper.make_node("Cast", ["summed"], ["summed_float"], to=TensorProto.FLOAT),
+        helper.make_node("Mul", ["summed_float", "signs"], ["logits"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "toy_sentiment",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+         helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "sequence"])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 2])],
+        initializer=[helper.make_tensor("axes", TensorProto.INT64, [1], [1]),
+                     helper.make_tensor("signs", TensorProto.FLOAT, [1, 2], [1.0, -1.0])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return path
+
+
+@pytest.fixture
+def toy_model(tmp_path):
+    pytest.importorskip("onnxruntime")
+    return build_toy_model(tmp_path / "model.onnx")
+
+
+class FakeSentimentModel:
+    """Stands in for SentimentModel: every text scores -0.2 (NEGATIVE)."""
+
+    lowercase = False
+
+    def __init__(self, model_file="fake.onnx"):
+        self.model_file = model_file
+
+    def file_signature(self):
+        return (self.model_file, None, None)
+
+    def analyze_batch(self, texts, aggregation=None):
+        return [(-0.2, "NEGATIVE")] * len(texts)
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """
+    The FastAPI app with a fresh analytics database in ``tmp_path``,
+    request logs written inline and no model warm-up.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MONITOR_WRITE_BEHIND", "false")
+    monkeypatch.setenv("MODEL_WARMUP_ON_STARTUP", "false")
+    from api import main
+    from services import monitoring
+
+    test_monitor = monitoring.MentalHealthMonitor(str(tmp_path / "analytics.db"))
+    test_monitor.add_crisis_listener(main.analytics_cache.invalidate)
+    monkeypatch.setattr(monitoring, "monitor", test_monitor)
+    monkeypatch.setattr(monitoring, "request_log_queue", None)
+    monkeypatch.setattr(main, "monitor", test_monitor)
+    main.analytics_cache.clear()
+    yield main
+    test_monitor.db.close_all()
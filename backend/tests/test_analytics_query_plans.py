@@ -0,0 +1,88 @@
+"""
+Query plan audit for the analytics database (services/monitoring.py).
+
+Every query issued by the analytics, session statistics and crisis alert
+paths is captured and run through EXPLAIN QUERY PLAN; a full table scan
+fails the test.
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING (COVERING )?INDEX)")
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    # Importing the module creates the global monitor in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MONITOR_WRITE_BEHIND", "false")
+    from services.monitoring import MentalHealthMonitor
+
+    monitor = MentalHealthMonitor(str(tmp_path / "audit.db"))
+    for user_id in ("user_a", "user_b"):
+        session_id = monitor.start_session(user_id)
+        for index in range(5):
+            is_crisis = index == 4
+            interaction_id = monitor.log_interaction(
+                session_id=session_id, user_id=user_id, input_text="entry", input_type="text",
+                mood_score=-0.9 if is_crisis else 0.4, mood_label="NEGATIVE" if is_crisis else "POSITIVE",
+                is_crisis=is_crisis, crisis_level="high" if is_crisis else "none"
+            )
+            if is_crisis:
+                monitor.log_crisis_event(interaction_id, user_id, "high", ["hopeless"], -0.9, follow_up_required=True)
+    yield monitor
+    monitor.db.close_all()
+
+
+def capture_queries(monitor, fn):
+    """Run ``fn`` and return the SQL statements it executed, with parameters inlined."""
+    statements = []
+    with monitor.db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            fn()
+        finally:
+            conn.set_trace_callback(None)
+    return [sql for sql in statements if re.match(r"\s*(SELECT|UPDATE|DELETE)", sql, re.IGNORECASE)]
+
+
+def full_scans(monitor, sql):
+    with monitor.db.connection() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [detail for _, _, _, detail in plan if FULL_SCAN.match(detail)]
+
+
+def test_schema_version_recorded(monitor):
+    from services.migrations import MIGRATIONS
+
+    with monitor.db.connection() as conn:
+        version = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+    assert version == MIGRATIONS[-1][0]
+
+    # Re-initializing is a no-op
+    monitor.init_database()
+    with monitor.db.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == len(MIGRATIONS)
+
+
+@pytest.mark.parametrize("name, call", [
+    ("analytics_summary", lambda m: m.get_analytics_summary(days=7)),
+    ("user_analytics", lambda m: m.get_user_analytics("user_a", days=7)),
+    ("crisis_alerts_unresolved", lambda m: m.get_crisis_alerts(unresolved_only=True)),
+    ("crisis_alerts_all", lambda m: m.get_crisis_alerts(unresolved_only=False)),
+    ("session_statistics", lambda m: m.log_interaction(
+        session_id=m.start_session("user_c"), user_id="user_c", input_text="entry",
+        input_type="text", mood_score=0.1, mood_label="POSITIVE")),
+])
+def test_no_full_table_scans(monitor, name, call):
+    queries = capture_queries(monitor, lambda: call(monitor))
+    assert queries, f"{name} issued no queries"
+
+    offenders = {sql.strip(): scans for sql in queries for scans in [full_scans(monitor, sql)] if scans}
+    assert not offenders, f"{name} full-scans: {offenders}"
@@ -0,0 +1,184 @@
+"""
+Tests that the rollup-backed analytics in services/monitoring.py match the
+same aggregates computed directly from the raw interactions and crisis_events
+tables.
+"""
+
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USERS = ["user_a", "user_b", "user_c", None]
+LEVELS = ["low", "medium", "high", None]
+
+
+def seed(monitor, rng, now, rows=400, span_hours=24 * 10):
+    """
+    Insert rows with explicit timestamps spread over the last ``span_hours``,
+    including rows without a user, session or crisis level.
+    """
+    sessions = {user: [str(uuid.uuid4()) for _ in range(3)] + [None] for user in USERS}
+    with monitor.db.connection() as conn:
+        for _ in range(rows):
+            user = rng.choice(USERS)
+            timestamp = (now - timedelta(minutes=rng.uniform(0, span_hours * 60))).strftime("%Y-%m-%d %H:%M:%S")
+            mood_score = None if rng.random() < 0.1 else round(rng.uniform(-1, 1), 3)
+            interaction_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO interactions (id, session_id, user_id, timestamp, mood_score) VALUES (?, ?, ?, ?, ?)",
+                (interaction_id, rng.choice(sessions[user]), user, timestamp, mood_score)
+            )
+            if rng.random() < 0.2:
+                conn.execute(
+                    "INSERT INTO crisis_events (id, interaction_id, user_id, timestamp, crisis_level) VALUES (?, ?, ?, ?, ?)",
+                    (str(uuid.uuid4()), interaction_id, user, timestamp, rng.choice(LEVELS))
+                )
+
+
+def raw_scalar(monitor, sql, params):
+    with monitor.db.connection() as conn:
+        return conn.execute(sql, params).fetchone()[0]
+
+
+def raw_dict(monitor, sql, params):
+    with monitor.db.connection() as conn:
+        return dict(conn.execute(sql, params).fetchall())
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    # Importing the module creates the global monitor in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MONITOR_WRITE_BEHIND", "false")
+    from services.monitoring import MentalHealthMonitor
+
+    monitor = MentalHealthMonitor(str(tmp_path / "rollups.db"))
+    seed(monitor, random.Random(7), datetime.now())
+    yield monitor
+    monitor.db.close_all()
+
+
+@pytest.mark.parametrize("days", [1, 3, 7])
+def test_summary_matches_raw_tables(monitor, days):
+    summary = monitor.get_analytics_summary(days=days)
+    start = (datetime.now() - timedelta(days=days)).isoformat(" ")
+
+    assert summary["total_interactions"] == raw_scalar(
+        monitor, "SELECT COUNT(*) FROM interactions WHERE timestamp >= ?", (start,))
+    assert summary["total_crisis_events"] == raw_scalar(
+        monitor, "SELECT COUNT(*) FROM crisis_events WHERE timestamp >= ?", (start,))
+    assert summary["unique_users"] == raw_scalar(
+        monitor, "SELECT COUNT(DISTINCT user_id) FROM interactions WHERE timestamp >= ?", (start,))
+    assert summary["average_mood_score"] == pytest.approx(raw_scalar(
+        monitor, "SELECT AVG(mood_score) FROM interactions WHERE timestamp >= ?", (start,)), abs=1e-3)
+    assert summary["crisis_breakdown"] == raw_dict(
+        monitor, "SELECT crisis_level, COUNT(*) FROM crisis_events WHERE timestamp >= ? GROUP BY crisis_level", (start,))
+    assert summary["daily_interactions"] == raw_dict(
+        monitor, "SELECT DATE(timestamp), COUNT(*) FROM interactions WHERE timestamp >= ? GROUP BY DATE(timestamp)", (start,))
+
+
+@pytest.mark.parametrize("days", [1, 7])
+def test_user_analytics_matches_raw_tables(monitor, days):
+    analytics = monitor.get_user_analytics("user_b", days=days)
+    start = (datetime.now() - timedelta(days=days)).isoformat(" ")
+    params = ("user_b", start)
+
+    stats = analytics["personal_stats"]
+    assert stats["total_interactions"] == raw_scalar(
+        monitor, "SELECT COUNT(*) FROM interactions WHERE user_id = ? AND timestamp >= ?", params)
+    assert stats["crisis_events"] == raw_scalar(
+        monitor, "SELECT COUNT(*) FROM crisis_events WHERE user_id = ? AND timestamp >= ?", params)
+    assert stats["session_count"] == raw_scalar(
+        monitor, "SELECT COUNT(DISTINCT session_id) FROM interactions WHERE user_id = ? AND timestamp >= ?", params)
+
+    trends = analytics["trends"]
+    assert trends["daily_activity"] == raw_dict(
+        monitor, "SELECT DATE(timestamp), COUNT(*) FROM interactions "
+                 "WHERE user_id = ? AND timestamp >= ? GROUP BY DATE(timestamp)", params)
+    expected_trend = raw_dict(
+        monitor, "SELECT DATE(timestamp), AVG(mood_score) FROM interactions "
+                 "WHERE user_id = ? AND timestamp >= ? AND mood_score IS NOT NULL GROUP BY DATE(timestamp)", params)
+    assert trends["daily_mood_trend"] == pytest.approx(expected_trend)
+
+    hourly = raw_dict(
+        monitor, "SELECT strftime('%H', timestamp), COUNT(*) FROM interactions "
+                 "WHERE user_id = ? AND timestamp >= ? GROUP BY strftime('%H', timestamp)", params)
+    top_counts = sorted(hourly.values(), reverse=True)[:3]
+    assert [hour["interactions"] for hour in trends["most_active_hours"]] == top_counts
+
+
+def test_rollups_follow_new_writes(monitor):
+    before = monitor.get_analytics_summary(days=1)
+    session_id = monitor.start_session("user_d")
+    interaction_id = monitor.log_interaction(session_id, "user_d", "entry", "text", 0.5, "POSITIVE")
+    monitor.log_crisis_event(interaction_id, "user_d", "high", ["hopeless"], 0.5)
+
+    after = monitor.get_analytics_summary(days=1)
+    assert after["total_interactions"] == before["total_interactions"] + 1
+    assert after["total_crisis_events"] == before["total_crisis_events"] + 1
+    assert after["unique_users"] == before["unique_users"] + 1
+
+
+def duplicate_rollup_keys(monitor):
+    with monitor.db.connection() as conn:
+        return sum(
+            conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} GROUP BY {keys} HAVING COUNT(*) > 1)").fetchone()[0]
+            for table, keys in [
+                ("interaction_rollup_hourly", "bucket, user_id, session_id"),
+                ("interaction_rollup_daily", "bucket, user_id, session_id"),
+                ("crisis_rollup_hourly", "bucket, user_id, crisis_level"),
+                ("crisis_rollup_daily", "bucket, user_id, crisis_level"),
+            ]
+        )
+
+
+def test_rows_without_keys_share_one_rollup_row(monitor):
+    for _ in range(3):
+        with monitor.db.connection() as conn:
+            conn.execute("INSERT INTO interactions (id, mood_score) VALUES (?, 0.5)", (str(uuid.uuid4()),))
+            conn.execute("INSERT INTO crisis_events (id) VALUES (?)", (str(uuid.uuid4()),))
+
+    assert duplicate_rollup_keys(monitor) == 0
+    with monitor.db.connection() as conn:
+        bucket = conn.execute("SELECT strftime('%Y-%m-%d %H:00:00', MAX(timestamp)) FROM interactions").fetchone()[0]
+        row = conn.execute(
+            "SELECT interactions, mood_score_count FROM interaction_rollup_hourly "
+            "WHERE bucket = ? AND user_id = '' AND session_id = ''", (bucket,)
+        ).fetchone()
+        events = conn.execute(
+            "SELECT events FROM crisis_rollup_hourly WHERE bucket = ? AND user_id = '' AND crisis_level = ''", (bucket,)
+        ).fetchone()[0]
+    assert row == (3, 3)
+    assert events == 3
+
+
+def test_upgrade_merges_rollup_rows_with_null_keys(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MONITOR_WRITE_BEHIND", "false")
+    from services import migrations
+    from services.monitoring import MentalHealthMonitor
+
+    # A database created before the rollup keys were NOT NULL
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:3])
+    monitor = MentalHealthMonitor(str(tmp_path / "upgrade.db"))
+    seed(monitor, random.Random(11), datetime.now(), rows=200)
+    assert duplicate_rollup_keys(monitor) > 0
+
+    monkeypatch.undo()
+    with monitor.db.connection() as conn:
+        assert migrations.apply_migrations(conn) == [4]
+    assert duplicate_rollup_keys(monitor) == 0
+
+    summary = monitor.get_analytics_summary(days=7)
+    start = (datetime.now() - timedelta(days=7)).isoformat(" ")
+    assert summary["total_interactions"] == raw_scalar(
+        monitor, "SELECT COUNT(*) FROM interactions WHERE timestamp >= ?", (start,))
+    assert summary["crisis_breakdown"] == raw_dict(
+        monitor, "SELECT crisis_level, COUNT(*) FROM crisis_events WHERE timestamp >= ? GROUP BY crisis_level", (start,))
+    monitor.db.close_all()
@@ -0,0 +1,71 @@
+"""
+Tests for the bulk scoring endpoint /analyze_text_batch (api/main.py).
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def client(api, monkeypatch):
+    from fastapi.testclient import TestClient
+    scored = []
+
+    def analyze_moods(texts):
+        scored.append(list(texts))
+        return [(-0.9, "NEGATIVE") if "hopeless" in text else (0.6, "POSITIVE") for text in texts]
+
+    monkeypatch.setattr(api, "analyze_moods", analyze_moods)
+    client = TestClient(api.app)
+    client.scored = scored
+    return client
+
+
+def test_results_in_input_order_with_spliced_crisis_response(client, api):
+    texts = [f"entry {i}: a calm walk" if i % 3 else f"entry {i}: I feel hopeless" for i in range(10)]
+    response = client.post("/analyze_text_batch", json=[
+        {"text": text, "user_id": "batch_user", "location": "uk"} for text in texts
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 10
+    # One batched model call for all items
+    assert client.scored == [texts]
+
+    for i, result in enumerate(body["results"]):
+        crisis = i % 3 == 0
+        assert result["mood_score"] == (-0.9 if crisis else 0.6)
+        assert result["crisis_detected"] is crisis
+        if crisis:
+            # The crisis response fields are spliced in from their precomputed JSON
+            assert result["status"] == "CRITICAL_CRISIS"
+            assert result["helplines"]["primary"]["name"] == "Samaritans"
+            assert isinstance(result["immediate_steps"], list)
+        else:
+            assert "helplines" not in result
+    assert "crisis;dur=" in response.headers["Server-Timing"]
+
+    # All interactions are logged, each with the session it was assigned
+    with api.monitor.db.connection() as conn:
+        rows = conn.execute("SELECT input_text, session_id FROM interactions ORDER BY rowid").fetchall()
+    assert [text for text, _ in rows] == texts
+    assert [session_id for _, session_id in rows] == [result["session_id"] for result in body["results"]]
+
+
+def test_too_many_items_is_rejected(client, api):
+    items = [{"text": "hello"}] * (api.ANALYZE_BATCH_MAX_ITEMS + 1)
+    response = client.post("/analyze_text_batch", json=items)
+    assert response.status_code == 413
+    assert client.scored == []
+
+    assert client.post("/analyze_text_batch", json=items[:api.ANALYZE_BATCH_MAX_ITEMS]).json()["count"] == api.ANALYZE_BATCH_MAX_ITEMS
+
+
+def test_empty_batch(client):
+    assert client.post("/analyze_text_batch", json=[]).json() == {"results": [], "count": 0}
+    assert client.post("/analyze_text_batch", content=json.dumps({"text": "not a list"})).status_code == 422
@@ -0,0 +1,87 @@
+"""
+Tests for the inference micro-batcher (models/batching.py).
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.batching import MicroBatcher
+
+
+class FakePredict:
+    """Doubles each item and records the batches it was called with."""
+
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+
+    def __call__(self, items):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+def test_concurrent_items_fan_out_to_their_callers():
+    # Hold the first batch so the rest queue up behind it
+    gate = threading.Event()
+    predict = FakePredict(gate)
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=50)
+
+    futures = [batcher.submit(i) for i in range(10)]
+    gate.set()
+
+    assert [future.result(5) for future in futures] == [i * 2 for i in range(10)]
+    assert all(len(batch) <= 4 for batch in predict.batches)
+    assert sorted(item for batch in predict.batches for item in batch) == list(range(10))
+    assert len(predict.batches) < 10
+    stats = batcher.get_stats()
+    assert stats["total_items"] == 10
+    assert stats["total_batches"] == len(predict.batches)
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    predict = FakePredict()
+    batcher = MicroBatcher(predict, max_batch_size=32, max_wait_ms=20)
+
+    start = time.perf_counter()
+    assert batcher.infer(21, timeout=5) == 42
+    elapsed = time.perf_counter() - start
+
+    assert predict.batches == [[21]]
+    assert 0.015 <= elapsed < 1.0
+
+
+def test_full_batch_does_not_wait():
+    predict = FakePredict()
+    batcher = MicroBatcher(predict, max_batch_size=1, max_wait_ms=5000)
+    assert batcher.infer(1, timeout=1) == 2
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def failing(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(failing, max_batch_size=8, max_wait_ms=20)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError, match="model exploded"):
+            future.result(5)
+
+    # The dispatcher survives and serves later batches
+    batcher.batch_fn = FakePredict()
+    assert batcher.infer(3, timeout=5) == 6
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=8, max_wait_ms=20)
+    futures = [batcher.submit(i) for i in range(2)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="1 results for 2 items"):
+            future.result(5)
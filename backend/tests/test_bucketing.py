@@ -0,0 +1,83 @@
+"""
+Tests for length bucketing and the reusable input buffers (models/bucketing.py).
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.bucketing import BucketBuffers, padding_stats, plan_length_buckets
+
+CLS, SEP, PAD = 101, 102, 0
+
+
+def test_every_index_lands_in_exactly_one_bucket():
+    rng = random.Random(2)
+    lengths = [rng.randint(1, 512) for _ in range(300)]
+    buckets = plan_length_buckets(lengths, length_ratio=1.5, min_slack=8, max_bucket_size=16)
+
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+    for bucket in buckets:
+        assert len(bucket) <= 16
+        shortest = min(lengths[i] for i in bucket)
+        longest = max(lengths[i] for i in bucket)
+        assert longest <= shortest * 1.5 or longest - shortest <= 8
+
+
+def test_bucket_boundaries():
+    # Within the slack: one bucket even though 10 > 2 * 1.5
+    assert plan_length_buckets([2, 10], length_ratio=1.5, min_slack=8) == [[0, 1]]
+    # Beyond both the ratio and the slack: split, shortest first
+    assert plan_length_buckets([100, 10, 12, 160], length_ratio=1.5, min_slack=8) == [[1, 2], [0], [3]]
+    assert plan_length_buckets([5, 5, 5], max_bucket_size=2) == [[0, 1], [2]]
+    assert plan_length_buckets([]) == []
+
+
+def test_fill_pads_and_masks_each_row():
+    buffers = BucketBuffers(["input_ids", "attention_mask", "token_type_ids"])
+    windows = [[7, 8, 9], [5], [1, 2]]
+    inputs = buffers.fill(windows, [1, 0], prefix=[CLS], suffix=[SEP], pad_id=PAD)
+
+    assert inputs["input_ids"].tolist() == [[CLS, 5, SEP, PAD, PAD], [CLS, 7, 8, 9, SEP]]
+    assert inputs["attention_mask"].tolist() == [[1, 1, 1, 0, 0], [1, 1, 1, 1, 1]]
+    assert inputs["token_type_ids"].tolist() == [[0] * 5, [0] * 5]
+    assert all(array.dtype == np.int64 and array.flags["C_CONTIGUOUS"] for array in inputs.values())
+
+
+def test_buffers_are_reused_and_stale_values_cleared():
+    buffers = BucketBuffers(["input_ids", "attention_mask"])
+    buffers.fill([[1] * 20], [0], pad_id=PAD)
+    allocations = buffers.allocations
+    inputs = buffers.fill([[3], [4, 4]], [0, 1], pad_id=PAD)
+
+    assert buffers.allocations == allocations
+    assert inputs["input_ids"].tolist() == [[3, PAD], [4, 4]]
+    assert inputs["attention_mask"].tolist() == [[1, 0], [1, 1]]
+
+
+def test_bucketed_results_scatter_back_to_input_order():
+    rng = random.Random(3)
+    windows = [[rng.randint(1000, 2000) for _ in range(rng.randint(1, 60))] for _ in range(50)]
+    lengths = [len(window) for window in windows]
+    buffers = BucketBuffers(["input_ids", "attention_mask"])
+
+    def fake_model(inputs):
+        # Per-row sum of real tokens; padding must not change it
+        return (inputs["input_ids"] * inputs["attention_mask"]).sum(axis=1)
+
+    results = np.zeros(len(windows), dtype=np.int64)
+    for bucket in plan_length_buckets(lengths, length_ratio=1.2, min_slack=2):
+        results[bucket] = fake_model(buffers.fill(windows, bucket, prefix=[CLS], suffix=[SEP], pad_id=PAD))
+
+    expected = [CLS + sum(window) + SEP for window in windows]
+    assert results.tolist() == expected
+
+
+def test_padding_stats():
+    stats = padding_stats([2, 4, 10], [[0, 1], [2]])
+    assert stats == {"buckets": 2, "real_tokens": 16, "processed_tokens": 18,
+                     "padded_tokens": 2, "attention_cells": 2 * 16 + 100}
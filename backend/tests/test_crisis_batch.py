@@ -0,0 +1,93 @@
+"""
+Tests for batch crisis screening (CrisisDetector.analyze_crisis_batch) and
+the interactions re-screening CLI (utils/rescreen_crisis.py).
+"""
+
+import os
+import random
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.crisis_detection import CrisisDetector
+from services.db import ConnectionManager
+from utils.rescreen_crisis import rescreen
+
+detector = CrisisDetector()
+
+WORDS = ["i", "feel", "today", "attend", "it", "number", "over", "hopeless", "give", "up",
+         "kill", "myself", "cutting", "board", "no", "way", "out", "fine"]
+BOUNDARY_SCORES = [-1.0, -0.81, -0.8, -0.79, -0.61, -0.6, -0.59, 0.0, 1.0]
+
+
+def without_timestamp(analysis):
+    return {key: value for key, value in analysis.items() if key != "timestamp"}
+
+
+def test_batch_matches_per_text_analysis():
+    rng = random.Random(23)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))) for _ in range(2000)]
+    scores = [rng.choice(BOUNDARY_SCORES + [rng.uniform(-1, 1)]) for _ in texts]
+
+    result = detector.analyze_crisis_batch(texts, scores)
+
+    assert len(result) == len(texts)
+    levels = result.levels()
+    for i, (text, score) in enumerate(zip(texts, scores)):
+        expected = detector.analyze_crisis_level(text, score)
+        assert without_timestamp(result.analysis(i)) == without_timestamp(expected), (text, score)
+        assert levels[i] == expected["crisis_level"]
+    assert sum(result.level_counts().values()) == len(texts)
+
+
+def test_missing_text_and_mood_score():
+    result = detector.analyze_crisis_batch([None, "I feel hopeless"], [None, None])
+    assert result.levels() == ["none", "high"]
+    assert result.analysis(0)["mood_score"] is None
+    assert result.analysis(1)["sentiment_crisis"] is False
+
+
+def test_length_mismatch_raises():
+    with pytest.raises(ValueError):
+        detector.analyze_crisis_batch(["a", "b"], [0.0])
+
+
+def test_rescreen_reports_and_applies_changes(tmp_path):
+    db_path = str(tmp_path / "rescreen.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE interactions (id TEXT PRIMARY KEY, user_id TEXT, input_text TEXT, mood_score REAL, "
+                 "is_crisis BOOLEAN, crisis_level TEXT, crisis_keywords TEXT)")
+    conn.executemany("INSERT INTO interactions (id, user_id, input_text, mood_score, is_crisis, crisis_level) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", [
+                         # Flagged by the old substring match inside "attend it"
+                         ("a", "user_a", "I need to attend it", 0.2, True, "moderate"),
+                         ("b", "user_a", "I feel hopeless", -0.2, True, "high"),
+                         ("c", "user_b", "I want to end my life", -0.5, False, None),
+                         # Escalated from "moderate" by the user's rolling risk state
+                         ("d", "user_d", "I feel numb", -0.2, True, "high"),
+                     ] + [(f"x{i}", "user_c", "a calm day", 0.5, False, "none") for i in range(5)])
+    conn.execute("""UPDATE interactions SET crisis_keywords = '["numb"]' WHERE id = 'd'""")
+    conn.execute("""UPDATE interactions SET crisis_keywords = '["end it"]' WHERE id = 'a'""")
+    conn.commit()
+    conn.close()
+
+    db = ConnectionManager(db_path)
+    report = rescreen(db, chunk_size=3)
+    assert report["interactions_scanned"] == 9
+    assert report["changed"] == 2
+    assert report["newly_flagged"] == 1
+    assert report["cleared"] == 1
+    assert report["kept_escalated"] == 1
+    assert report["transitions"] == {"moderate -> none": 1, "none -> critical": 1}
+
+    rescreen(db, chunk_size=3, apply=True)
+    assert rescreen(db, chunk_size=3)["changed"] == 0
+    with db.connection() as conn:
+        row = conn.execute("SELECT is_crisis, crisis_level, crisis_keywords FROM interactions WHERE id = 'c'").fetchone()
+    assert row == (1, "critical", '["end my life"]')
+    with db.connection() as conn:
+        assert conn.execute("SELECT crisis_level FROM interactions WHERE id = 'd'").fetchone() == ("high",)
+    db.close_all()
@@ -0,0 +1,75 @@
+"""
+Tests for the precomputed crisis responses (CrisisDetector.compile_responses).
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.crisis_detection import CRISIS_LEVELS, CRISIS_RESPONSE_FIELDS, CrisisDetector, check_crisis, crisis_detector
+
+detector = CrisisDetector()
+
+
+def test_responses_are_shared_and_frozen():
+    response = detector.get_crisis_response({"crisis_level": "critical"}, "uk")
+    assert response is detector.get_crisis_response({"crisis_level": "critical"}, "UK")
+    assert response["status"] == "CRITICAL_CRISIS"
+    assert response["helplines"]["primary"]["name"] == "Samaritans"
+
+    with pytest.raises(TypeError):
+        response["status"] = "NO_CRISIS"
+    with pytest.raises(TypeError):
+        response["helplines"]["primary"]["phone"] = "000"
+    assert isinstance(response["immediate_steps"], tuple)
+
+
+def test_unknown_location_and_level_fall_back():
+    international = detector.get_crisis_response({"crisis_level": "high"}, "international")
+    assert detector.get_crisis_response({"crisis_level": "high"}, "atlantis") is international
+    assert detector.get_crisis_response({"crisis_level": "high"}, None) is international
+    assert detector.get_crisis_response({"crisis_level": "unknown"})["status"] == "NO_CRISIS"
+
+
+def test_response_json_matches_response_fields():
+    for location in detector.helplines:
+        for crisis_level in CRISIS_LEVELS:
+            response = detector._build_crisis_response(crisis_level, location)
+            expected = {field: response[field] for field in CRISIS_RESPONSE_FIELDS}
+            assert json.loads(detector.get_crisis_response_json(crisis_level, location)) == expected
+
+
+def test_compile_responses_after_helpline_change():
+    custom = CrisisDetector()
+    custom.helplines["canada"] = {"name": "Talk Suicide Canada", "phone": "988",
+                                  "url": "https://talksuicide.ca", "description": "24/7 crisis support in Canada"}
+    custom.compile_responses()
+    response = custom.get_crisis_response({"crisis_level": "moderate"}, "Canada")
+    assert response["helplines"]["primary"]["name"] == "Talk Suicide Canada"
+
+
+def test_check_crisis_returns_response_json():
+    result = check_crisis("I want to end my life", -0.9, "india")
+    assert json.loads(result["response_json"])["helplines"]["primary"]["name"] == "AASRA"
+    assert result["response"]["follow_up_required"] is True
+
+
+def test_responses_serialize_like_dicts():
+    response = detector.get_crisis_response({"crisis_level": "critical"}, "uk")
+    assert isinstance(response, dict)
+    assert json.loads(json.dumps(response))["immediate_steps"] == list(response["immediate_steps"])
+    assert json.loads(json.dumps(response))["helplines"]["primary"]["phone"] == "116 123"
+
+    # check_crisis hands out the shared response as it is, and its result
+    # minus the precomputed bytes serializes too
+    result = check_crisis("I want to end my life", -0.9, "uk")
+    assert result["response"] is crisis_detector.get_crisis_response(result["analysis"], "uk")
+    json.dumps({"analysis": result["analysis"], "response": result["response"]})
+
+    copy = dict(response)
+    copy["status"] = "NO_CRISIS"
+    assert response["status"] == "CRITICAL_CRISIS"
@@ -0,0 +1,124 @@
+"""
+Tests for the analytics database connection manager (services/db.py):
+per-thread connection reuse, WAL journaling and concurrent writers.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.db import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "analytics.db"))
+    with manager.connection() as conn:
+        conn.execute("CREATE TABLE events (writer INTEGER, seq INTEGER)")
+    yield manager
+    manager.close_all()
+
+
+def test_connections_are_reused_per_thread(manager):
+    with manager.connection() as first:
+        pass
+    with manager.connection() as second:
+        pass
+    assert first is second
+
+    others = []
+
+    def use_connection():
+        with manager.connection() as conn:
+            others.append(conn)
+        with manager.connection() as conn:
+            others.append(conn)
+
+    thread = threading.Thread(target=use_connection)
+    thread.start()
+    thread.join()
+    assert others[0] is others[1]
+    assert others[0] is not first
+    assert manager.get_stats()["connections_opened"] == 2
+
+    # The exited thread's connection is closed when another thread connects
+    thread = threading.Thread(target=use_connection)
+    thread.start()
+    thread.join()
+    with pytest.raises(sqlite3.ProgrammingError):
+        others[0].execute("SELECT 1")
+    assert manager.get_stats()["open_connections"] == 2
+
+
+def test_failed_unit_of_work_rolls_back(manager):
+    with pytest.raises(RuntimeError):
+        with manager.connection() as conn:
+            conn.execute("INSERT INTO events VALUES (0, 0)")
+            raise RuntimeError("abort")
+    with manager.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 0
+
+
+def test_unpooled_connections_are_opened_per_call(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "unpooled.db"), pooled=False)
+    with manager.connection() as first:
+        pass
+    with manager.connection() as second:
+        pass
+    assert first is not second
+    assert manager.get_stats()["connections_opened"] == 2
+    assert manager.get_stats()["open_connections"] == 0
+
+
+def test_wal_with_concurrent_writers_and_reader(manager):
+    with manager.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    writers = 4
+    rows_per_writer = 200
+    start = threading.Barrier(writers + 1, timeout=5)
+    done = threading.Event()
+    errors = []
+    counts = []
+
+    def write(writer):
+        try:
+            start.wait()
+            for seq in range(rows_per_writer):
+                with manager.connection() as conn:
+                    conn.execute("INSERT INTO events VALUES (?, ?)", (writer, seq))
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            start.wait()
+            while not done.is_set():
+                with manager.connection() as conn:
+                    counts.append(conn.execute("SELECT COUNT(*) FROM events").fetchone()[0])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(writers)]
+    reader = threading.Thread(target=read)
+    for thread in threads + [reader]:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    done.set()
+    reader.join(30)
+
+    assert errors == []
+    # Readers see committed prefixes while writers run
+    assert counts == sorted(counts)
+    with manager.connection() as conn:
+        rows = conn.execute("SELECT writer, COUNT(*), MAX(seq) FROM events GROUP BY writer").fetchall()
+    assert rows == [(i, rows_per_writer, rows_per_writer - 1) for i in range(writers)]
+    # One connection per thread: the fixture's, the writers' and the reader's
+    assert manager.get_stats()["connections_opened"] == writers + 2
@@ -0,0 +1,88 @@
+"""
+Tests for the request executors (api/executors.py): /analyze_text runs its
+blocking stages on the dedicated executor threads, and shutdown drains
+queued work.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.executors import ExecutorSaturated, StageExecutor
+
+
+def test_analyze_text_stages_run_on_executor_threads(api, monkeypatch):
+    from fastapi.testclient import TestClient
+    threads = {}
+
+    def on_stage(stage, fn):
+        def run(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                threads[stage] = "event loop"
+            except RuntimeError:
+                threads[stage] = threading.current_thread().name
+            return fn(*args, **kwargs)
+        return run
+
+    monkeypatch.setattr(api, "analyze_mood", on_stage("mood", lambda text: (-0.9, "NEGATIVE")))
+    monkeypatch.setattr(api, "check_crisis", on_stage("crisis", api.check_crisis))
+    monkeypatch.setattr(api, "log_request", on_stage("log", api.log_request))
+
+    response = TestClient(api.app).post("/analyze_text", json={"text": "I feel hopeless"})
+    assert response.status_code == 200
+    assert response.json()["crisis_detected"] is True
+    assert threads["mood"].startswith("inference")
+    assert threads["crisis"].startswith("crisis")
+    assert threads["log"].startswith("database")
+    assert "crisis;dur=" in response.headers["Server-Timing"]
+
+
+def test_shutdown_drains_pending_work():
+    executor = StageExecutor("drain-test", max_workers=1, max_pending=10)
+    done = []
+
+    def job(i):
+        time.sleep(0.02)
+        done.append(i)
+        return i
+
+    async def main():
+        tasks = [asyncio.ensure_future(executor.run(job, i)) for i in range(5)]
+        await asyncio.sleep(0)
+        # Shutting down waits for the running job and the four queued ones
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        assert done == [0, 1, 2, 3, 4]
+        assert await asyncio.gather(*tasks) == [0, 1, 2, 3, 4]
+        with pytest.raises(RuntimeError):
+            await executor.run(job, 5)
+
+        executor.start()
+        assert await executor.run(job, 6) == 6
+        executor.shutdown()
+
+    asyncio.run(main())
+    assert executor.get_stats()["completed"] == 6
+
+
+def test_saturated_executor_rejects_jobs():
+    executor = StageExecutor("saturation-test", max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def main():
+        blocked = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(time.sleep, 0)
+        release.set()
+        assert await blocked is True
+
+    asyncio.run(main())
+    assert executor.get_stats()["rejected"] == 1
+    executor.shutdown()
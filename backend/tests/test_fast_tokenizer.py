@@ -0,0 +1,105 @@
+"""
+Parity tests for the fast tokenization path (models/fast_tokenizer.py):
+model inputs built from ``FastTokenizer`` ids must match the transformers
+tokenizer called with padding and truncation, as the model used to be fed.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.bucketing import BucketBuffers
+
+SHIPPED_TOKENIZER_DIR = Path(__file__).resolve().parents[1] / "onnx_model"
+
+TEXTS = [
+    "I feel tired today.",
+    "",
+    "   ",
+    "ok",
+    "I'm NOT ok!!! Feeling tired, tired, tired...",
+    "Café naïve façade – résumé 😢",
+    "i feel " * 400,
+]
+
+
+def build_wordpiece_tokenizer(path, max_length=12):
+    """Write a small lowercasing BERT tokenizer with a short model_max_length."""
+    from tokenizers import Tokenizer, decoders, models, normalizers, pre_tokenizers, processors
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list(letters) + ["##" + c for c in letters]
+    vocab += ["i", "feel", "tired", "today", "not", "ok", "##ing", ".", ",", "!", "'"]
+    tokenizer = Tokenizer(models.WordPiece({token: i for i, token in enumerate(vocab)}, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", pair="[CLS] $A [SEP] $B [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)]
+    )
+    tokenizer.decoder = decoders.WordPiece()
+
+    path.mkdir(parents=True, exist_ok=True)
+    tokenizer.save(str(path / "tokenizer.json"))
+    config = {"tokenizer_class": "BertTokenizer", "do_lower_case": True, "model_max_length": max_length,
+              "cls_token": "[CLS]", "sep_token": "[SEP]", "pad_token": "[PAD]", "unk_token": "[UNK]",
+              "mask_token": "[MASK]"}
+    (path / "tokenizer_config.json").write_text(json.dumps(config))
+    return path
+
+
+@pytest.fixture(params=["wordpiece", "shipped"])
+def sentiment_model(request, tmp_path, toy_model):
+    pytest.importorskip("tokenizers")
+    pytest.importorskip("transformers")
+    if request.param == "shipped":
+        if not (SHIPPED_TOKENIZER_DIR / "tokenizer.json").exists():
+            pytest.skip(f"no tokenizer files in {SHIPPED_TOKENIZER_DIR}")
+        tokenizer_dir = SHIPPED_TOKENIZER_DIR
+    else:
+        tokenizer_dir = build_wordpiece_tokenizer(tmp_path / "tokenizer")
+
+    from models.model import SentimentModel
+    model = SentimentModel(toy_model, tokenizer_dir=tokenizer_dir, pool_size=1)
+    assert model.fast_tokenizer is not None
+    return model
+
+
+def fast_inputs(model, texts):
+    windows, owners = model._build_windows(texts, "truncate")
+    assert owners == list(range(len(texts)))
+    buffers = BucketBuffers(["input_ids", "attention_mask"])
+    return buffers.fill(windows, range(len(windows)), model.prefix_ids, model.suffix_ids, model.pad_id)
+
+
+def reference_inputs(model, texts):
+    encoded = model.tokenizer(texts, padding=True, truncation=True, max_length=model.max_length)
+    return {name: np.asarray(encoded[name], dtype=np.int64) for name in ("input_ids", "attention_mask")}
+
+
+@pytest.mark.parametrize("texts", [
+    TEXTS,
+    TEXTS[:1],
+    # Equal lengths: nothing to pad
+    ["ok ok", "ok ok"],
+    # Only the long text: every row truncated to the model's maximum length
+    TEXTS[-1:],
+])
+def test_inputs_match_the_transformers_tokenizer(sentiment_model, texts):
+    fast = fast_inputs(sentiment_model, texts)
+    reference = reference_inputs(sentiment_model, texts)
+
+    for name in ("input_ids", "attention_mask"):
+        np.testing.assert_array_equal(fast[name], reference[name], err_msg=name)
+    assert fast["input_ids"].shape[1] <= sentiment_model.max_length
+
+
+def test_transformers_fallback_encodes_the_same_ids(sentiment_model):
+    fast_ids = sentiment_model._encode(TEXTS)
+    sentiment_model.fast_tokenizer = None
+    assert sentiment_model._encode(TEXTS) == fast_ids
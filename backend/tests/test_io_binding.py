@@ -0,0 +1,52 @@
+"""
+Tests for the IOBinding inference path (models/io_binding.py): steady-state
+calls reuse their output buffers, and results match a plain session.run.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ort = pytest.importorskip("onnxruntime")
+
+from models.io_binding import BoundSession
+
+
+def fill(session, windows):
+    return session.buffers.fill(windows, list(range(len(windows))), prefix=[101], suffix=[102])
+
+
+def test_same_shape_reuses_output_buffers(toy_model):
+    session = BoundSession(ort.InferenceSession(str(toy_model), providers=["CPUExecutionProvider"]))
+
+    session.infer(fill(session, [[1, 2, 3], [4, 5]]))
+    allocations = session.output_allocations
+    for windows in ([[7, 8, 9], [1, 1]], [[2, 2, 2], [3, 3, 3]]):
+        logits = session.infer(fill(session, windows))[0]
+    assert session.output_allocations - allocations == 0
+    np.testing.assert_allclose(logits[:, 0], [2 + 2 + 2 + 203, 3 + 3 + 3 + 203])
+
+
+def test_changed_batch_shape_matches_plain_run(toy_model):
+    session = BoundSession(ort.InferenceSession(str(toy_model), providers=["CPUExecutionProvider"]))
+    rng = np.random.default_rng(11)
+
+    for rows, cols in [(2, 3), (5, 7), (1, 2), (8, 4)]:
+        windows = rng.integers(1, 1000, size=(rows, cols)).tolist()
+        windows[0] = windows[0][:1]  # ragged, so some rows are padded
+        inputs = fill(session, windows)
+        expected = session.run(None, {name: array.copy() for name, array in inputs.items()})[0]
+        logits = session.infer(inputs)[0]
+        assert logits.shape == (rows, 2)
+        np.testing.assert_array_equal(logits, expected)
+
+
+def test_without_io_binding_falls_back_to_run(toy_model):
+    session = BoundSession(ort.InferenceSession(str(toy_model), providers=["CPUExecutionProvider"]), io_binding=False)
+    logits = session.infer(fill(session, [[1, 2]]))[0]
+    np.testing.assert_array_equal(logits, [[206.0, -206.0]])
+    assert session.get_stats()["output_buffer_allocations"] == 0
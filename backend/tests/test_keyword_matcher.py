@@ -0,0 +1,134 @@
+"""
+Tests for the crisis keyword matcher (services/keyword_matcher.py): the
+token index must agree with a naive whole-word scan, respect word
+boundaries, and beat the original substring loop on a labelled corpus.
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.crisis_detection import CrisisDetector
+from services.keyword_matcher import INFLECTION_SUFFIXES, PHRASE_INFLECTIONS, KeywordMatcher, normalize_tokens
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "crisis_keywords_labelled.jsonl")
+
+detector = CrisisDetector()
+
+FILLER = ["i", "feel", "today", "the", "number", "attend", "it", "all", "my", "life", "plan",
+          "self", "harm", "harming", "end", "its", "kill", "me", "myself", "over", "cutting", "board", "no", "hope",
+          "SUICIDE", "Hopeless", "can't", "go", "on", "give", "up", "left", "nothing", "-", "\n"]
+
+
+def substring_match(text):
+    """The matching loop as it was before the keyword matcher (substring semantics)."""
+    text_lower = text.lower()
+    return [keyword for keyword in detector.crisis_keywords if keyword in text_lower]
+
+
+def whole_word_match(matcher, text):
+    """Naive reference: slide every keyword's tokens over the text's tokens."""
+    tokens = normalize_tokens(text)
+    inflections = {tuple(normalize_tokens(keyword)): forms for keyword, forms in PHRASE_INFLECTIONS.items()}
+    found = []
+    for keyword, _ in matcher.entries:
+        phrase = normalize_tokens(keyword)
+        if len(phrase) == 1:
+            forms = {phrase[-1]} | {phrase[-1] + suffix for suffix in INFLECTION_SUFFIXES}
+        else:
+            forms = {phrase[-1], *inflections.get(tuple(phrase), ())}
+        if any(tokens[i:i + len(phrase) - 1] == phrase[:-1] and tokens[i + len(phrase) - 1] in forms
+               for i in range(len(tokens) - len(phrase) + 1)):
+            found.append(keyword)
+    return found
+
+
+def canonical(keywords):
+    return {tuple(normalize_tokens(keyword)) for keyword in keywords}
+
+
+def load_corpus():
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def precision_recall(predict):
+    true_positives = false_positives = false_negatives = 0
+    for example in load_corpus():
+        predicted = canonical(predict(example["text"]))
+        expected = canonical(example["keywords"])
+        true_positives += len(predicted & expected)
+        false_positives += len(predicted - expected)
+        false_negatives += len(expected - predicted)
+    return true_positives / (true_positives + false_positives), true_positives / (true_positives + false_negatives)
+
+
+def test_index_agrees_with_naive_whole_word_scan():
+    rng = random.Random(22)
+    matcher = detector.keyword_matcher
+    texts = [" ".join(detector.crisis_keywords), "".join(detector.crisis_keywords), ""]
+    for _ in range(500):
+        words = [rng.choice(FILLER + detector.crisis_keywords) for _ in range(rng.randint(1, 40))]
+        texts.append(rng.choice([" ", "", "  "]).join(words))
+
+    for text in texts:
+        assert [keyword for keyword, _ in matcher.find(text)] == whole_word_match(matcher, text), text
+
+
+def test_word_boundaries():
+    matcher = detector.keyword_matcher
+    assert matcher.find("I have to attend it and send it") == []
+    assert matcher.find("the number is 5, a numbers game") == []
+    assert matcher.find("I will skill myself up") == []
+    # Function words at the end of a phrase are not inflected
+    assert matcher.find("The school will end its program next week") == []
+    assert matcher.find("He took over its management") == []
+    assert matcher.match("I feel numb, the numbness stays") == (["numb"], "low")
+    assert matcher.match("I want to END IT ALL!!") == (["end it all", "end it"], "high")
+    assert matcher.match("kill myself") == (["kill myself"], "high")
+
+
+def test_normalization():
+    matcher = detector.keyword_matcher
+    assert matcher.match("I can’t go on") == (["can't go on"], "medium")
+    assert matcher.match("cant take it anymore😢") == (["can't take it anymore"], "low")
+    # Spellings with the same words are reported once, at the highest severity
+    assert matcher.match("self-harm again") == (["self harm"], "medium")
+    # The last word of a phrase may be inflected, as single words may
+    assert matcher.match("I've been self-harming again") == (["self harm"], "medium")
+    assert matcher.match("I keep self harming") == (["self harm"], "medium")
+    assert matcher.find("the self harmony of it") == []
+    assert KeywordMatcher({"self-harm": "low", "self harm": "medium"}).entries == (("self-harm", "medium"),)
+
+
+def test_analyze_crisis_level_uses_matcher():
+    analysis = detector.analyze_crisis_level("I need to attend it tomorrow", -0.5)
+    assert analysis["found_keywords"] == []
+    assert analysis["severity_assessment"] == "none"
+    assert detector.analyze_crisis_level("I feel hopeless", -0.5)["severity_assessment"] == "medium"
+
+
+def test_no_labelled_keyword_is_missed():
+    for example in load_corpus():
+        found = canonical(keyword for keyword, _ in detector.keyword_matcher.find(example["text"]))
+        assert canonical(example["keywords"]) <= found, example["text"]
+
+
+def test_precision_recall_on_labelled_corpus():
+    precision, recall = precision_recall(lambda text: [keyword for keyword, _ in detector.keyword_matcher.find(text)])
+    legacy_precision, legacy_recall = precision_recall(substring_match)
+
+    assert precision >= 0.95
+    assert recall == 1.0
+    assert precision > legacy_precision
+    assert recall >= legacy_recall
+
+
+def test_recompile_after_keyword_change():
+    custom = CrisisDetector()
+    custom.crisis_keywords.append("no reason to stay")
+    custom.compile_keywords()
+    assert custom.analyze_crisis_level("there is no reason to stay", 0.0)["found_keywords"] == ["no reason to stay"]
@@ -0,0 +1,132 @@
+"""
+Tests for lazy sentiment model loading (models/model.py) and the /ready
+readiness probe.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import FakeSentimentModel
+from models import model as model_module
+from models.registry import ModelRegistry
+
+
+@pytest.fixture
+def loads(tmp_path, monkeypatch):
+    """Unloaded model state whose loader counts calls and takes a moment."""
+    calls = []
+
+    def load_model():
+        calls.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return FakeSentimentModel()
+
+    registry = ModelRegistry(tmp_path, loader=FakeSentimentModel)
+    registry.add_listener(model_module._bind_mood_cache)
+    monkeypatch.setattr(model_module, "registry", registry)
+    monkeypatch.setattr(model_module, "_load_state",
+                        {"status": "not_loaded", "error": None, "load_ms": None, "warmup_thread": None})
+    monkeypatch.setattr(model_module, "_load_model", load_model)
+    return calls
+
+
+def test_ready_is_503_until_the_first_request_loads_the_model(api, loads):
+    from fastapi.testclient import TestClient
+    client = TestClient(api.app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["model"]["status"] == "not_loaded"
+    assert client.get("/health").status_code == 200
+    assert loads == []
+
+    assert client.post("/analyze_text", json={"text": "lazy loading test"}).status_code == 200
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["model"]["status"] == "ready"
+    assert len(loads) == 1
+
+
+def test_concurrent_first_calls_load_once(loads):
+    start = threading.Barrier(8, timeout=5)
+    results = []
+
+    def analyze(i):
+        start.wait()
+        results.append(model_module.analyze_mood(f"concurrent first call {i}"))
+
+    threads = [threading.Thread(target=analyze, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(loads) == 1
+    assert results == [(-0.2, "NEGATIVE")] * 8
+    assert model_module.is_model_ready()
+
+
+def test_failed_load_is_reported_and_retried(loads, monkeypatch):
+    def broken_load():
+        loads.append("broken")
+        raise RuntimeError("model file missing")
+
+    monkeypatch.setattr(model_module, "_load_model", broken_load)
+    with pytest.raises(RuntimeError):
+        model_module.get_model()
+    assert model_module.get_model_status()["status"] == "failed"
+    assert not model_module.is_model_ready()
+
+    monkeypatch.setattr(model_module, "_load_model", FakeSentimentModel)
+    assert isinstance(model_module.get_model(), FakeSentimentModel)
+    assert model_module.get_model_status()["status"] == "ready"
+
+
+class CountingModel(FakeSentimentModel):
+    def __init__(self, model_file, lowercase):
+        super().__init__(model_file)
+        self.lowercase = lowercase
+        self.scored = []
+
+    def file_signature(self):
+        return (self.model_file, 1, 1)
+
+    def analyze_batch(self, texts, aggregation=None):
+        self.scored.extend(texts)
+        return super().analyze_batch(texts, aggregation)
+
+
+def test_cache_is_bound_on_model_swap(loads, monkeypatch):
+    if model_module.mood_cache is None:
+        pytest.skip("mood cache disabled")
+    monkeypatch.setattr(model_module, "batcher", None)
+    monkeypatch.setattr(model_module.mood_cache, "lowercase", False)
+    monkeypatch.setattr(model_module, "_cache_binding", {"version": None})
+    model_module.mood_cache.clear()
+
+    uncased = CountingModel("uncased.onnx", lowercase=True)
+    model_module.registry.activate(uncased)
+    assert model_module.mood_cache.lowercase is True
+    assert model_module._cache_binding["version"] == ("uncased.onnx", 1, 1)
+    model_module.analyze_mood("Hello There")
+    model_module.analyze_moods(["hello there", "HELLO THERE"])
+    assert uncased.scored == ["Hello There"]
+
+    # Swapping in a cased model rebinds case folding and the version, so
+    # earlier results are not reused
+    cased = CountingModel("cased.onnx", lowercase=False)
+    model_module.registry.activate(cased)
+    assert model_module.mood_cache.lowercase is False
+    model_module.analyze_moods(["hello there", "Hello There", "hello there"])
+    assert cased.scored == ["hello there", "Hello There"]
+
+    model_module.registry.rollback()
+    assert model_module.mood_cache.lowercase is True
+    assert model_module._cache_binding["version"] == ("uncased.onnx", 1, 1)
+    model_module.mood_cache.clear()
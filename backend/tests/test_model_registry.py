@@ -0,0 +1,129 @@
+"""
+Tests for model variant reload and rollback (models/registry.py) with a
+fake loader instead of ONNX Runtime.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.registry import WARMUP_TEXTS, ModelRegistry
+
+
+class FakeModel:
+    def __init__(self, model_file, fail_warmup=False):
+        self.model_file = str(model_file)
+        self.fail_warmup = fail_warmup
+        self.warmed_up = False
+
+    def analyze_batch(self, texts):
+        if self.fail_warmup:
+            raise RuntimeError("bad graph")
+        self.warmed_up = list(texts) == WARMUP_TEXTS
+        return [(0.0, "POSITIVE") for _ in texts]
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    for name in ("model", "model_quantized", "broken", "unwarmable"):
+        (tmp_path / f"{name}.onnx").write_bytes(b"onnx")
+    return tmp_path
+
+
+def make_registry(model_dir, gate=None, max_history=1):
+    def loader(path):
+        if gate is not None:
+            gate.wait(5)
+        if path.stem == "broken":
+            raise ValueError("corrupt model file")
+        return FakeModel(path, fail_warmup=path.stem == "unwarmable")
+
+    registry = ModelRegistry(model_dir, loader, max_history=max_history)
+    registry.activate(FakeModel(model_dir / "model.onnx"))
+    return registry
+
+
+def test_reload_warms_up_and_swaps(model_dir):
+    registry = make_registry(model_dir)
+    original = registry.active
+
+    status = registry.reload("model_quantized", background=False)
+
+    assert status["status"] == "completed"
+    assert registry.active.model_file.endswith("model_quantized.onnx")
+    assert registry.active.warmed_up
+    assert registry.get_status()["rollback_available"] == [original.model_file]
+    assert [variant["name"] for variant in registry.list_variants() if variant["active"]] == ["model_quantized"]
+
+
+def test_background_reload_keeps_serving_the_old_model_until_ready(model_dir):
+    gate = threading.Event()
+    registry = make_registry(model_dir, gate=gate)
+    original = registry.active
+
+    assert registry.reload("model_quantized")["status"] == "reloading"
+    assert registry.active is original
+    with pytest.raises(RuntimeError, match="already in progress"):
+        registry.reload("model")
+
+    gate.set()
+    registry._reload_thread.join(5)
+    assert registry.active.model_file.endswith("model_quantized.onnx")
+    assert not registry.get_status()["reload_in_progress"]
+
+
+@pytest.mark.parametrize("variant, error", [("broken", "corrupt model file"), ("unwarmable", "bad graph")])
+def test_failed_load_leaves_current_model_in_place(model_dir, variant, error):
+    registry = make_registry(model_dir)
+    original = registry.active
+
+    status = registry.reload(variant, background=False)
+
+    assert status["status"] == "failed"
+    assert error in status["error"]
+    assert registry.active is original
+    assert registry.get_status()["rollback_available"] == []
+    # The reload lock is released, so a later reload works
+    assert registry.reload("model_quantized", background=False)["status"] == "completed"
+
+
+def test_rollback_swaps_back_and_forth(model_dir):
+    registry = make_registry(model_dir)
+    original = registry.active
+    registry.reload("model_quantized", background=False)
+    quantized = registry.active
+
+    assert registry.rollback() == {"status": "rolled_back", "variant": "model"}
+    assert registry.active is original
+    # Rolling back again returns to the model that was just replaced
+    registry.rollback()
+    assert registry.active is quantized
+
+
+def test_rollback_without_history_and_unknown_variant(model_dir):
+    registry = make_registry(model_dir)
+    with pytest.raises(RuntimeError, match="No previous model"):
+        registry.rollback()
+    with pytest.raises(ValueError, match="Unknown model variant"):
+        registry.reload("missing")
+    assert not registry.get_status()["reload_in_progress"]
+
+
+def test_listeners_see_every_swap(model_dir):
+    registry = make_registry(model_dir)
+    original = registry.active
+    swapped = []
+    registry.add_listener(lambda model: swapped.append(model))
+    registry.add_listener(lambda model: 1 / 0)
+
+    registry.reload("model_quantized", background=False)
+    reloaded = registry.active
+    registry.rollback()
+
+    # A failing listener is logged and does not stop the swap
+    assert swapped == [reloaded, original]
+    assert registry.active is original
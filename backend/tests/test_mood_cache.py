@@ -0,0 +1,64 @@
+"""
+Tests for the sentiment result cache (models/cache.py).
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.cache import MoodCache
+
+
+def test_normalized_text_hits():
+    cache = MoodCache(lowercase=True)
+    cache.put("I'm fine", (0.9, "POSITIVE"))
+
+    assert cache.get("  i'M   fine ") == (0.9, "POSITIVE")
+    assert cache.get("I'm not fine") is None
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_lru_eviction_by_entries():
+    cache = MoodCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_memory_bound():
+    cache = MoodCache(max_entries=1000, max_bytes=4096)
+    for i in range(100):
+        cache.put(f"text number {i}", i)
+
+    stats = cache.get_stats()
+    assert stats["approx_bytes"] <= 4096
+    assert stats["entries"] < 100
+    assert cache.get("text number 99") == 99
+
+
+def test_ttl_expiry():
+    cache = MoodCache(ttl_seconds=0.01)
+    cache.put("retry", 1)
+    time.sleep(0.02)
+
+    assert cache.get("retry") is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_model_change_invalidates():
+    cache = MoodCache()
+    cache.put("hello", 1, version=("model.onnx", 1))
+
+    assert cache.get("hello", version=("model.onnx", 1)) == 1
+    assert cache.get("hello", version=("model.onnx", 2)) is None
+    assert cache.get_stats()["invalidations"] == 1
@@ -0,0 +1,64 @@
+"""
+Tests for NDJSON request body splitting (api/streaming.py) and the
+/analyze_text_stream endpoint built on it.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.streaming import iter_ndjson_lines
+
+
+class FakeRequest:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def split(chunks, max_line_bytes=8):
+    async def collect():
+        return [item async for item in iter_ndjson_lines(FakeRequest(chunks), max_line_bytes)]
+    return asyncio.run(collect())
+
+
+BODY = b'"a"\n"0123456789"\n"b"\n"0123456789"'
+EXPECTED = [(1, b'"a"'), (2, None), (3, b'"b"'), (4, None)]
+
+
+def test_oversized_lines_within_one_chunk():
+    assert split([BODY]) == EXPECTED
+
+
+def test_oversized_lines_across_chunks():
+    for size in (1, 2, 3, 5, 7, 11):
+        chunks = [BODY[i:i + size] for i in range(0, len(BODY), size)]
+        assert split(chunks) == EXPECTED, size
+
+
+def test_lines_at_the_limit_and_trailing_newline():
+    assert split([b'"123456"\n', b'"1234567"\n']) == [(1, b'"123456"'), (2, None)]
+    assert split([b"\n", b'"x"\n']) == [(1, b""), (2, b'"x"')]
+
+
+def test_stream_results_follow_line_order(api, monkeypatch):
+    from fastapi.testclient import TestClient
+    monkeypatch.setattr(api, "analyze_moods", lambda texts: [(0.5, "POSITIVE")] * len(texts))
+    monkeypatch.setattr(api, "STREAM_BATCH_SIZE", 3)
+    monkeypatch.setattr(api, "STREAM_MAX_LINE_BYTES", 64)
+    lines = ['"one"', "{not json", '{"text": "three"}', "", '"four"', '{"user_id": "no text"}',
+             '"' + "x" * 80 + '"', '"seven"', '"eight"']
+
+    response = TestClient(api.app).post("/analyze_text_stream", content="\n".join(lines))
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    assert results[-1] == {"done": True, "processed": 5, "errors": 3}
+    assert [result["line"] for result in results[:-1]] == [1, 2, 3, 5, 6, 7, 8, 9]
+    assert [("error" in result) for result in results[:-1]] == [False, True, False, False, True, True, False, False]
+    assert "exceeds 64 bytes" in results[5]["error"]
@@ -0,0 +1,81 @@
+"""
+Tests for the quantization script's corpus split and model installation
+(utils/quantize_onnx.py). No quantization is run.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("onnxruntime.quantization")
+
+from utils import quantize_onnx
+
+
+def test_calibration_and_evaluation_sets_are_disjoint():
+    texts = [f"text {i}" for i in range(50)] + ["text 3", "text 7", "text 7"]
+
+    for seed in range(5):
+        calibration, evaluation = quantize_onnx.split_corpus(texts, 0.3, seed)
+        assert not set(calibration) & set(evaluation)
+        assert sorted(calibration + evaluation) == sorted(set(texts))
+        assert len(evaluation) == 15
+    assert quantize_onnx.split_corpus(texts, 0.3, 1) == quantize_onnx.split_corpus(texts, 0.3, 1)
+    assert quantize_onnx.split_corpus(texts, 0.3, 1) != quantize_onnx.split_corpus(texts, 0.3, 2)
+
+    # Repeats of one text cannot be split into two disjoint sets
+    with pytest.raises(ValueError):
+        quantize_onnx.split_corpus(["same", "same"], 0.5)
+
+
+def test_replaced_build_is_not_evaluated(tmp_path):
+    path = tmp_path / "model_static_quantized.onnx"
+    path.write_bytes(b"this run")
+    built = {"static_int8": (path, quantize_onnx.file_signature(path))}
+    quantize_onnx.verify_built(built)
+
+    # Same size, different file: an earlier run's model copied over this one
+    os.utime(path, ns=(0, 0))
+    with pytest.raises(RuntimeError):
+        quantize_onnx.verify_built(built)
+    path.unlink()
+    with pytest.raises(RuntimeError):
+        quantize_onnx.verify_built(built)
+
+
+def test_install_keeps_the_replaced_model(tmp_path):
+    source = tmp_path / "run" / "model_quantized.onnx"
+    source.parent.mkdir()
+    source.write_bytes(b"new")
+    target = tmp_path / "model_quantized.onnx"
+
+    assert quantize_onnx.install(source, target, "run1") is None
+    assert target.read_bytes() == b"new"
+
+    source.write_bytes(b"newer")
+    backup = quantize_onnx.install(source, target, "run2")
+    assert backup == tmp_path / "model_quantized.onnx.run2.bak"
+    assert backup.read_bytes() == b"new"
+    assert target.read_bytes() == b"newer"
+    # Backups are not picked up as model variants
+    assert sorted(path.name for path in tmp_path.glob("*.onnx")) == ["model_quantized.onnx"]
+
+
+def test_install_targets(tmp_path):
+    built = {"dynamic_int8": (tmp_path / "dynamic.onnx", (1, 1)), "static_int8": (tmp_path / "static.onnx", (1, 1))}
+
+    assert quantize_onnx.install_targets(built) == [
+        (tmp_path / "static.onnx", quantize_onnx.STATIC_OUTPUT_MODEL),
+        (tmp_path / "dynamic.onnx", quantize_onnx.OUTPUT_MODEL),
+    ]
+    assert quantize_onnx.install_targets(built, "static_int8") == [
+        (tmp_path / "static.onnx", quantize_onnx.STATIC_OUTPUT_MODEL),
+        (tmp_path / "static.onnx", quantize_onnx.OUTPUT_MODEL),
+    ]
+    # fp32 is best: the served quantized model is left alone
+    assert quantize_onnx.install_targets(built, "fp32") == [
+        (tmp_path / "static.onnx", quantize_onnx.STATIC_OUTPUT_MODEL),
+    ]
@@ -0,0 +1,96 @@
+"""
+Tests for the analytics response cache (api/response_cache.py).
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.response_cache import ResponseCache
+
+
+def test_hit_within_ttl_and_miss_after():
+    cache = ResponseCache(ttl_seconds=0.05)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total_interactions": len(calls)}
+
+    assert cache.get_or_compute("analytics_summary", 7, None, compute) == ({"total_interactions": 1}, 0.0)
+    value, age = cache.get_or_compute("analytics_summary", 7, None, compute)
+    assert value == {"total_interactions": 1}
+    assert age > 0
+
+    # A lookup can demand fresher data than the default TTL
+    time.sleep(0.01)
+    assert cache.get_or_compute("analytics_summary", 7, None, compute, ttl_seconds=0.001)[0] == {"total_interactions": 2}
+
+    time.sleep(0.06)
+    assert cache.get_or_compute("analytics_summary", 7, None, compute)[0] == {"total_interactions": 3}
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+def test_concurrent_requests_share_one_computation():
+    cache = ResponseCache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"unique_users": 3}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("analytics_summary", 1, None, compute)[0]))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.get_stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"unique_users": 3}] * 8
+
+
+def test_crisis_invalidation_is_scoped_to_user_and_global_views():
+    cache = ResponseCache()
+    for view, user_id in [("analytics_summary", None), ("user_analytics", "user_a"), ("user_analytics", "user_b")]:
+        cache.get_or_compute(view, 7, user_id, lambda: {"cached": True})
+
+    cache.invalidate("user_a")
+
+    recomputed = {"cached": False}
+    assert cache.get_or_compute("analytics_summary", 7, None, lambda: recomputed)[0] is recomputed
+    assert cache.get_or_compute("user_analytics", 7, "user_a", lambda: recomputed)[0] is recomputed
+    assert cache.get_or_compute("user_analytics", 7, "user_b", lambda: recomputed)[0] == {"cached": True}
+
+
+def test_result_computed_across_invalidation_is_not_cached():
+    cache = ResponseCache()
+
+    def compute():
+        # A crisis is logged while the aggregate is being computed
+        cache.invalidate("user_a")
+        return {"total_crisis_events": 0}
+
+    cache.get_or_compute("analytics_summary", 7, None, compute)
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_errors_are_not_cached():
+    cache = ResponseCache()
+    not_error = lambda value: "error" not in value
+
+    cache.get_or_compute("analytics_summary", 7, None, lambda: {"error": "database is locked"}, cacheable=not_error)
+    assert cache.get_or_compute("analytics_summary", 7, None, lambda: {"ok": True}, cacheable=not_error)[0] == {"ok": True}
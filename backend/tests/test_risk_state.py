@@ -0,0 +1,136 @@
+"""
+Tests for the rolling per-user risk state (services/risk_state.py) and the
+escalation it feeds into crisis detection.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.crisis_detection import CrisisDetector, check_crisis, crisis_detector
+from services.db import ConnectionManager
+from services.risk_state import RiskTracker
+
+
+def test_run_of_moderate_messages_escalates():
+    tracker = RiskTracker(half_life_s=900)
+    levels = [tracker.update("user_a", "moderate", -0.3, 1, now=150.0 * i)["crisis_level"] for i in range(5)]
+    # Five messages in ten minutes: the fifth is raised
+    assert levels == ["moderate", "moderate", "moderate", "moderate", "high"]
+    assert tracker.get_stats()["escalations"] == 1
+
+
+def test_risk_decays_between_messages():
+    tracker = RiskTracker(half_life_s=900)
+    levels = [tracker.update("user_a", "moderate", -0.65, 0, now=3600.0 * i)["crisis_level"] for i in range(10)]
+    assert set(levels) == {"moderate"}
+    assert tracker.get("user_a", now=3600.0 * 9)["risk_score"] < 1.1
+
+
+def test_sustained_low_mood_escalates():
+    tracker = RiskTracker(half_life_s=900, sustained_messages=3, sustained_mood=-0.6)
+    snapshots = [tracker.update("user_a", "moderate", -0.7, 0, now=120.0 * i) for i in range(3)]
+    assert [snapshot["crisis_level"] for snapshot in snapshots] == ["moderate", "moderate", "high"]
+    assert snapshots[-1]["sustained_low_mood"] is True
+    assert snapshots[-1]["risk_score"] < 3.5
+
+    # A better mood in between breaks the run
+    assert tracker.update("user_b", "moderate", -0.7, 0, now=0.0)["crisis_level"] == "moderate"
+    assert tracker.update("user_b", "none", 0.2, 0, now=60.0)["crisis_level"] == "none"
+    assert tracker.update("user_b", "moderate", -0.7, 0, now=120.0)["crisis_level"] == "moderate"
+    assert tracker.update("user_b", "moderate", -0.7, 0, now=180.0)["crisis_level"] == "moderate"
+
+    # So does time: the run has to fall within one half-life
+    levels = [tracker.update("user_c", "moderate", -0.7, 0, now=600.0 * i)["crisis_level"] for i in range(3)]
+    assert levels == ["moderate"] * 3
+
+
+def test_escalation_rules():
+    tracker = RiskTracker(high_threshold=3.5, critical_threshold=8)
+    for _ in range(4):
+        tracker.update("user_a", "high", -0.9, 2, now=0.0)
+    # A message without concern of its own is never raised
+    assert tracker.update("user_a", "none", 0.5, 0, now=0.0)["crisis_level"] == "none"
+    snapshot = tracker.update("user_a", "moderate", -0.7, 1, now=0.0)
+    assert snapshot["crisis_level"] == "critical"
+    assert snapshot["risk_score"] == 9
+    assert snapshot["recent_messages"] == 6
+    assert snapshot["keyword_hits"] == 9
+    assert snapshot["average_mood"] == round((-0.9 * 4 + 0.5 - 0.7) / 6, 3)
+
+
+def test_ring_buffer_and_lru_are_bounded():
+    tracker = RiskTracker(window_size=3, max_users=2)
+    for i in range(10):
+        tracker.update("user_a", "moderate", None, 0, now=float(i))
+    assert tracker.get("user_a", now=10.0)["recent_messages"] == 3
+    assert tracker.get("user_a", now=10.0)["average_mood"] is None
+
+    tracker.update("user_b", "none", 0.1, 0, now=10.0)
+    tracker.update("user_a", "none", 0.1, 0, now=11.0)
+    tracker.update("user_c", "none", 0.1, 0, now=12.0)
+    # user_b was the least recently active
+    assert tracker.get("user_b") is None
+    assert tracker.get("user_a") is not None
+    assert tracker.get_stats()["evictions"] == 1
+
+
+def test_analyze_crisis_level_escalates_per_user():
+    detector = CrisisDetector()
+    analyses = [detector.analyze_crisis_level("I feel numb", -0.2, "user_a") for _ in range(4)]
+    assert [analysis["crisis_level"] for analysis in analyses] == ["moderate", "moderate", "moderate", "high"]
+    assert analyses[-1]["escalated"] is True
+    assert analyses[-1]["base_crisis_level"] == "moderate"
+    assert analyses[-1]["risk"]["risk_score"] >= 3.5
+
+    # Other users and untracked calls are unaffected
+    assert detector.analyze_crisis_level("I feel numb", -0.2, "user_b")["crisis_level"] == "moderate"
+    assert "escalated" not in detector.analyze_crisis_level("I feel numb", -0.2)
+
+
+def test_anonymous_users_are_not_tracked():
+    for _ in range(6):
+        result = check_crisis("I feel numb", -0.2, user_id="anonymous_1700000000")
+    assert result["analysis"]["crisis_level"] == "moderate"
+    assert crisis_detector.risk_tracker.get("anonymous_1700000000") is None
+
+
+def test_rebuild_from_interactions(tmp_path):
+    db_path = str(tmp_path / "risk.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE interactions (id TEXT PRIMARY KEY, user_id TEXT, "
+                 "timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP, input_text TEXT, mood_score REAL)")
+    conn.executemany("INSERT INTO interactions (id, user_id, timestamp, input_text, mood_score) VALUES (?, ?, ?, ?, ?)", [
+        ("a1", "user_a", "2000-01-01 00:00:00", "I feel numb", -0.2),
+    ] + [(f"b{i}", "user_b", None, "I feel numb", -0.2) for i in range(3)]
+      + [("c1", "anonymous_1", None, "I feel numb", -0.2)])
+    conn.execute("UPDATE interactions SET timestamp = CURRENT_TIMESTAMP WHERE timestamp IS NULL")
+    conn.commit()
+    conn.close()
+
+    detector = CrisisDetector()
+    db = ConnectionManager(db_path)
+    assert detector.rebuild_risk_state(db, window_seconds=3600) == 3
+    db.close_all()
+
+    assert detector.risk_tracker.get("user_a") is None
+    assert detector.risk_tracker.get("anonymous_1") is None
+    assert detector.analyze_crisis_level("I feel numb", -0.2, "user_b")["crisis_level"] == "high"
+
+
+def test_bulk_import_does_not_feed_live_risk_state(api, monkeypatch):
+    from fastapi.testclient import TestClient
+    monkeypatch.setattr(api, "analyze_moods", lambda texts: [(-0.2, "NEGATIVE")] * len(texts))
+    client = TestClient(api.app)
+    items = [{"text": "I feel numb", "user_id": "import_user"} for _ in range(6)]
+
+    batch = client.post("/analyze_text_batch", json=items).json()
+    stream = client.post("/analyze_text_stream", content="\n".join(json.dumps(item) for item in items))
+
+    levels = [result["crisis_level"] for result in batch["results"]]
+    levels += [json.loads(line)["crisis_level"] for line in stream.text.splitlines()[:-1]]
+    assert levels == ["moderate"] * 12
+    assert crisis_detector.risk_tracker.get("import_user") is None
@@ -0,0 +1,94 @@
+"""
+Tests for the running session mood aggregates in services/monitoring.py.
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCORES = [0.5, -0.25, 0.8, -0.9, 0.1]
+
+
+@pytest.fixture
+def monitor_cls(tmp_path, monkeypatch):
+    # Importing the module creates the global monitor in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("MONITOR_WRITE_BEHIND", "false")
+    from services.monitoring import MentalHealthMonitor
+    return MentalHealthMonitor
+
+
+def session_row(monitor, session_id):
+    with monitor.db.connection() as conn:
+        return conn.execute(
+            "SELECT total_interactions, mood_score_sum, mood_score_count, average_mood_score "
+            "FROM user_sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+
+
+def test_running_average_matches_interactions(monitor_cls, tmp_path):
+    monitor = monitor_cls(str(tmp_path / "sessions.db"))
+    session_id = monitor.start_session("user_a")
+    for score in SCORES[:3]:
+        monitor.log_interaction(session_id, "user_a", "entry", "text", score, "POSITIVE")
+    monitor.log_interactions_batch([
+        {"session_id": session_id, "user_id": "user_a", "mood_score": score} for score in SCORES[3:]
+    ], raise_errors=True)
+
+    total, score_sum, scored, average = session_row(monitor, session_id)
+    assert total == scored == len(SCORES)
+    assert score_sum == pytest.approx(sum(SCORES))
+    assert average == pytest.approx(sum(SCORES) / len(SCORES))
+
+    report = monitor.check_session_aggregates()
+    assert report["sessions_checked"] == 1
+    assert report["mismatches"] == []
+    monitor.db.close_all()
+
+
+def test_checker_reports_and_repairs_drift(monitor_cls, tmp_path):
+    monitor = monitor_cls(str(tmp_path / "sessions.db"))
+    session_id = monitor.start_session("user_a")
+    for score in SCORES:
+        monitor.log_interaction(session_id, "user_a", "entry", "text", score, "POSITIVE")
+
+    with monitor.db.connection() as conn:
+        conn.execute("UPDATE user_sessions SET mood_score_count = 2, average_mood_score = 0 WHERE id = ?", (session_id,))
+
+    report = monitor.check_session_aggregates()
+    assert [m["session_id"] for m in report["mismatches"]] == [session_id]
+    assert report["mismatches"][0]["expected_mood_score_count"] == len(SCORES)
+
+    monitor.check_session_aggregates(repair=True)
+    assert monitor.check_session_aggregates()["mismatches"] == []
+    assert session_row(monitor, session_id)[3] == pytest.approx(sum(SCORES) / len(SCORES))
+    monitor.db.close_all()
+
+
+def test_migration_backfills_existing_sessions(monitor_cls, tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+    monitor = monitor_cls(db_path)
+    session_id = monitor.start_session("user_a")
+    for score in SCORES:
+        monitor.log_interaction(session_id, "user_a", "entry", "text", score, "POSITIVE")
+    monitor.db.close_all()
+
+    # Roll the database back to schema version 1
+    conn = sqlite3.connect(db_path)
+    conn.execute("ALTER TABLE user_sessions DROP COLUMN mood_score_sum")
+    conn.execute("ALTER TABLE user_sessions DROP COLUMN mood_score_count")
+    conn.execute("UPDATE user_sessions SET average_mood_score = NULL")
+    conn.execute("DELETE FROM schema_version WHERE version >= 2")
+    conn.commit()
+    conn.close()
+
+    monitor = monitor_cls(db_path)
+    total, score_sum, scored, average = session_row(monitor, session_id)
+    assert scored == len(SCORES)
+    assert score_sum == pytest.approx(sum(SCORES))
+    assert average == pytest.approx(sum(SCORES) / len(SCORES))
+    monitor.db.close_all()
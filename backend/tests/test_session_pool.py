@@ -0,0 +1,66 @@
+"""
+Tests for the ONNX Runtime session pool (models/session_pool.py): checkouts
+are bounded by the pool size, sessions always come back, and concurrent
+micro-batch dispatchers each hold their own session.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("onnxruntime")
+
+from models.batching import MicroBatcher
+from models.session_pool import SessionPool
+from models.session_profile import SessionProfile
+
+
+@pytest.fixture
+def pool(toy_model):
+    return SessionPool(toy_model, size=2, profile=SessionProfile(intra_op_threads=1, sessions_per_worker=2))
+
+
+def test_checkouts_are_bounded_by_pool_size(pool):
+    with pool.checkout() as first, pool.checkout() as second:
+        assert first is not second
+        assert pool.get_stats()["in_use"] == 2
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.05):
+                pass
+
+    with pool.checkout(timeout=0.05) as session:
+        assert session in (first, second)
+    stats = pool.get_stats()
+    assert stats["available"] == 2
+    assert stats["checkouts"] == 3
+    assert stats["queue_depth"] == 0
+
+
+def test_exception_returns_the_session(pool):
+    with pytest.raises(ValueError):
+        with pool.checkout():
+            raise ValueError("inference failed")
+    assert pool.get_stats()["available"] == 2
+
+
+def test_concurrent_batcher_workers_get_distinct_sessions(pool):
+    both_checked_out = threading.Barrier(2, timeout=5)
+    sessions = []
+
+    def batch_fn(items):
+        with pool.checkout(timeout=5) as session:
+            sessions.append(session)
+            # Hold the session until the other dispatcher holds one too
+            both_checked_out.wait()
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait_ms=0, name="pool-test", num_workers=2)
+    futures = [batcher.submit(i) for i in range(2)]
+    assert [future.result(timeout=5) for future in futures] == [0, 1]
+    assert len(sessions) == 2
+    assert sessions[0] is not sessions[1]
+    assert pool.get_stats()["available"] == 2
@@ -0,0 +1,79 @@
+"""
+Tests for the ONNX Runtime session profile (models/session_profile.py):
+SessionOptions follow the ORT_* environment, and the optimized graph is
+cached per model signature.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ort = pytest.importorskip("onnxruntime")
+
+from models.session_profile import SessionProfile, create_session
+from conftest import build_toy_model
+
+
+def test_session_options_from_env(monkeypatch):
+    monkeypatch.setenv("ORT_INTRA_OP_THREADS", "3")
+    monkeypatch.setenv("ORT_INTER_OP_THREADS", "2")
+    monkeypatch.setenv("ORT_EXECUTION_MODE", "Parallel")
+    monkeypatch.setenv("ORT_GRAPH_OPTIMIZATION_LEVEL", "basic")
+    monkeypatch.setenv("ORT_ENABLE_CPU_MEM_ARENA", "false")
+    monkeypatch.setenv("ORT_ALLOW_SPINNING", "false")
+    monkeypatch.setenv("ORT_IO_BINDING", "false")
+
+    profile = SessionProfile.from_env()
+    options = profile.session_options()
+    assert options.intra_op_num_threads == 3
+    assert options.inter_op_num_threads == 2
+    assert options.execution_mode == ort.ExecutionMode.ORT_PARALLEL
+    assert options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    assert options.enable_cpu_mem_arena is False
+    assert options.get_session_config_entry("session.intra_op.allow_spinning") == "0"
+    assert profile.io_binding is False
+    assert profile.session_options("disable").graph_optimization_level == ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+
+
+def test_default_threads_split_the_machine(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    profile = SessionProfile(sessions_per_worker=2)
+    assert profile.intra_op_threads == max(1, (os.cpu_count() or 1) // 4)
+    assert profile.allow_spinning is False
+
+    with pytest.raises(ValueError):
+        SessionProfile(execution_mode="eager")
+
+
+def test_optimized_graph_cached_per_model_signature(toy_model):
+    profile = SessionProfile(intra_op_threads=1)
+
+    _, first = create_session(toy_model, profile)
+    assert first["optimized_graph_cached"] is False
+    cached_path = profile.optimized_graph_path(toy_model)
+    assert first["optimized_graph_path"] == str(cached_path)
+    assert cached_path.exists()
+
+    session, second = create_session(toy_model, profile)
+    assert second["optimized_graph_cached"] is True
+    assert second["optimized_graph_path"] == str(cached_path)
+    assert [model_input.name for model_input in session.get_inputs()] == ["input_ids", "attention_mask"]
+
+    # A replaced model file gets a new cache entry, even when it is older
+    # than the cached graph, and the old entry is removed
+    build_toy_model(toy_model)
+    os.utime(toy_model, ns=(1, 1))
+    _, third = create_session(toy_model, profile)
+    assert third["optimized_graph_cached"] is False
+    assert third["optimized_graph_path"] != str(cached_path)
+    assert not cached_path.exists()
+
+
+def test_cache_disabled_writes_nothing(toy_model):
+    profile = SessionProfile(intra_op_threads=1, cache_optimized_graph=False)
+    _, info = create_session(toy_model, profile)
+    assert info["optimized_graph_cached"] is False
+    assert not (toy_model.parent / ".ort_cache").exists()
@@ -0,0 +1,83 @@
+"""
+Tests for sliding-window splitting and aggregation (models/windowing.py).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.windowing import AGGREGATION_METHODS, aggregate_windows, split_windows
+
+
+def test_short_sequences_are_one_window():
+    ids = list(range(10))
+    assert split_windows(ids, 10, 2) == [ids]
+    assert split_windows([], 10, 2) == [[]]
+
+
+@pytest.mark.parametrize("length", [11, 16, 17, 18, 25, 26, 100])
+def test_windows_cover_every_token_with_overlap(length):
+    ids = list(range(length))
+    windows = split_windows(ids, window_length=10, overlap=2)
+
+    assert all(len(window) == 10 for window in windows)
+    assert windows[0][0] == 0
+    assert windows[-1][-1] == length - 1
+    assert sorted(set(token for window in windows for token in window)) == ids
+    for previous, window in zip(windows, windows[1:]):
+        # Consecutive windows are contiguous slices that overlap by at least `overlap`
+        assert window == list(range(window[0], window[0] + 10))
+        assert previous[-1] - window[0] + 1 >= 2
+
+
+def test_stride_boundaries():
+    # Exactly one stride past the window: two windows, no tail duplicate
+    assert [w[0] for w in split_windows(list(range(18)), 10, 2)] == [0, 8]
+    # One token further: the tail window is aligned to the end
+    assert [w[0] for w in split_windows(list(range(19)), 10, 2)] == [0, 8, 9]
+    # Overlap >= window length still advances by one token
+    assert [w[0] for w in split_windows(list(range(12)), 10, 10)] == [0, 1, 2]
+    assert [w[0] for w in split_windows(list(range(25)), 10, -3)] == [0, 10, 15]
+
+
+PROBS = np.array([
+    [0.1, 0.9],   # +0.9, 100 tokens
+    [0.6, 0.4],   # -0.6, 50 tokens
+    [0.45, 0.55], # +0.55, 10 tokens, not confident
+])
+COUNTS = [100, 50, 10]
+
+
+def test_mean_is_token_weighted():
+    score, label = aggregate_windows(PROBS, COUNTS, "mean")
+    assert score == pytest.approx((0.9 * 100 - 0.6 * 50 + 0.55 * 10) / 160)
+    assert label == "POSITIVE"
+
+
+def test_min_takes_the_most_negative_window():
+    assert aggregate_windows(PROBS, COUNTS, "min") == (pytest.approx(-0.6), "NEGATIVE")
+
+
+def test_truncate_uses_the_first_window():
+    assert aggregate_windows(PROBS, COUNTS, "truncate") == (pytest.approx(0.9), "POSITIVE")
+
+
+def test_attention_favours_confident_windows():
+    margins = np.abs(PROBS[:, 1] - PROBS[:, 0]) * 10.0
+    weights = np.array(COUNTS) * np.exp(margins - margins.max())
+    expected = np.dot([0.9, -0.6, 0.55], weights) / weights.sum()
+    score, _ = aggregate_windows(PROBS, COUNTS, "attention")
+    assert score == pytest.approx(expected)
+
+    # A short but strongly negative passage outweighs a long neutral one
+    probs = np.array([[0.48, 0.52], [0.99, 0.01]])
+    assert aggregate_windows(probs, [400, 40], "attention")[0] < 0 < aggregate_windows(probs, [400, 40], "mean")[0]
+
+
+@pytest.mark.parametrize("method", AGGREGATION_METHODS)
+def test_single_window_is_the_same_for_every_method(method):
+    assert aggregate_windows(np.array([[0.8, 0.2]]), [30], method) == (pytest.approx(-0.8), "NEGATIVE")
@@ -0,0 +1,126 @@
+"""
+Tests for the write-behind request log queue (services/write_behind.py).
+"""
+
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.write_behind import WriteBehindQueue
+
+
+class FlakyWriter:
+    """Fails the first ``failures`` commits, then records every batch."""
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.batches = []
+
+    def __call__(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        self.batches.append(list(records))
+
+
+def make_queue(writer, **kwargs):
+    # A long flush interval groups everything put below into one batch
+    kwargs.setdefault("flush_interval_ms", 200)
+    return WriteBehindQueue(writer, retry_delay_s=0.01, **kwargs)
+
+
+def test_failed_mixed_batch_keeps_both_lanes():
+    writer = FlakyWriter(failures=1)
+    queue = make_queue(writer)
+    for i in range(3):
+        queue.put({"id": f"normal_{i}"})
+    for i in range(2):
+        queue.put({"id": f"crisis_{i}"}, priority=True)
+
+    assert queue.flush(5)
+    queue.close()
+
+    written = [record["id"] for batch in writer.batches for record in batch]
+    assert written == ["crisis_0", "crisis_1", "normal_0", "normal_1", "normal_2"]
+    stats = queue.get_stats()
+    assert stats["failures"] == 1
+    assert stats["dropped"] == 0
+    assert stats["written"] == 5
+
+
+def test_requeue_respects_normal_lane_capacity():
+    started = threading.Event()
+    release = threading.Event()
+    batches = []
+
+    def writer(records):
+        if not batches and not started.is_set():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("database is locked")
+        batches.append([record["id"] for record in records])
+
+    queue = make_queue(writer, capacity=2, batch_size=2)
+    queue.put({"id": "normal_0"})
+    queue.put({"id": "normal_1"})
+    assert started.wait(5)
+    # The lane fills up again while the failing batch is in flight
+    queue.put({"id": "normal_2"})
+    queue.put({"id": "normal_3"})
+    release.set()
+
+    assert queue.flush(5)
+    queue.close()
+
+    # No room to put the failed records back: they are dropped, not the newer ones
+    assert batches == [["normal_2", "normal_3"]]
+    assert queue.get_stats()["dropped"] == 2
+
+
+def test_malformed_record_is_dead_lettered(tmp_path):
+    from services.monitoring import MentalHealthMonitor
+    monitor = MentalHealthMonitor(str(tmp_path / "analytics.db"))
+    attempts = []
+
+    def writer(records):
+        attempts.append(len(records))
+        monitor.log_interactions_batch(records, raise_errors=True)
+
+    queue = make_queue(writer, max_attempts=2)
+    queue.put({"user_id": "u1", "input_text": "before"})
+    # sqlite cannot bind a dict: every batch holding this record fails
+    queue.put({"user_id": "u1", "input_text": "malformed", "mood_score": {"score": 1}}, priority=True)
+    queue.put({"user_id": "u1", "input_text": "after"})
+
+    assert queue.flush(5)
+    queue.put({"user_id": "u1", "input_text": "later"})
+    assert queue.flush(5)
+    queue.close()
+
+    # Two failed commits of the whole batch, one write per record, then
+    # the malformed record's second try
+    assert attempts[:6] == [3, 3, 1, 1, 1, 1]
+    with monitor.db.connection() as conn:
+        texts = [row[0] for row in conn.execute("SELECT input_text FROM interactions ORDER BY rowid")]
+    assert texts == ["before", "after", "later"]
+    stats = queue.get_stats()
+    assert stats["dead_lettered"] == 1
+    assert stats["written"] == 3
+    monitor.db.close_all()
+
+
+def test_batch_is_retried_when_every_record_fails():
+    writer = FlakyWriter(failures=6)
+    queue = make_queue(writer, max_attempts=2)
+    for i in range(3):
+        queue.put({"id": i})
+
+    # Two whole-batch failures and three single-record failures look like
+    # an outage, so nothing is dead-lettered and the batch is retried whole
+    assert queue.flush(5)
+    queue.close()
+
+    assert writer.batches == [[{"id": 0}, {"id": 1}, {"id": 2}]]
+    assert queue.get_stats()["dead_lettered"] == 0
@@ -1,22 +1,363 @@
-from onnxruntime.quantization import quantize_dynamic, QuantType
+"""
+ONNX Model Quantization
+Dynamic (weight-only) and static INT8 quantization of the sentiment model,
+plus an accuracy/latency comparison report across the model variants.
+
+The comparison never uses the texts static quantization was calibrated on:
+either pass --eval-corpus, or a held-out part of --corpus (--eval-fraction)
+is kept for evaluation and the rest is used for calibration.
+
+Every run builds into its own directory under onnx_model/quantization_runs/,
+so the comparison only ever evaluates files built by that run. Built models
+are then copied to the paths the API serves; a file being replaced is kept
+next to it as ``<name>.<run id>.bak``.
+
+Usage (from backend/):
+    python utils/quantize_onnx.py                         # dynamic QInt8 (default)
+    python utils/quantize_onnx.py --mode static           # calibrated QDQ model
+    python utils/quantize_onnx.py --mode all --promote    # build both, serve the best
+    python utils/quantize_onnx.py --mode all --eval-corpus eval.txt
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-INPUT_MODEL = Path("./onnx_model/model.onnx")
-OUTPUT_MODEL = Path("./onnx_model/model_quantized.onnx")
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
 
+ONNX_DIR = Path("./onnx_model")
+INPUT_MODEL = ONNX_DIR / "model.onnx"
+OUTPUT_MODEL = ONNX_DIR / "model_quantized.onnx"
+STATIC_OUTPUT_MODEL = ONNX_DIR / "model_static_quantized.onnx"
+REPORT_PATH = ONNX_DIR / "quantization_report.json"
+RUNS_DIR = ONNX_DIR / "quantization_runs"
+CALIBRATION_CORPUS = Path(__file__).parent / "calibration_corpus.txt"
+
+CALIBRATION_METHODS = {
+    "minmax": CalibrationMethod.MinMax,
+    "entropy": CalibrationMethod.Entropy,
+    "percentile": CalibrationMethod.Percentile,
+}
+
+
+def load_corpus(path: Path) -> List[str]:
+    """Read one representative text per line, skipping blanks."""
+    with open(path, encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    if not texts:
+        raise ValueError(f"Calibration corpus {path} is empty")
+    return texts
+
+
+def split_corpus(texts: List[str], eval_fraction: float, seed: int = 0) -> Tuple[List[str], List[str]]:
+    """Split texts into disjoint (calibration, evaluation) parts; repeated texts are kept once."""
+    shuffled = list(dict.fromkeys(texts))
+    random.Random(seed).shuffle(shuffled)
+    eval_size = min(len(shuffled) - 1, max(1, round(len(shuffled) * eval_fraction)))
+    if eval_size < 1:
+        raise ValueError("Need at least two texts to hold out an evaluation set; pass --eval-corpus")
+    return shuffled[eval_size:], shuffled[:eval_size]
+
+
+def load_tokenizer():
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(str(ONNX_DIR))
+
+
+def encode(tokenizer, text: str, input_names: List[str]) -> Dict[str, np.ndarray]:
+    inputs = tokenizer(text, return_tensors="np", truncation=True)
+    return {name: np.asarray(inputs[name], dtype=np.int64) for name in input_names}
 
-def main():
-    if not INPUT_MODEL.exists():
-        raise FileNotFoundError(f"ONNX model not found at {INPUT_MODEL}. Run export_onnx.py first.")
 
-    OUTPUT_MODEL.parent.mkdir(parents=True, exist_ok=True)
-    print(f"Quantizing {INPUT_MODEL} -> {OUTPUT_MODEL}")
+class TextCalibrationReader(CalibrationDataReader):
+    """Feeds tokenized corpus texts to the static quantization calibrator."""
+
+    def __init__(self, tokenizer, texts: List[str], input_names: List[str]):
+        self._samples = iter([encode(tokenizer, text, input_names) for text in texts])
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        return next(self._samples, None)
+
+
+def model_input_names(model_path: Path) -> List[str]:
+    session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+    return [model_input.name for model_input in session.get_inputs()]
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    """Size and modification time identifying one build of a model file."""
+    stat = path.stat()
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def verify_built(built: Dict[str, Tuple[Path, Tuple[int, int]]]):
+    """
+    Check that every built variant is still the file this run wrote.
+
+    Raises:
+        RuntimeError: If a file is missing or was replaced since it was built
+    """
+    for name, (path, signature) in built.items():
+        if not path.exists() or file_signature(path) != signature:
+            raise RuntimeError(f"{name} model {path} changed after it was built; re-run quantization")
+
+
+def run_dynamic(output_path: Path):
+    print(f"Quantizing {INPUT_MODEL} -> {output_path} (dynamic QInt8 weights)")
     quantize_dynamic(
         model_input=str(INPUT_MODEL),
-        model_output=str(OUTPUT_MODEL),
+        model_output=str(output_path),
         weight_type=QuantType.QInt8,
     )
-    print("Quantization complete.")
+    print("Dynamic quantization complete.")
+
+
+def run_static(output_path: Path, texts: List[str], calibration_method: str, per_channel: bool,
+               op_types: Optional[List[str]]):
+    print(f"Quantizing {INPUT_MODEL} -> {output_path} "
+          f"(static QDQ, {calibration_method} calibration on {len(texts)} texts)")
+    tokenizer = load_tokenizer()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Shape inference and graph cleanup make calibration ranges more reliable
+        preprocessed = Path(tmp_dir) / "model_preprocessed.onnx"
+        quant_pre_process(str(INPUT_MODEL), str(preprocessed))
+
+        reader = TextCalibrationReader(tokenizer, texts, model_input_names(preprocessed))
+        quantize_static(
+            model_input=str(preprocessed),
+            model_output=str(output_path),
+            calibration_data_reader=reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            op_types_to_quantize=op_types,
+            calibrate_method=CALIBRATION_METHODS[calibration_method],
+        )
+    print("Static quantization complete.")
+
+
+def evaluate_model(model_path: Path, tokenizer, texts: List[str]) -> Dict:
+    """Score every text one at a time, recording predictions and latency."""
+    session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+    input_names = [model_input.name for model_input in session.get_inputs()]
+    samples = [encode(tokenizer, text, input_names) for text in texts]
+
+    # Warm-up run so one-time allocations do not skew latency
+    session.run(None, samples[0])
+
+    scores, labels, latencies = [], [], []
+    for sample in samples:
+        start = time.perf_counter()
+        logits = session.run(None, sample)[0][0]
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        shift = np.exp(logits - logits.max())
+        probs = shift / shift.sum()
+        label_id = int(np.argmax(probs))
+        labels.append(label_id)
+        scores.append(float(probs[1]))
+
+    return {
+        "scores": np.asarray(scores),
+        "labels": np.asarray(labels),
+        "latency_ms": np.asarray(latencies),
+        "size_mb": model_path.stat().st_size / (1024 * 1024),
+    }
+
+
+def compare_models(texts: List[str], agreement_threshold: float, built: Dict[str, Tuple[Path, Tuple[int, int]]],
+                   evaluation_corpus: str = "") -> Dict:
+    """
+    Compare the variants built by this run against the fp32 model and pick the fastest acceptable one.
+
+    ``texts`` must not include the calibration texts, or the agreement of
+    the static variant is overestimated.
+
+    Args:
+        texts: Evaluation texts
+        agreement_threshold: Minimum label agreement with fp32 for a variant to be recommended
+        built: Variant name -> (path, file_signature) of the models built by this run
+        evaluation_corpus: Description of the evaluation texts for the report
+    """
+    verify_built(built)
+    variants = {"fp32": INPUT_MODEL, **{name: path for name, (path, _) in built.items()}}
+    tokenizer = load_tokenizer()
+
+    results = {name: evaluate_model(path, tokenizer, texts) for name, path in variants.items()}
+    baseline = results["fp32"]
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "corpus_size": len(texts),
+        "evaluation_corpus": evaluation_corpus,
+        "agreement_threshold": agreement_threshold,
+        "variants": {}
+    }
+    for name, result in results.items():
+        report["variants"][name] = {
+            "path": str(variants[name]),
+            "size_mb": round(result["size_mb"], 2),
+            "label_agreement": round(float(np.mean(result["labels"] == baseline["labels"])), 4),
+            "mean_abs_score_diff": round(float(np.mean(np.abs(result["scores"] - baseline["scores"]))), 4),
+            "latency_ms_mean": round(float(result["latency_ms"].mean()), 3),
+            "latency_ms_p50": round(float(np.percentile(result["latency_ms"], 50)), 3),
+            "latency_ms_p95": round(float(np.percentile(result["latency_ms"], 95)), 3),
+        }
+
+    acceptable = {
+        name: stats for name, stats in report["variants"].items()
+        if stats["label_agreement"] >= agreement_threshold
+    }
+    report["recommended"] = min(acceptable, key=lambda name: acceptable[name]["latency_ms_p50"])
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\nVariant comparison on {report['corpus_size']} texts "
+          f"(agreement threshold {report['agreement_threshold']:.2%})")
+    print(f"Evaluation texts: {report['evaluation_corpus']}")
+    print("=" * 78)
+    print(f"{'variant':<14} {'size MB':>8} {'agree':>8} {'|dscore|':>9} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for name, stats in report["variants"].items():
+        print(
+            f"{name:<14} {stats['size_mb']:>8.1f} {stats['label_agreement']:>8.2%} "
+            f"{stats['mean_abs_score_diff']:>9.4f} {stats['latency_ms_p50']:>8.2f} "
+            f"{stats['latency_ms_p95']:>8.2f} {stats['latency_ms_mean']:>8.2f}"
+        )
+    print("-" * 78)
+    print(f"Recommended: {report['recommended']}")
+
+
+def install(source: Path, target: Path, run_id: str) -> Optional[Path]:
+    """
+    Copy a built model to the path it is served from.
+
+    The file being replaced is kept as ``<target>.<run_id>.bak`` (not a
+    ``.onnx`` file, so it is not listed as a variant), and the new file is
+    moved into place in one step so a reload never reads a partial model.
+
+    Returns:
+        The backup path, or None if ``target`` did not exist
+    """
+    backup = None
+    if target.exists():
+        backup = target.with_name(f"{target.name}.{run_id}.bak")
+        shutil.copy2(target, backup)
+    staging = target.with_name(f".{target.name}.{run_id}.tmp")
+    shutil.copyfile(source, staging)
+    os.replace(staging, target)
+    print(f"Installed {source} -> {target}" + (f" (previous model kept as {backup})" if backup else ""))
+    return backup
+
+
+def install_targets(built: Dict[str, Tuple[Path, Tuple[int, int]]],
+                    recommended: Optional[str] = None) -> List[Tuple[Path, Path]]:
+    """
+    (source, target) copies for the built variants.
+
+    The static variant goes to STATIC_OUTPUT_MODEL. OUTPUT_MODEL, which the
+    API prefers, gets the recommended variant when promoting (nothing if fp32
+    is best) and the dynamic variant otherwise.
+    """
+    targets = []
+    if "static_int8" in built:
+        targets.append((built["static_int8"][0], STATIC_OUTPUT_MODEL))
+    served = recommended if recommended is not None else "dynamic_int8"
+    if served in built:
+        targets.append((built[served][0], OUTPUT_MODEL))
+    elif served == "fp32":
+        print(f"fp32 is the best variant; remove {OUTPUT_MODEL} to serve {INPUT_MODEL}.")
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["dynamic", "static", "all"], default="dynamic")
+    parser.add_argument("--corpus", type=Path, default=CALIBRATION_CORPUS,
+                        help="Representative texts, one per line, for calibration")
+    parser.add_argument("--eval-corpus", type=Path,
+                        help="Separate texts for the comparison (default: hold out part of --corpus)")
+    parser.add_argument("--eval-fraction", type=float, default=0.3,
+                        help="Share of --corpus held out for the comparison when --eval-corpus is not given")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the calibration/evaluation split")
+    parser.add_argument("--calibration-method", choices=sorted(CALIBRATION_METHODS), default="minmax")
+    parser.add_argument("--per-channel", action="store_true", help="Per-channel weight quantization")
+    parser.add_argument("--op-types", default="MatMul,Gemm",
+                        help="Comma-separated op types to quantize statically ('' for all)")
+    parser.add_argument("--no-compare", action="store_true", help="Skip the accuracy/latency comparison")
+    parser.add_argument("--agreement-threshold", type=float, default=0.98,
+                        help="Minimum label agreement with fp32 for a variant to be recommended")
+    parser.add_argument("--report", type=Path, default=REPORT_PATH)
+    parser.add_argument("--promote", action="store_true",
+                        help=f"Serve the recommended variant from {OUTPUT_MODEL} (requires the comparison)")
+    args = parser.parse_args()
+    if args.promote and args.no_compare:
+        parser.error("--promote needs the comparison; drop --no-compare")
+
+    if not INPUT_MODEL.exists():
+        raise FileNotFoundError(f"ONNX model not found at {INPUT_MODEL}. Run export_onnx.py first.")
+    run_id = time.strftime("%Y%m%d-%H%M%S")
+    run_dir = RUNS_DIR / run_id
+    run_dir.mkdir(parents=True)
+
+    texts = load_corpus(args.corpus)
+    if args.eval_corpus:
+        calibration_texts, eval_texts = texts, load_corpus(args.eval_corpus)
+        evaluation_corpus = str(args.eval_corpus)
+    else:
+        calibration_texts, eval_texts = split_corpus(texts, args.eval_fraction, args.seed)
+        evaluation_corpus = f"{len(eval_texts)} texts held out of {args.corpus} (seed {args.seed})"
+    overlap = set(calibration_texts) & set(eval_texts)
+    if overlap:
+        print(f"Warning: {len(overlap)} evaluation text(s) also used for calibration; excluding them")
+        eval_texts = [text for text in eval_texts if text not in overlap]
+        if not eval_texts:
+            raise ValueError("Every evaluation text is also a calibration text")
+
+    built = {}
+    if args.mode in ("dynamic", "all"):
+        output_path = run_dir / OUTPUT_MODEL.name
+        run_dynamic(output_path)
+        built["dynamic_int8"] = (output_path, file_signature(output_path))
+    if args.mode in ("static", "all"):
+        output_path = run_dir / STATIC_OUTPUT_MODEL.name
+        op_types = [op for op in args.op_types.split(",") if op] or None
+        run_static(output_path, calibration_texts, args.calibration_method, args.per_channel, op_types)
+        built["static_int8"] = (output_path, file_signature(output_path))
+
+    recommended = None
+    if not args.no_compare:
+        report = compare_models(eval_texts, args.agreement_threshold, built, evaluation_corpus)
+        report["run_id"] = run_id
+        print_report(report)
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.report}")
+        if args.promote:
+            recommended = report["recommended"]
+
+    # Install exactly the files that were built and evaluated
+    verify_built(built)
+    for source, target in install_targets(built, recommended):
+        install(source, target, run_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+Crisis Re-screening
+Runs the current crisis keywords and thresholds over every stored
+interaction (e.g. after the keyword list changed) and reports which ones
+would now be classified differently. Rows are read in chunks by rowid, so
+memory use does not grow with the table, and each chunk is screened with
+one batch call.
+
+By default nothing is written. --apply updates is_crisis, crisis_level and
+crisis_keywords of the changed interactions; crisis events, notifications
+and follow-ups are never created retroactively.
+
+Re-screening is stateless, but live detection can raise a message's level
+from the user's rolling risk state. An interaction stored above its
+stateless level whose keywords are still the ones found now was escalated
+that way; it is kept as it is (counted as "kept_escalated") rather than
+lowered. Interactions whose keywords changed are re-screened as usual.
+
+Usage (from backend/):
+    python utils/rescreen_crisis.py                               # report only
+    python utils/rescreen_crisis.py --changes changes.jsonl       # list changed rows
+    python utils/rescreen_crisis.py --apply --chunk-size 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, TextIO, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.crisis_detection import CRISIS_LEVELS, crisis_detector
+from services.db import ConnectionManager
+
+DEFAULT_DB = "mental_health_analytics.db"
+
+SELECT_CHUNK = '''
+    SELECT rowid, id, user_id, input_text, mood_score, is_crisis, crisis_level, crisis_keywords
+    FROM interactions
+    WHERE rowid > ?
+    ORDER BY rowid
+    LIMIT ?
+'''
+
+UPDATE_INTERACTION = '''
+    UPDATE interactions SET is_crisis = ?, crisis_level = ?, crisis_keywords = ?
+    WHERE rowid = ?
+'''
+
+
+def was_escalated(old_level: Optional[str], old_keywords: Optional[str], level: str, keywords: List[str]) -> bool:
+    """Whether a stored result is above the stateless one only because of rolling risk escalation."""
+    if old_level not in CRISIS_LEVELS or CRISIS_LEVELS.index(old_level) <= CRISIS_LEVELS.index(level):
+        return False
+    return set(json.loads(old_keywords) if old_keywords else []) == set(keywords)
+
+
+def rescreen_chunk(rows: List[Tuple]) -> Tuple[List[Dict], int]:
+    """
+    Screen one chunk of interaction rows.
+
+    Returns:
+        The rows whose result changed, and the number of escalated rows kept
+    """
+    result = crisis_detector.analyze_crisis_batch([row[3] for row in rows], [row[4] for row in rows])
+    levels = result.levels()
+    is_crisis = result.is_crisis.tolist()
+
+    changes = []
+    kept_escalated = 0
+    for i, (rowid, interaction_id, user_id, _, mood_score, old_is_crisis, old_level, old_keywords) in enumerate(rows):
+        if bool(old_is_crisis) == is_crisis[i] and (old_level or "none") == levels[i]:
+            continue
+        if was_escalated(old_level, old_keywords, levels[i], result.found_keywords[i]):
+            kept_escalated += 1
+            continue
+        changes.append({
+            "rowid": rowid,
+            "id": interaction_id,
+            "user_id": user_id,
+            "mood_score": mood_score,
+            "old_is_crisis": bool(old_is_crisis),
+            "old_crisis_level": old_level,
+            "is_crisis": is_crisis[i],
+            "crisis_level": levels[i],
+            "crisis_keywords": result.found_keywords[i]
+        })
+    return changes, kept_escalated
+
+
+def rescreen(db: ConnectionManager,
+             chunk_size: int,
+             apply: bool = False,
+             changes_file: Optional[TextIO] = None,
+             limit: Optional[int] = None) -> Dict:
+    """
+    Re-screen the interactions table chunk by chunk.
+
+    Args:
+        db: Connection manager for the analytics database
+        chunk_size: Interactions read and screened per batch
+        apply: Write the new results of changed interactions back
+        changes_file: If given, one JSON line per changed interaction
+        limit: Stop after this many interactions
+
+    Returns:
+        Counts of scanned, changed, newly flagged, cleared and kept
+        escalated interactions and of each (old level -> new level) change
+    """
+    scanned = changed = newly_flagged = cleared = kept_escalated = 0
+    transitions: Counter = Counter()
+    last_rowid = 0
+    start = time.perf_counter()
+
+    while limit is None or scanned < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - scanned)
+        with db.connection() as conn:
+            rows = conn.execute(SELECT_CHUNK, (last_rowid, size)).fetchall()
+            if not rows:
+                break
+            changes, kept = rescreen_chunk(rows)
+            if apply and changes:
+                conn.executemany(UPDATE_INTERACTION, [
+                    (change["is_crisis"], change["crisis_level"],
+                     json.dumps(change["crisis_keywords"]) if change["crisis_keywords"] else None,
+                     change["rowid"])
+                    for change in changes
+                ])
+
+        scanned += len(rows)
+        last_rowid = rows[-1][0]
+        changed += len(changes)
+        kept_escalated += kept
+        for change in changes:
+            old_level = change["old_crisis_level"] or "none"
+            if old_level != change["crisis_level"]:
+                transitions[f"{old_level} -> {change['crisis_level']}"] += 1
+            if change["is_crisis"] and not change["old_is_crisis"]:
+                newly_flagged += 1
+            elif change["old_is_crisis"] and not change["is_crisis"]:
+                cleared += 1
+            if changes_file is not None:
+                changes_file.write(json.dumps(change) + "\n")
+        print(f"  {scanned} interactions screened, {changed} changed", end="\r", flush=True)
+
+    elapsed = time.perf_counter() - start
+    print()
+    return {
+        "interactions_scanned": scanned,
+        "changed": changed,
+        "newly_flagged": newly_flagged,
+        "cleared": cleared,
+        "kept_escalated": kept_escalated,
+        "transitions": dict(transitions.most_common()),
+        "applied": apply,
+        "elapsed_s": round(elapsed, 2),
+        "interactions_per_s": round(scanned / elapsed) if elapsed else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DEFAULT_DB, help="Analytics database")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--limit", type=int, help="Stop after this many interactions")
+    parser.add_argument("--changes", help="Write changed interactions to this JSONL file")
+    parser.add_argument("--apply", action="store_true", help="Store the new results of changed interactions")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        parser.error(f"Database {args.db} not found")
+
+    db = ConnectionManager(args.db)
+    changes_file = open(args.changes, "w", encoding="utf-8") if args.changes else None
+    try:
+        report = rescreen(db, max(1, args.chunk_size), args.apply, changes_file, args.limit)
+    finally:
+        if changes_file is not None:
+            changes_file.close()
+        db.close_all()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()